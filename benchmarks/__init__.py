@@ -0,0 +1,8 @@
+"""Offline benchmarks of Brawlcord's hot paths.
+
+The cog runs against an in-memory Config and a fake bot with a synthetic
+user base, so no Discord connection or Red instance is needed. Red and
+discord.py must still be installed, since the cog's code is imported.
+
+Run with ``python -m benchmarks`` from the repository root.
+"""
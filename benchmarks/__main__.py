@@ -0,0 +1,123 @@
+"""Run the benchmarks and print a table of results.
+
+Usage: python -m benchmarks [--sizes 100 1000 10000] [--only NAME ...]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import List, NamedTuple
+
+from .hot_paths import BENCHMARKS, Bench, Environment
+from .population import load_data
+
+
+class Result(NamedTuple):
+    name: str
+    size: int
+    runs: int
+    mean_ms: float
+    runs_per_second: float
+    peak_kib: float
+    gets: float
+    sets: float
+    note: str
+
+
+async def measure(name: str, env: Environment, bench: Bench, runs: int) -> Result:
+    """Time `runs` runs of the benchmark, then trace allocations of one more."""
+
+    config = env.config
+
+    # Warm up caches, e.g. the stat tables of Brawlers.
+    await bench.run()
+
+    config.reset_calls()
+    start = time.perf_counter()
+    for _ in range(runs):
+        await bench.run()
+    elapsed = time.perf_counter() - start
+    calls = config.calls.copy()
+
+    # Tracing slows everything down, so it is kept out of the timed runs.
+    tracemalloc.start()
+    try:
+        await bench.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=name,
+        size=env.size,
+        runs=runs,
+        mean_ms=elapsed / runs * 1000,
+        runs_per_second=runs / elapsed if elapsed else float("inf"),
+        peak_kib=peak / 1024,
+        gets=calls["get"] / runs,
+        sets=(calls["set"] + calls["clear"]) / runs,
+        note=bench.note,
+    )
+
+
+def format_results(results: List[Result]) -> str:
+    header = (
+        f"{'benchmark':<20} {'users':>8} {'runs':>6} {'mean ms':>10} {'runs/s':>11}"
+        f" {'peak KiB':>10} {'gets':>9} {'sets':>7}  note"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.name:<20} {r.size:>8,} {r.runs:>6} {r.mean_ms:>10.3f} {r.runs_per_second:>11,.1f}"
+            f" {r.peak_kib:>10,.1f} {r.gets:>9,.1f} {r.sets:>7,.1f}  {r.note}"
+        )
+
+    return "\n".join(lines)
+
+
+async def run_benchmarks(args) -> List[Result]:
+    data = load_data()
+    names = args.only or list(BENCHMARKS)
+
+    results = []
+    for size in args.sizes:
+        env = Environment(size, data, battle_log=args.battle_log, seed=args.seed)
+        await env.initialize()
+
+        for name in names:
+            bench = await BENCHMARKS[name](env)
+            results.append(await measure(name, env, bench, args.runs))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the hot paths of Brawlcord."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+        help="Numbers of users to benchmark with."
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), metavar="NAME",
+        help=f"Benchmarks to run. Choices: {', '.join(BENCHMARKS)}."
+    )
+    parser.add_argument("--runs", type=int, default=100, help="Timed runs of each benchmark.")
+    parser.add_argument(
+        "--battle-log", type=int, default=0,
+        help="Battle log entries of every user."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    loop = asyncio.get_event_loop()
+    results = loop.run_until_complete(run_benchmarks(args))
+
+    print(format_results(results))
+    print("gets/sets: Config driver calls per run.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""In-memory stand-ins for Red's `Config` and the Discord objects used by the cog.
+
+They implement just enough of the real APIs to run the cog's hot paths
+without a bot, a Discord connection or a Config driver, and count every
+read and write that would have reached the driver.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+from collections import Counter
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from redbot.core.utils.predicates import ReactionPredicate
+
+from brawlcord.abc import MixinMeta
+from brawlcord.utils.brawlers import BrawlerRegistry
+from brawlcord.utils.cooldown import CooldownManager
+from brawlcord.utils.gamemodes import MOVE_TIMEOUT
+from brawlcord.utils.leaderboard import LeaderboardIndex
+from brawlcord.utils.ledger import Ledger
+from brawlcord.utils.lookup import LookupTables
+from brawlcord.utils.matches import MatchRegistry
+
+_MISSING = object()
+
+GLOBAL = "GLOBAL"
+USER = "USER"
+
+
+def _merge(default: Any, stored: Any) -> Any:
+    """Return a copy of `stored` with missing keys filled from `default`."""
+
+    if isinstance(default, dict) and isinstance(stored, dict):
+        merged = deepcopy(default)
+        for key, value in stored.items():
+            merged[key] = _merge(merged.get(key, _MISSING), value)
+        return merged
+
+    return deepcopy(stored)
+
+
+def _lookup(tree: Any, keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        if not isinstance(tree, dict) or key not in tree:
+            return _MISSING
+        tree = tree[key]
+    return tree
+
+
+class MemoryValue:
+    """Stand-in for Red's `Value` and `Group` objects.
+
+    Attribute access returns the nested value, calling it returns an
+    awaitable which can also be used as an async context manager.
+    """
+
+    def __init__(self, config: "MemoryConfig", path: Tuple[str, ...]):
+        self._config = config
+        self._path = path
+
+    def __getattr__(self, name: str) -> "MemoryValue":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return MemoryValue(self._config, self._path + (name,))
+
+    def __call__(self, default: Any = None) -> "_ValueContext":
+        return _ValueContext(self, default)
+
+    async def all(self) -> Any:
+        return await self()
+
+    async def set(self, value: Any):
+        self._config._set(self._path, value)
+
+    async def clear(self):
+        self._config._clear(self._path)
+
+    async def get_raw(self, *keys: str, default: Any = _MISSING) -> Any:
+        value = self._config._get(self._path + tuple(str(key) for key in keys))
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(keys)
+            return default
+        return value
+
+    async def set_raw(self, *keys: str, value: Any):
+        self._config._set(self._path + tuple(str(key) for key in keys), value)
+
+    async def clear_raw(self, *keys: str):
+        self._config._clear(self._path + tuple(str(key) for key in keys))
+
+
+class _ValueContext:
+    def __init__(self, value: MemoryValue, default: Any):
+        self.value = value
+        self.default = default
+        self.raw_value = None
+        self.original = None
+
+    def __await__(self):
+        return self._get().__await__()
+
+    async def _get(self) -> Any:
+        value = self.value._config._get(self.value._path)
+        if value is _MISSING:
+            return self.default
+        return value
+
+    async def __aenter__(self) -> Any:
+        self.raw_value = await self._get()
+        self.original = deepcopy(self.raw_value)
+        return self.raw_value
+
+    async def __aexit__(self, *_exc_info):
+        # Red only writes the value back if it has changed.
+        if self.raw_value != self.original:
+            await self.value.set(self.raw_value)
+
+
+class MemoryConfig:
+    """In-memory stand-in for Red's `Config` with global, user and custom scopes.
+
+    Custom groups can only have one identifier.
+
+    Attributes
+    -------------
+    calls: `Counter`
+        Number of driver reads (`get`), writes (`set`) and deletions
+        (`clear`) made since the last `reset_calls`.
+    """
+
+    def __init__(self):
+        self._defaults: Dict[str, dict] = {GLOBAL: {}, USER: {}}
+        self._data: Dict[str, dict] = {GLOBAL: {}, USER: {}}
+
+        self.calls = Counter()
+
+    def __getattr__(self, name: str) -> MemoryValue:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return MemoryValue(self, (GLOBAL, name))
+
+    def register_global(self, **defaults):
+        self._defaults[GLOBAL].update(deepcopy(defaults))
+
+    def register_user(self, **defaults):
+        self._defaults[USER].update(deepcopy(defaults))
+
+    def user(self, user) -> MemoryValue:
+        return self.user_from_id(user.id)
+
+    def user_from_id(self, user_id: int) -> MemoryValue:
+        return MemoryValue(self, (USER, str(user_id)))
+
+    def init_custom(self, group: str, identifier_count: int):
+        self._defaults.setdefault(group, {})
+        self._data.setdefault(group, {})
+
+    def register_custom(self, group: str, **defaults):
+        self._defaults[group].update(deepcopy(defaults))
+
+    def custom(self, group: str, identifier) -> MemoryValue:
+        return MemoryValue(self, (group, str(identifier)))
+
+    async def all_users(self) -> Dict[int, dict]:
+        self.calls["get"] += 1
+        return {
+            int(user_id): _merge(self._defaults[USER], data)
+            for user_id, data in self._data[USER].items()
+        }
+
+    async def get_raw(self, *keys: str, default: Any = _MISSING) -> Any:
+        return await MemoryValue(self, (GLOBAL,)).get_raw(*keys, default=default)
+
+    async def set_raw(self, *keys: str, value: Any):
+        await MemoryValue(self, (GLOBAL,)).set_raw(*keys, value=value)
+
+    async def clear_raw(self, *keys: str):
+        await MemoryValue(self, (GLOBAL,)).clear_raw(*keys)
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def load_users(self, users: Dict[int, dict]):
+        """Store user documents directly, without counting driver calls."""
+
+        for user_id, data in users.items():
+            self._data[USER][str(user_id)] = deepcopy(data)
+
+    def size(self, user_id: int) -> int:
+        """Return size in bytes of the stored document of the user, as JSON."""
+
+        return len(json.dumps(self._data[USER].get(str(user_id), {})))
+
+    def _split(self, path: Tuple[str, ...]) -> Tuple[Any, Any, Tuple[str, ...]]:
+        if path[0] == GLOBAL:
+            return self._defaults[GLOBAL], self._data[GLOBAL], path[1:]
+        return self._defaults[path[0]], self._data[path[0]].get(path[1], {}), path[2:]
+
+    def _get(self, path: Tuple[str, ...]) -> Any:
+        self.calls["get"] += 1
+
+        defaults, data, keys = self._split(path)
+        default = _lookup(defaults, keys)
+        stored = _lookup(data, keys)
+
+        if stored is _MISSING:
+            return default if default is _MISSING else deepcopy(default)
+        if default is _MISSING:
+            return deepcopy(stored)
+        return _merge(default, stored)
+
+    def _set(self, path: Tuple[str, ...], value: Any):
+        self.calls["set"] += 1
+
+        if path[0] == GLOBAL:
+            tree = self._data[GLOBAL]
+            keys = path[1:]
+        else:
+            tree = self._data[path[0]].setdefault(path[1], {})
+            keys = path[2:]
+
+        if not keys:
+            tree.clear()
+            tree.update(deepcopy(value))
+            return
+
+        for key in keys[:-1]:
+            tree = tree.setdefault(key, {})
+        tree[keys[-1]] = deepcopy(value)
+
+    def _clear(self, path: Tuple[str, ...]):
+        self.calls["clear"] += 1
+
+        if path[0] == GLOBAL:
+            tree = self._data[GLOBAL]
+            keys = path[1:]
+        else:
+            if len(path) == 2:
+                self._data[path[0]].pop(path[1], None)
+                return
+            tree = self._data[path[0]].get(path[1], {})
+            keys = path[2:]
+
+        parent = _lookup(tree, keys[:-1])
+        if isinstance(parent, dict):
+            parent.pop(keys[-1], None)
+
+
+class FakeMessage:
+    """A message sent by the fake bot."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, bot: "FakeBot", content: str = None, embed=None):
+        self.id = next(self._ids)
+        self.content = content
+        self.embed = embed
+        self._state = SimpleNamespace(self_id=bot.user.id)
+
+    async def add_reaction(self, emoji: str):
+        pass
+
+
+class FakeUser:
+    """A Discord user who records the messages sent to them."""
+
+    def __init__(self, bot: "FakeBot", user_id: int, name: str = None, is_bot=False):
+        self._bot = bot
+        self.id = user_id
+        self.name = name or f"User{user_id}"
+        self.display_name = self.name
+        self.discriminator = f"{user_id % 10000:04d}"
+        self.bot = is_bot
+        self.mention = f"<@{user_id}>"
+        self.avatar_url = f"https://cdn.discordapp.com/embed/avatars/{user_id % 5}.png"
+
+        self.sent: List[FakeMessage] = []
+
+    def __str__(self) -> str:
+        return f"{self.name}#{self.discriminator}"
+
+    def __eq__(self, other) -> bool:
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    async def send(self, content: str = None, *, embed=None) -> FakeMessage:
+        message = FakeMessage(self._bot, content, embed)
+        self.sent.append(message)
+        self._bot.last_message = message
+        self._bot.last_recipient = self
+        self._bot.messages_sent += 1
+        return message
+
+
+class FakeBot:
+    """A bot with a fixed set of users which answers reactions at random.
+
+    Attributes
+    -------------
+    fetches: `int`
+        Number of `fetch_user` calls, which would be API requests.
+    messages_sent: `int`
+        Number of messages sent by the bot.
+    """
+
+    def __init__(self, user_ids: List[int] = (), seed: int = 0):
+        self.loop = asyncio.get_event_loop()
+        self.rng = random.Random(seed)
+
+        self.user = FakeUser(self, 1, "Brawlcord", is_bot=True)
+        self.users: Dict[int, FakeUser] = {self.user.id: self.user}
+        for user_id in user_ids:
+            self.users[user_id] = FakeUser(self, user_id)
+
+        self.last_message: Optional[FakeMessage] = None
+        self.last_recipient: Optional[FakeUser] = None
+        self.fetches = 0
+        self.messages_sent = 0
+
+    @property
+    def guilds(self) -> list:
+        return []
+
+    def get_user(self, user_id: int) -> Optional[FakeUser]:
+        return self.users.get(user_id)
+
+    async def fetch_user(self, user_id: int) -> FakeUser:
+        self.fetches += 1
+        return self.users.setdefault(user_id, FakeUser(self, user_id))
+
+    async def is_owner(self, user) -> bool:
+        return False
+
+    async def wait_for(self, event: str, *, check=None, timeout: float = None):
+        """Answer the last message with a reaction accepted by `check`.
+
+        Only `reaction_add` is supported. Raises `asyncio.TimeoutError` if no
+        reaction is accepted, like a player who doesn't respond.
+        """
+
+        if event != "reaction_add" or self.last_message is None:
+            raise asyncio.TimeoutError
+
+        emojis = list(ReactionPredicate.NUMBER_EMOJIS) + list(ReactionPredicate.YES_OR_NO_EMOJIS)
+        self.rng.shuffle(emojis)
+
+        # The user the message was sent to reacts to it.
+        reactor = self.last_recipient
+        for emoji in emojis:
+            reaction = SimpleNamespace(message=self.last_message, emoji=emoji)
+            if check is None or check(reaction, reactor):
+                return reaction, reactor
+
+        raise asyncio.TimeoutError
+
+
+class FakeContext:
+    """Command context of a user in a guild."""
+
+    def __init__(self, bot: FakeBot, author: FakeUser, cog=None):
+        self.bot = bot
+        self.author = author
+        self.cog = cog
+        self.guild = SimpleNamespace(me=bot.user, id=1)
+        self.me = bot.user
+        self.channel = SimpleNamespace(id=1)
+        self.message = SimpleNamespace(author=author, channel=self.channel, id=0)
+        self.command = SimpleNamespace(qualified_name="benchmark")
+
+        self.sent: list = []
+
+    async def send(self, content: str = None, *, embed=None) -> FakeMessage:
+        message = FakeMessage(self.bot, content, embed)
+        self.sent.append(message)
+        return message
+
+    async def trigger_typing(self):
+        pass
+
+
+class BenchCog(MixinMeta):
+    """The cog's helpers bound to an in-memory Config and a fake bot."""
+
+    def __init__(self, bot: FakeBot, config: MemoryConfig, data: Dict[str, dict]):
+        super().__init__()
+
+        self.bot = bot
+        self.config = config
+
+        self.BRAWLERS = data["brawlers"]
+        self.REWARDS = data["rewards"]
+        self.XP_LEVELS = data["xp_levels"]
+        self.RANKS = data["ranks"]
+        self.TROPHY_ROAD = data["trophy_road"]
+        self.LEVEL_UPS = data["level_ups"]
+        self.GAMEMODES = data["gamemodes"]
+        self.LEAGUES = data["leagues"]
+
+        self.lookups = LookupTables(self.REWARDS, self.RANKS, self.LEAGUES, self.TROPHY_ROAD)
+
+        self.trophy_leaderboard = LeaderboardIndex()
+        self.pb_leaderboard = LeaderboardIndex()
+        self.brawler_leaderboards = {}
+
+        self.maintenance = {"setting": False, "duration": 0}
+        self.gift_epochs = []
+        self.store = None
+        self.cooldowns = CooldownManager(config)
+        self.ledger = Ledger(config)
+        self.matches = MatchRegistry(stale_after=2 * MOVE_TIMEOUT)
+
+    async def initialize(self):
+        self.registry = BrawlerRegistry(self.BRAWLERS)
+
+        await self.build_leaderboards()
@@ -0,0 +1,545 @@
+"""Benchmarks of the cog's hot paths.
+
+Each benchmark is a function which prepares its state in an `Environment`
+and returns a `Bench` whose `run` coroutine function is timed. A single run
+should be one unit of work a user triggers, e.g. one brawl's rewards.
+"""
+
+import random
+import sys
+import tempfile
+from copy import deepcopy
+from datetime import datetime
+from math import ceil
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple
+
+from brawlcord.brawlcord import default, default_user
+from brawlcord.utils import simulator
+from brawlcord.utils.box import Box
+from brawlcord.utils.club import Club
+from brawlcord.utils.core import maintenance, utc_timestamp
+from brawlcord.utils.engine import GemGrabEngine, Player
+from brawlcord.utils.gamemodes import GemGrab
+from brawlcord.utils.ledger import LEDGER, default_ledger
+from brawlcord.utils.matches import MatchRegistry
+from brawlcord.utils.matchmaking import MAX_WINDOW, MatchmakingQueue
+from brawlcord.utils.records import BrawlerCatalog, BrawlerRecords
+from brawlcord.utils.session import PlayerSession
+from brawlcord.utils.shop import Shop
+from brawlcord.utils.storage import SQLiteStore
+
+from . import legacy
+from .fakes import BenchCog, FakeBot, FakeContext, FakeUser, MemoryConfig
+from .population import generate_population
+
+CLUB_SIZE = 100
+# Lookups made in a single run of the `lookups` benchmarks.
+LOOKUPS_PER_RUN = 1000
+# Trophy counts the lookups are checked against their old implementations on.
+LOOKUPS_CHECKED = range(-50, 20001)
+
+
+class Bench(NamedTuple):
+    run: Callable[[], Awaitable]
+    # Extra information printed with the results.
+    note: str = ""
+
+
+class Environment:
+    """A cog with a synthetic user base of `size` users.
+
+    Parameters
+    -------------
+    size: `int`
+        Number of users.
+    data: `Dict[str, dict]`
+        The cog's bundled data files.
+    battle_log: `int`
+        Number of battle log entries of every user.
+    seed: `int`
+        Seed of the population and of all random choices.
+    """
+
+    def __init__(self, size: int, data: Dict[str, dict], battle_log: int = 0, seed: int = 0):
+        self.size = size
+        self.data = data
+        self.rng = random.Random(seed)
+
+        self.population = generate_population(size, data, battle_log, seed)
+        self.user_ids: List[int] = list(self.population)
+
+        self.config = MemoryConfig()
+        self.config.register_global(**default)
+        self.config.register_user(**default_user)
+        self.config.init_custom(LEDGER, 1)
+        self.config.register_custom(LEDGER, **default_ledger)
+        self.config.load_users(self.population)
+
+        self.bot = FakeBot(self.user_ids, seed)
+        self.cog = BenchCog(self.bot, self.config, data)
+
+    async def initialize(self):
+        await self.cog.initialize()
+        self.config.reset_calls()
+
+    def random_user(self):
+        return self.bot.users[self.rng.choice(self.user_ids)]
+
+
+async def bench_brawl_rewards(env: Environment) -> Bench:
+    """Rewards of one player after a brawl, as in `_brawl`."""
+
+    cog = env.cog
+
+    async def run():
+        session = await PlayerSession.load(env.config, env.random_user())
+        await cog.brawl_rewards(
+            session, env.rng.choice([1, 0, -1]), session["selected"]["gamemode"]
+        )
+        await cog.xp_handler(session)
+        await session.commit()
+
+    return Bench(run)
+
+
+async def bench_brawl_rewards_legacy(env: Environment) -> Bench:
+    """Rewards of one player after a brawl, with the Config calls made before `PlayerSession`."""
+
+    cog = env.cog
+
+    async def run():
+        user = env.random_user()
+        gm = await env.config.user(user).selected.gamemode()
+        await legacy.post_brawl_update(cog, user, env.rng.choice([1, 0, -1]), gm)
+
+    return Bench(run)
+
+
+async def bench_leaderboard_handler(env: Environment) -> Bench:
+    """The trophy leaderboard shown to a random user."""
+
+    async def run():
+        ctx = FakeContext(env.bot, env.random_user(), env.cog)
+        await env.cog.leaderboard_handler(ctx, "Brawlcord Leaderboard", "", 4)
+
+    return Bench(run)
+
+
+async def bench_leaderboard_index(env: Environment) -> Bench:
+    """A trophy change of a user followed by a position lookup."""
+
+    leaderboard = env.cog.trophy_leaderboard
+
+    async def run():
+        user_id = env.rng.choice(env.user_ids)
+        leaderboard.update(user_id, leaderboard.score(user_id) + env.rng.randint(-8, 8))
+        leaderboard.position(user_id)
+
+    return Bench(run, f"{leaderboard.memory_usage() / 1024:,.1f} KiB index")
+
+
+def check_lookups(cog: BenchCog):
+    """Check that `LookupTables` agrees with the old range scans on `LOOKUPS_CHECKED`."""
+
+    for trophies in LOOKUPS_CHECKED:
+        for game_type in cog.REWARDS:
+            for position in range(3):
+                assert cog.trophies_to_reward_mapping(
+                    trophies, game_type, position
+                ) == legacy.reward(cog.REWARDS, trophies, game_type, position), trophies
+        assert cog.get_rank(trophies) == legacy.rank(cog.RANKS, trophies), trophies
+        assert cog.lookups.league(trophies) == legacy.league(cog.LEAGUES, trophies), trophies
+        assert cog.lookups.trophy_road_reached(trophies) == legacy.trophy_road_reached(
+            cog.TROPHY_ROAD, trophies
+        ), trophies
+
+
+def lookup_values(env: Environment) -> List[int]:
+    return [
+        env.rng.randint(LOOKUPS_CHECKED.start, LOOKUPS_CHECKED.stop - 1)
+        for _ in range(LOOKUPS_PER_RUN)
+    ]
+
+
+async def bench_lookups(env: Environment) -> Bench:
+    """Reward, rank, league and trophy road lookups of random trophy counts."""
+
+    cog = env.cog
+    check_lookups(cog)
+    values = lookup_values(env)
+
+    async def run():
+        for trophies in values:
+            cog.trophies_to_reward_mapping(trophies, "3v3", 1)
+            cog.get_rank(trophies)
+            cog.lookups.league(trophies)
+            cog.lookups.trophy_road_reached(trophies)
+
+    return Bench(run, f"{LOOKUPS_PER_RUN} lookups per run")
+
+
+async def bench_lookups_legacy(env: Environment) -> Bench:
+    """The lookups of `bench_lookups` with the old range scans."""
+
+    cog = env.cog
+    values = lookup_values(env)
+
+    async def run():
+        for trophies in values:
+            legacy.reward(cog.REWARDS, trophies, "3v3", 1)
+            legacy.rank(cog.RANKS, trophies)
+            legacy.league(cog.LEAGUES, trophies)
+            legacy.trophy_road_reached(cog.TROPHY_ROAD, trophies)
+
+    return Bench(run, f"{LOOKUPS_PER_RUN} lookups per run")
+
+
+async def bench_brawlbox(env: Environment) -> Bench:
+    """Opening a Brawl Box."""
+
+    async def run():
+        user = env.random_user()
+        brawler_data = await env.config.user(user).brawlers()
+        box = Box(env.cog.registry, brawler_data)
+        await box.brawlbox(env.config.user(user), user, env.cog.ledger)
+
+    return Bench(run)
+
+
+async def bench_shop(env: Environment) -> Bench:
+    """Generating the shop items of a user."""
+
+    async def run():
+        brawler_data = await env.config.user(env.random_user()).brawlers()
+        Shop(env.cog.registry, brawler_data).generate_shop_items()
+
+    return Bench(run)
+
+
+async def bench_show_club(env: Environment) -> Bench:
+    """Showing a club with up to `CLUB_SIZE` members."""
+
+    member_ids = env.user_ids[:CLUB_SIZE]
+    club_data = {
+        "id": "BENCH",
+        "name": "Benchmark Club",
+        "description": "A club of synthetic users.",
+        "required_trophies": 0,
+        "location": "Global",
+        "icon_num": 1,
+        "ctype": "open",
+        "president_id": member_ids[0],
+        "vice_president_ids": member_ids[1:3],
+        "senior_ids": member_ids[3:10],
+        "member_ids": member_ids[10:],
+    }
+    stats = await Club.compute_stats(member_ids, env.config)
+    await env.config.set_raw("club_stats", club_data["id"], value=stats)
+
+    async def run():
+        # `from_json` consumes the dict it is given.
+        await Club.show_club(
+            deepcopy(club_data), env.bot, env.config, env.cog.get_league_data
+        )
+
+    return Bench(run, f"{len(member_ids)} members")
+
+
+async def bench_gemgrab_play(env: Environment) -> Bench:
+    """A Gem Grab brawl against the bot, with random moves of the user."""
+
+    async def run():
+        user = env.random_user()
+        ctx = FakeContext(env.bot, user, env.cog)
+        game = GemGrab(ctx, user, None, env.config.user, env.cog.registry)
+        await game.initialize(ctx)
+        await game.play(ctx)
+
+    return Bench(run)
+
+
+async def bench_engine(env: Environment) -> Bench:
+    """A headless Gem Grab match of the game engine."""
+
+    prototypes = env.cog.registry.prototypes
+    rng = random.Random(env.rng.random())
+
+    async def run():
+        GemGrabEngine(
+            Player("first", rng.choice(prototypes), rng.randint(1, 10)),
+            Player("second", rng.choice(prototypes), rng.randint(1, 10)),
+            rng,
+        ).run()
+
+    return Bench(run)
+
+
+async def bench_token_bank_sweep(env: Environment) -> Bench:
+    """The removed task which refilled every token bank once a minute.
+
+    One run is a single sweep over all users.
+    """
+
+    config = env.config
+    bot = env.bot
+
+    async def run():
+        for user in await config.all_users():
+            user = bot.get_user(user)
+            if not user:
+                continue
+            tokens_in_bank = await config.user(user).tokens_in_bank()
+            if tokens_in_bank == 200:
+                continue
+            tokens_in_bank = min(tokens_in_bank + 20, 200)
+
+            bank_update_timestamp = await config.user(user).bank_update_ts()
+            if not bank_update_timestamp:
+                continue
+
+            bank_update_ts = datetime.utcfromtimestamp(ceil(bank_update_timestamp))
+            time_now = datetime.utcnow()
+            delta_min = (time_now - bank_update_ts).total_seconds() / 60
+
+            if delta_min >= 80:
+                await config.user(user).tokens_in_bank.set(tokens_in_bank)
+                await config.user(user).bank_update_ts.set(utc_timestamp(time_now))
+
+    return Bench(run, "one sweep over all users per run")
+
+
+async def bench_token_bank_lazy(env: Environment) -> Bench:
+    """Regenerating the token bank of a user when they brawl."""
+
+    async def run():
+        session = await PlayerSession.load(env.config, env.random_user())
+        env.cog.refresh_token_bank(session)
+        await session.commit()
+
+    return Bench(run)
+
+
+async def bench_ledger(env: Environment) -> Bench:
+    """Gold given to 100 random users, followed by a flush of their ledgers."""
+
+    ledger = env.cog.ledger
+
+    async def run():
+        for _ in range(100):
+            await ledger.add(env.rng.choice(env.user_ids), "gold", 10, "benchmark")
+        await ledger.flush()
+
+    return Bench(run, "100 users per run")
+
+
+async def bench_matchmaking(env: Environment) -> Bench:
+    """A waiting user leaving and joining again, followed by a sweep every 100 runs.
+
+    The queue is prefilled with all users, with ratings too far apart to
+    be paired, to measure a long queue.
+    """
+
+    queue = MatchmakingQueue(MatchRegistry(stale_after=0))
+    spacing = MAX_WINDOW + 1
+    tickets = {
+        user_id: queue.join(FakeUser(env.bot, user_id), "Gem Grab", idx * spacing)
+        for idx, user_id in enumerate(env.user_ids)
+    }
+    runs = 0
+
+    async def run():
+        nonlocal runs
+        user_id = env.rng.choice(env.user_ids)
+        ticket = tickets[user_id]
+        queue.leave(ticket)
+        # Same rating as before, so that the user still can't be paired.
+        tickets[user_id] = queue.join(ticket.user, "Gem Grab", ticket.rating)
+        runs += 1
+        if runs % 100 == 0:
+            queue.sweep()
+
+    return Bench(run, f"{len(queue):,} waiting")
+
+
+async def bench_maintenance(env: Environment) -> Bench:
+    """The maintenance check run before every command."""
+
+    predicate = maintenance().predicate
+
+    async def run():
+        await predicate(FakeContext(env.bot, env.random_user(), env.cog))
+
+    return Bench(run)
+
+
+async def bench_user_all(env: Environment) -> Bench:
+    """Loading a whole user document, as `PlayerSession.load` does."""
+
+    sizes = [env.config.size(user_id) for user_id in env.user_ids]
+
+    async def run():
+        await env.config.user(env.random_user()).all()
+
+    return Bench(run, f"{sum(sizes) / len(sizes) / 1024:,.1f} KiB per user")
+
+
+def _deep_size(obj: Any) -> int:
+    """Return approximate memory used by a JSON-like object in bytes."""
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key) + _deep_size(value) for key, value in obj.items())
+    elif isinstance(obj, list):
+        size += sum(_deep_size(item) for item in obj)
+
+    return size
+
+
+async def bench_brawlers_dict(env: Environment) -> Bench:
+    """Trophy sum and power point and Star Power scans of stored Brawler dicts."""
+
+    users = [env.population[user_id]["brawlers"] for user_id in env.user_ids]
+    sizes = [_deep_size(brawlers) for brawlers in users]
+
+    async def run():
+        brawlers = env.rng.choice(users)
+        sum(stats["trophies"] for stats in brawlers.values())
+        [name for name, stats in brawlers.items() if stats["total_powerpoints"] < 1410]
+        [
+            name for name, stats in brawlers.items()
+            if stats["level"] >= 9 and not (stats["sp1"] and stats["sp2"])
+        ]
+
+    return Bench(run, f"{sum(sizes) / len(sizes):,.0f} bytes per user")
+
+
+async def bench_brawlers_records(env: Environment) -> Bench:
+    """The scans of `brawlers_dict` over array-backed `BrawlerRecords`.
+
+    Records are built from the stored dict in each run, as a command
+    reading the user's Brawlers from Config would have to.
+    """
+
+    catalog = BrawlerCatalog.get(env.cog.BRAWLERS)
+    users = [env.population[user_id]["brawlers"] for user_id in env.user_ids]
+    sizes = [BrawlerRecords.from_dict(catalog, brawlers).memory_usage() for brawlers in users]
+
+    async def run():
+        records = BrawlerRecords.from_dict(catalog, env.rng.choice(users))
+        records.total_trophies()
+        records.can_get_pp(1410)
+        records.can_get_sp()
+
+    return Bench(run, f"{sum(sizes) / len(sizes):,.0f} bytes per user")
+
+
+async def _open_store(env: Environment) -> SQLiteStore:
+    """Return a SQLite store in a temporary folder with all users saved."""
+
+    if getattr(env, "store", None) is None:
+        env.store_dir = tempfile.TemporaryDirectory()
+        env.store = SQLiteStore(Path(env.store_dir.name) / "brawlcord.sqlite3")
+        await env.store.open()
+        await env.store.save_users(env.population.items())
+
+    return env.store
+
+
+async def bench_config_leaderboard(env: Environment) -> Bench:
+    """Top 10 and position of a user computed from `all_users()`."""
+
+    async def run():
+        user_id = env.rng.choice(env.user_ids)
+        all_users = await env.config.all_users()
+        totals = sorted(
+            (
+                (-sum(stats["trophies"] for stats in data["brawlers"].values()), uid)
+                for uid, data in all_users.items()
+            )
+        )
+        totals[:10]
+        totals.index(next(entry for entry in totals if entry[1] == user_id))
+
+    return Bench(run)
+
+
+async def bench_sqlite_leaderboard(env: Environment) -> Bench:
+    """Top 10 and position of a user queried from the SQLite store."""
+
+    store = await _open_store(env)
+    _, size = await store.info()
+
+    async def run():
+        await store.top(10)
+        await store.position(env.rng.choice(env.user_ids))
+
+    return Bench(run, f"{size / 1024 / 1024:,.1f} MiB database")
+
+
+async def bench_sqlite_club(env: Environment) -> Bench:
+    """Stats of a club with up to `CLUB_SIZE` members queried from the SQLite store."""
+
+    store = await _open_store(env)
+    member_ids = env.user_ids[:CLUB_SIZE]
+    for user_id in member_ids:
+        await store.set_stat(user_id, "club", "BENCH")
+
+    async def run():
+        await store.club_stats("BENCH")
+
+    return Bench(run, f"{len(member_ids)} members")
+
+
+async def bench_simulator(env: Environment) -> Bench:
+    """Simulating 100,000 Brawl Boxes of a random user."""
+
+    user_id = env.rng.choice(env.user_ids)
+    profile = simulator.BoxProfile(env.cog.BRAWLERS, env.population[user_id]["brawlers"])
+    results = {}
+
+    async def run():
+        results.update(simulator.simulate("brawlbox", profile, 100_000, seed=0))
+
+    return Bench(run, "100,000 boxes per run")
+
+
+async def bench_box_expected(env: Environment) -> Bench:
+    """Expected Brawl Box contents of a random user, as shown by `drops`."""
+
+    async def run():
+        brawler_data = await env.config.user(env.random_user()).brawlers()
+        profile = simulator.BoxProfile(env.cog.BRAWLERS, brawler_data)
+        simulator.expected("brawlbox", profile)
+
+    return Bench(run)
+
+
+BENCHMARKS: Dict[str, Callable[[Environment], Awaitable[Bench]]] = {
+    "brawl_rewards": bench_brawl_rewards,
+    "brawl_rewards_legacy": bench_brawl_rewards_legacy,
+    "leaderboard_handler": bench_leaderboard_handler,
+    "leaderboard_index": bench_leaderboard_index,
+    "lookups": bench_lookups,
+    "lookups_legacy": bench_lookups_legacy,
+    "brawlbox": bench_brawlbox,
+    "shop": bench_shop,
+    "box_expected": bench_box_expected,
+    "show_club": bench_show_club,
+    "gemgrab_play": bench_gemgrab_play,
+    "engine": bench_engine,
+    "token_bank_sweep": bench_token_bank_sweep,
+    "token_bank_lazy": bench_token_bank_lazy,
+    "ledger": bench_ledger,
+    "matchmaking": bench_matchmaking,
+    "maintenance": bench_maintenance,
+    "user_all": bench_user_all,
+    "brawlers_dict": bench_brawlers_dict,
+    "brawlers_records": bench_brawlers_records,
+    "config_leaderboard": bench_config_leaderboard,
+    "sqlite_leaderboard": bench_sqlite_leaderboard,
+    "sqlite_club": bench_sqlite_club,
+}
+
+if simulator.np is not None:
+    BENCHMARKS["simulator"] = bench_simulator
@@ -0,0 +1,201 @@
+"""The cog's hot paths as they were before they were optimized.
+
+They are only used by the benchmarks, to check that the optimized code
+gives the same results and to measure what it saves: the range scans
+replaced by `LookupTables` and the per-stat Config calls of the post-brawl
+update replaced by `PlayerSession`.
+"""
+
+from typing import List
+
+# Reward bands in the order `trophies_to_reward_mapping` checked them.
+REWARD_BANDS = (
+    ("0-49", 0, 50),
+    ("50-99", 50, 100),
+    ("100-199", 100, 200),
+    ("200-299", 200, 300),
+    ("300-399", 300, 400),
+    ("400-499", 400, 500),
+    ("500-599", 500, 600),
+    ("600-699", 600, 700),
+    ("700-799", 700, 800),
+    ("800-899", 800, 900),
+    ("900-999", 900, 1000),
+    ("1000-1099", 1000, 1100),
+    ("1100-1199", 1100, 1200),
+)
+
+
+def reward(rewards: dict, trophies: int, game_type="3v3", position=1) -> int:
+    """Old `trophies_to_reward_mapping`."""
+
+    for band, start, end in REWARD_BANDS:
+        if trophies in range(start, end):
+            return rewards[game_type][band][position]
+
+    return rewards[game_type]["1200+"][position]
+
+
+def rank(ranks: dict, pb: int) -> int:
+    """Old `get_rank`."""
+
+    for rank in ranks:
+        start = ranks[rank]["ProgressStart"]
+        # 1 is not subtracted as we're calling range
+        end = start + ranks[rank]["Progress"]
+        if pb in range(start, end):
+            return int(rank)
+    else:
+        return 35
+
+
+def league(leagues: dict, trophies: int) -> str:
+    """League name found by the old `get_league_data`."""
+
+    for league in leagues:
+        name = leagues[league]["League"]
+        start = leagues[league]["ProgressStart"]
+        end = start + leagues[league]["Progress"]
+
+        # end = 14000 for Star V
+        if end != 14000:
+            if trophies in range(start, end + 1):
+                break
+        else:
+            if trophies >= 14000:
+                name = "Star V"
+
+    return name
+
+
+def trophy_road_reached(trophy_road: dict, trophies: int) -> List[str]:
+    """Tiers the old `handle_trophy_road` considered reached, in its order."""
+
+    return [tier for tier in trophy_road if trophies > trophy_road[tier]["Trophies"]]
+
+
+async def _get(config, user, stat: str, is_iter=False, substat: str = None):
+    """Old `get_player_stat`."""
+
+    if not is_iter:
+        return await getattr(config.user(user), stat)()
+
+    async with getattr(config.user(user), stat)() as value:
+        if not substat:
+            return value
+        return value[substat]
+
+
+async def _update(config, user, stat: str, value, substat: str = None, sub_index=None, add_self=False):
+    """Old `update_player_stat`."""
+
+    if substat:
+        async with getattr(config.user(user), stat)() as data:
+            if not sub_index:
+                if not add_self:
+                    data[substat] = value
+                else:
+                    data[substat] += value
+            else:
+                if not add_self:
+                    data[substat][sub_index] = value
+                else:
+                    data[substat][sub_index] += value
+    else:
+        old_val = await _get(config, user, stat) if add_self else 0
+        await getattr(config.user(user), stat).set(value + old_val)
+
+
+async def _add_tokens(config, user, tokens: int):
+    token_doubler = await _get(config, user, "token_doubler")
+
+    upd_td = max(token_doubler - tokens, 0)
+    if token_doubler > tokens:
+        tokens *= 2
+    else:
+        tokens += token_doubler
+
+    await _update(config, user, "tokens", tokens, add_self=True)
+    await _update(config, user, "token_doubler", upd_td)
+
+
+async def post_brawl_update(cog, user, points: int, gm: str):
+    """Old rewards, xp and battle log update of a player after a brawl.
+
+    Makes the same Config calls as the old `brawl_rewards`, `xp_handler`
+    and `save_battle_log`, without building the embeds.
+    """
+
+    config = cog.config
+
+    # brawl_rewards
+    star_token = 0
+    if points > 0:
+        reward_tokens, reward_xp, position = 20, 8, 1
+        async with config.user(user).todays_st() as todays_st:
+            if gm not in todays_st:
+                star_token = 1
+                todays_st.append(gm)
+    elif points < 0:
+        reward_tokens, reward_xp, position = 10, 4, 2
+    else:
+        reward_tokens, reward_xp, position = 15, 6, 0
+
+    tokens_in_bank = await _get(config, user, "tokens_in_bank")
+    reward_tokens = min(reward_tokens, tokens_in_bank)
+    tokens_in_bank -= reward_tokens
+
+    selected_brawler = await _get(config, user, "selected", is_iter=True, substat="brawler")
+    brawler_data = await _get(config, user, "brawlers", is_iter=True, substat=selected_brawler)
+    trophies = brawler_data["trophies"] + reward(cog.REWARDS, brawler_data["trophies"], "3v3", position)
+
+    await _add_tokens(config, user, reward_tokens)
+    await _update(config, user, "tokens_in_bank", tokens_in_bank)
+    await _update(config, user, "xp", reward_xp, add_self=True)
+    await _update(config, user, "brawlers", trophies, substat=selected_brawler, sub_index="trophies")
+    await _update(config, user, "startokens", star_token, add_self=True)
+
+    # handle_pb
+    brawlers = await _get(config, user, "brawlers")
+    pb = (await _get(config, user, "brawlers"))[selected_brawler]["pb"]
+    if brawlers[selected_brawler]["trophies"] > pb:
+        await _update(config, user, "brawlers", trophies, substat=selected_brawler, sub_index="pb")
+
+    # handle_rank_ups
+    brawler_data = await _get(config, user, "brawlers", is_iter=True, substat=selected_brawler)
+    new_rank = rank(cog.RANKS, brawler_data["pb"])
+    if new_rank > brawler_data["rank"]:
+        old_rank = str(brawler_data["rank"])
+        await _update(config, user, "brawlers", new_rank, selected_brawler, "rank")
+        await _add_tokens(config, user, cog.RANKS[old_rank]["PrimaryLvlUpRewardCount"])
+        await _update(
+            config, user, "starpoints", cog.RANKS[old_rank]["SecondaryLvlUpRewardCount"],
+            add_self=True
+        )
+
+    # handle_trophy_road
+    brawlers = await _get(config, user, "brawlers")
+    total = sum(stats["trophies"] for stats in brawlers.values())
+    tppassed = await _get(config, user, "tppassed")
+    for tier in trophy_road_reached(cog.TROPHY_ROAD, total):
+        if tier in tppassed:
+            continue
+        async with config.user(user).tppassed() as passed:
+            passed.append(tier)
+        async with config.user(user).tpstored() as stored:
+            stored.append(tier)
+        break
+
+    # xp_handler
+    xp = await _get(config, user, "xp")
+    lvl = await _get(config, user, "lvl")
+    next_xp = cog.XP_LEVELS[str(lvl)]["Progress"]
+    if xp >= next_xp:
+        await _update(config, user, "xp", xp - next_xp)
+        await _update(config, user, "lvl", lvl + 1)
+        await _add_tokens(config, user, cog.XP_LEVELS[str(lvl)]["TokensRewardCount"])
+
+    # save_battle_log, against a bot
+    partial_logs = await config.user(user).partial_battle_log()
+    async with config.user(user).battle_log() as battle_log:
+        battle_log.append({"partial": partial_logs[-1] if partial_logs else None})
@@ -0,0 +1,104 @@
+"""Synthetic user base for the benchmarks."""
+
+import json
+import random
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict
+
+from brawlcord.brawlcord import default_user
+from brawlcord.utils.constants import default_stats
+from brawlcord.utils.lookup import LookupTables
+
+DATA_PATH = Path(__file__).parent.parent / "brawlcord" / "data"
+
+GAMEMODES = ["Gem Grab", "Solo Showdown", "Brawl Ball"]
+
+# User IDs start here, to stay clear of the fake bot's ID.
+FIRST_USER_ID = 10_000
+
+
+def load_data() -> Dict[str, dict]:
+    """Return the cog's bundled data files, keyed by file name."""
+
+    data = {}
+    for fp in DATA_PATH.glob("*.json"):
+        with fp.open("r") as f:
+            data[fp.stem] = json.load(f)
+
+    return data
+
+
+def generate_user(
+    rng: random.Random, data: Dict[str, dict], lookups: LookupTables, battle_log: int = 0
+) -> dict:
+    """Return a user document of a player with random progress."""
+
+    user = deepcopy(default_user)
+
+    brawlers = list(data["brawlers"])
+    owned = ["Shelly"] + rng.sample(brawlers[1:], rng.randint(0, len(brawlers) - 1))
+
+    user["brawlers"] = {}
+    for brawler in owned:
+        stats = deepcopy(default_stats)
+        stats["level"] = rng.randint(1, 10)
+        stats["trophies"] = rng.randint(0, 800)
+        stats["pb"] = stats["trophies"] + rng.randint(0, 100)
+        stats["rank"] = lookups.rank(stats["pb"])
+        stats["powerpoints"] = rng.randint(0, 100) if stats["level"] < 9 else 0
+        stats["total_powerpoints"] = min(stats["level"] * 150, 1410)
+        stats["sp1"] = stats["level"] == 10 and rng.random() < 0.5
+        stats["sp2"] = stats["level"] == 10 and not stats["sp1"]
+        user["brawlers"][brawler] = stats
+
+    user["xp"] = rng.randint(0, 500)
+    user["lvl"] = rng.randint(1, 100)
+    user["gold"] = rng.randint(0, 20000)
+    user["gems"] = rng.randint(0, 1000)
+    user["starpoints"] = rng.randint(0, 5000)
+    user["tokens"] = rng.randint(0, 200)
+    user["tutorial_finished"] = True
+    user["gamemodes"] = list(GAMEMODES)
+    user["selected"]["brawler"] = rng.choice(owned)
+    user["selected"]["gamemode"] = rng.choice(GAMEMODES)
+
+    trophies = sum(stats["trophies"] for stats in user["brawlers"].values())
+    user["tppassed"] = lookups.trophy_road_reached(trophies)
+
+    for _ in range(battle_log):
+        user["battle_log"].append(
+            {
+                "player_id": 0,
+                "player_name": "Player#0001",
+                "player_brawler_name": rng.choice(owned),
+                "player_brawler_level": rng.randint(1, 10),
+                "opponent_id": 1,
+                "opponent_name": "Brawlcord#0001",
+                "opponent_brawler_name": rng.choice(brawlers),
+                "opponent_brawler_level": rng.randint(1, 10),
+                "game_mode": rng.choice(GAMEMODES),
+                "result": rng.choice(["Victory", "Loss", "Draw"]),
+                "timestamp": 1_600_000_000.0,
+                "player_brawler_trophies": rng.randint(0, 800),
+                "player_reward_trophies": rng.randint(-8, 8),
+                "opponent_brawler_trophies": rng.randint(0, 800),
+                "opponent_reward_trophies": rng.randint(-8, 8),
+            }
+        )
+
+    return user
+
+
+def generate_population(
+    count: int, data: Dict[str, dict], battle_log: int = 0, seed: int = 0
+) -> Dict[int, dict]:
+    """Return `count` user documents keyed by user ID."""
+
+    rng = random.Random(seed)
+    lookups = LookupTables(data["rewards"], data["ranks"], data["leagues"], data["trophy_road"])
+
+    return {
+        FIRST_USER_ID + idx: generate_user(rng, data, lookups, battle_log)
+        for idx in range(count)
+    }
@@ -1,23 +1,39 @@
+import json
 import random
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 import discord
 from redbot.core import Config
 from redbot.core.commands import Context
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import humanize_timedelta
 from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
 from redbot.core.utils.predicates import MessagePredicate
 
-from .utils.battlelog import BattleLogEntry, PartialBattleLogEntry
+from .utils.battlelog import BattleLogEntry, PartialBattleLogEntry, trim_log
 from .utils.box import Box
-from .utils.constants import default_stats, EMBED_COLOR
+from .utils.brawlers import BrawlerRegistry
+from .utils.constants import default_stats, EMBED_COLOR, PARTIAL_BATTLE_LOG_SIZE
+from .utils.cooldown import CooldownManager
+from .utils.core import regenerate_token_bank, utc_timestamp
 from .utils.emojis import (
-    brawler_emojis, emojis, gamemode_emotes, league_emojis, rank_emojis, sp_icons
+    brawler_emojis, emojis, gamemode_emotes, league_emojis, rank_emojis
 )
 from .utils.errors import AmbiguityError
+from .utils.leaderboard import LeaderboardIndex
+from .utils.ledger import Ledger
+from .utils.lookup import LookupTables
+from .utils.matches import MatchRegistry
+from .utils.matchmaking import MatchmakingQueue
+from .utils.metrics import Metrics
+from .utils.session import PlayerSession
 from .utils.shop import Shop
+from .utils.storage import SQLiteStore
+from .utils.users import user_cache
 
 reward_types = {
     1: ["Gold", emojis["gold"]],
@@ -51,6 +67,27 @@ class MixinMeta(ABC):
         self.GAMEMODES: dict
         self.LEAGUES: dict
 
+        self.lookups: LookupTables
+        # Immutable Brawler prototypes and views of them.
+        self.registry: BrawlerRegistry
+
+        # Copy of the `maintenance` setting, checked before every command.
+        self.maintenance: dict
+        # Copy of the `gift_epochs` setting.
+        self.gift_epochs: List[Dict[str, int]]
+
+        self.cooldowns: CooldownManager
+        self.ledger: Ledger
+        self.matches: MatchRegistry
+        self.queue: MatchmakingQueue
+        self.metrics: Metrics
+        # Copy of user data with indexed columns, if enabled with `storage`.
+        self.store: Optional[SQLiteStore]
+
+        self.trophy_leaderboard: LeaderboardIndex
+        self.pb_leaderboard: LeaderboardIndex
+        self.brawler_leaderboards: Dict[str, LeaderboardIndex]
+
     @abstractmethod
     async def initialize(self):
         raise NotImplementedError
@@ -76,6 +113,8 @@ class MixinMeta(ABC):
     ):
         """Update stats of a player."""
 
+        stat_name = stat
+
         if substat:
             async with getattr(self.config.user(user), stat)() as stat:
                 if not sub_index:
@@ -96,6 +135,11 @@ class MixinMeta(ABC):
                 old_val = await self.get_player_stat(user, stat)
             await stat_attr.set(value + old_val)
 
+        if self.store is not None:
+            await self.store.set_stat(
+                user.id, stat_name, await getattr(self.config.user(user), stat_name)()
+            )
+
     async def get_trophies(
         self, user: discord.User,
         pb=False, brawler_name: str = None
@@ -114,24 +158,45 @@ class MixinMeta(ABC):
         else:
             return brawlers[brawler_name][stat]
 
+    def refresh_token_bank(self, session: PlayerSession):
+        """Add the tokens regenerated since the last token bank update."""
+
+        tokens_in_bank, bank_update_ts = regenerate_token_bank(
+            session["tokens_in_bank"],
+            session["bank_update_ts"],
+            utc_timestamp(datetime.utcnow())
+        )
+
+        if bank_update_ts != session["bank_update_ts"]:
+            session["tokens_in_bank"] = tokens_in_bank
+            session["bank_update_ts"] = bank_update_ts
+
     async def brawl_rewards(
         self,
-        user: discord.User,
+        session: PlayerSession,
         points: int,
         gm: str,
         is_starplayer=False,
     ):
-        """Adjust user variables and return embeds containing reward."""
+        """Adjust user variables and return embeds containing reward.
+
+        The changes are made to `session` and must be committed by the caller.
+        """
+
+        user = session.user
+
+        await self.refresh_star_tokens(session)
 
         star_token = 0
         if points > 0:
             reward_tokens = 20
             reward_xp = 8
             position = 1
-            async with self.config.user(user).todays_st() as todays_st:
-                if gm not in todays_st:
-                    star_token = 1
-                    todays_st.append(gm)
+            todays_st = session["todays_st"]
+            if gm not in todays_st:
+                star_token = 1
+                todays_st.append(gm)
+                session.mark_dirty("todays_st")
         elif points < 0:
             reward_tokens = 10
             reward_xp = 4
@@ -144,7 +209,8 @@ class MixinMeta(ABC):
         if is_starplayer:
             reward_xp += 10
 
-        tokens_in_bank = await self.get_player_stat(user, 'tokens_in_bank')
+        self.refresh_token_bank(session)
+        tokens_in_bank = session["tokens_in_bank"]
 
         if reward_tokens > tokens_in_bank:
             reward_tokens = tokens_in_bank
@@ -152,40 +218,22 @@ class MixinMeta(ABC):
         tokens_in_bank -= reward_tokens
 
         # brawler trophies
-        selected_brawler = await self.get_player_stat(
-            user, 'selected', is_iter=True, substat='brawler')
-        brawler_data = await self.get_player_stat(
-            user, 'brawlers', is_iter=True, substat=selected_brawler)
+        selected_brawler = session.selected_brawler
+        brawler_data = session.brawler(selected_brawler)
         trophies = brawler_data['trophies']
 
         reward_trophies = self.trophies_to_reward_mapping(trophies, '3v3', position)
 
         trophies += reward_trophies
 
-        token_doubler = await self.get_player_stat(user, 'token_doubler')
-
-        upd_td = token_doubler - reward_tokens
-        if upd_td < 0:
-            upd_td = 0
+        reward_tokens, upd_td = await self.add_tokens(user.id, reward_tokens, "brawl")
 
-        if token_doubler > reward_tokens:
-            reward_tokens *= 2
-        else:
-            reward_tokens += token_doubler
-
-        await self.update_player_stat(
-            user, 'tokens', reward_tokens, add_self=True)
-        await self.update_player_stat(user, 'tokens_in_bank', tokens_in_bank)
-        await self.update_player_stat(user, 'xp', reward_xp, add_self=True)
-        await self.update_player_stat(
-            user, 'brawlers', trophies,
-            substat=selected_brawler, sub_index='trophies'
-        )
-        await self.update_player_stat(user, 'token_doubler', upd_td)
-        await self.update_player_stat(
-            user, 'startokens', star_token, add_self=True
-        )
-        await self.handle_pb(user, selected_brawler)
+        session['tokens_in_bank'] = tokens_in_bank
+        session.add('xp', reward_xp)
+        brawler_data['trophies'] = trophies
+        session.mark_dirty('brawlers')
+        session.add('startokens', star_token)
+        self.handle_pb(session, selected_brawler)
 
         user_avatar = user.avatar_url
 
@@ -206,7 +254,7 @@ class MixinMeta(ABC):
         embed.add_field(name="Experience",
                         value=f"{emojis['xp']} {reward_xp_str}")
 
-        if token_doubler > 0:
+        if upd_td is not None:
             embed.add_field(
                 name="Token Doubler",
                 value=f"{emojis['tokendoubler']} x{upd_td} remaining!"
@@ -219,8 +267,8 @@ class MixinMeta(ABC):
                 inline=False
             )
 
-        rank_up = await self.handle_rank_ups(user, selected_brawler)
-        trophy_road_reward = await self.handle_trophy_road(user)
+        rank_up = await self.handle_rank_ups(session, selected_brawler)
+        trophy_road_reward = self.handle_trophy_road(session)
 
         return (embed, trophies-reward_trophies, reward_trophies), rank_up, trophy_road_reward
 
@@ -229,43 +277,34 @@ class MixinMeta(ABC):
     ):
 
         # position correlates with the list index
+        return self.lookups.reward(trophies, game_type, position)
 
-        if trophies in range(0, 50):
-            reward = self.REWARDS[game_type]["0-49"][position]
-        elif trophies in range(50, 100):
-            reward = self.REWARDS[game_type]["50-99"][position]
-        elif trophies in range(100, 200):
-            reward = self.REWARDS[game_type]["100-199"][position]
-        elif trophies in range(200, 300):
-            reward = self.REWARDS[game_type]["200-299"][position]
-        elif trophies in range(300, 400):
-            reward = self.REWARDS[game_type]["300-399"][position]
-        elif trophies in range(400, 500):
-            reward = self.REWARDS[game_type]["400-499"][position]
-        elif trophies in range(500, 600):
-            reward = self.REWARDS[game_type]["500-599"][position]
-        elif trophies in range(600, 700):
-            reward = self.REWARDS[game_type]["600-699"][position]
-        elif trophies in range(700, 800):
-            reward = self.REWARDS[game_type]["700-799"][position]
-        elif trophies in range(800, 900):
-            reward = self.REWARDS[game_type]["800-899"][position]
-        elif trophies in range(900, 1000):
-            reward = self.REWARDS[game_type]["900-999"][position]
-        elif trophies in range(1000, 1100):
-            reward = self.REWARDS[game_type]["1000-1099"][position]
-        elif trophies in range(1100, 1200):
-            reward = self.REWARDS[game_type]["1100-1199"][position]
-        else:
-            reward = self.REWARDS[game_type]["1200+"][position]
+    async def add_tokens(self, user_id: int, tokens: int, reason: str):
+        """Add tokens to the user's ledger, doubled by their Token Doubler.
 
-        return reward
+        Returns the number of tokens added and the remaining Token Doubler,
+        which is None if the user had no Token Doubler.
+        """
 
-    async def xp_handler(self, user: discord.User):
-        """Handle xp level ups."""
+        token_doubler = await self.ledger.balance(user_id, "token_doubler")
+        if not token_doubler:
+            await self.ledger.add(user_id, "tokens", tokens, reason)
+            return tokens, None
 
-        xp = await self.get_player_stat(user, 'xp')
-        lvl = await self.get_player_stat(user, 'lvl')
+        doubled = min(token_doubler, tokens)
+        await self.ledger.add(user_id, "token_doubler", -doubled, reason)
+        await self.ledger.add(user_id, "tokens", tokens + doubled, reason)
+
+        return tokens + doubled, token_doubler - doubled
+
+    async def xp_handler(self, session: PlayerSession):
+        """Handle xp level ups.
+
+        The changes are made to `session` and must be committed by the caller.
+        """
+
+        xp = session['xp']
+        lvl = session['lvl']
 
         next_xp = self.XP_LEVELS[str(lvl)]["Progress"]
 
@@ -274,65 +313,43 @@ class MixinMeta(ABC):
         else:
             return False
 
-        await self.update_player_stat(user, 'xp', carry)
-        await self.update_player_stat(user, 'lvl', lvl + 1)
+        session['xp'] = carry
+        session['lvl'] = lvl + 1
 
         level_up_msg = f"Level up! You have reached level {lvl+1}."
 
         reward_tokens = self.XP_LEVELS[str(lvl)]["TokensRewardCount"]
 
-        tokens = await self.get_player_stat(user, 'tokens')
-
-        token_doubler = await self.get_player_stat(user, 'token_doubler')
-
-        upd_td = token_doubler - reward_tokens
-        if upd_td < 0:
-            upd_td = 0
-
-        if token_doubler > reward_tokens:
-            reward_tokens *= 2
-        else:
-            reward_tokens += token_doubler
+        reward_tokens, _ = await self.add_tokens(session.user.id, reward_tokens, "level up")
 
         reward_msg = f"Rewards: {reward_tokens} {emojis['token']}"
 
-        tokens += reward_tokens
-        await self.update_player_stat(user, 'tokens', tokens)
-        await self.update_player_stat(user, 'token_doubler', upd_td)
-
         return (level_up_msg, reward_msg)
 
-    async def handle_pb(self, user: discord.User, brawler: str):
+    def handle_pb(self, session: PlayerSession, brawler: str):
         """Handle personal best changes."""
 
         # individual brawler
-        trophies = await self.get_trophies(user=user, brawler_name=brawler)
-        pb = await self.get_trophies(user=user, pb=True, brawler_name=brawler)
+        brawler_data = session.brawler(brawler)
 
-        if trophies > pb:
-            await self.update_player_stat(
-                user, 'brawlers', trophies, substat=brawler, sub_index='pb')
+        if brawler_data['trophies'] > brawler_data['pb']:
+            brawler_data['pb'] = brawler_data['trophies']
+            session.mark_dirty('brawlers')
 
     def get_rank(self, pb):
         """Return rank of the Brawler based on its personal best."""
 
-        for rank in self.RANKS:
-            start = self.RANKS[rank]["ProgressStart"]
-            # 1 is not subtracted as we're calling range
-            end = start + self.RANKS[rank]["Progress"]
-            if pb in range(start, end):
-                return int(rank)
-        else:
-            return 35
+        return self.lookups.rank(pb)
 
-    async def handle_rank_ups(self, user: discord.User, brawler: str):
+    async def handle_rank_ups(self, session: PlayerSession, brawler: str):
         """Function to handle Brawler rank ups.
 
         Returns an embed containing rewards if a brawler rank ups.
         """
 
-        brawler_data = await self.get_player_stat(
-            user, 'brawlers', is_iter=True, substat=brawler)
+        user = session.user
+
+        brawler_data = session.brawler(brawler)
 
         pb = brawler_data['pb']
         rank = brawler_data['rank']
@@ -342,30 +359,14 @@ class MixinMeta(ABC):
         if rank_as_per_pb <= rank:
             return False
 
-        await self.update_player_stat(
-            user, 'brawlers', rank_as_per_pb, brawler, 'rank')
+        brawler_data['rank'] = rank_as_per_pb
+        session.mark_dirty('brawlers')
 
         rank_up_tokens = self.RANKS[str(rank)]["PrimaryLvlUpRewardCount"]
-
-        token_doubler = await self.get_player_stat(user, 'token_doubler')
-
-        upd_td = token_doubler - rank_up_tokens
-        if upd_td < 0:
-            upd_td = 0
-
-        if token_doubler > rank_up_tokens:
-            rank_up_tokens *= 2
-        else:
-            rank_up_tokens += token_doubler
+        rank_up_tokens, upd_td = await self.add_tokens(user.id, rank_up_tokens, "rank up")
 
         rank_up_starpoints = self.RANKS[str(rank)]["SecondaryLvlUpRewardCount"]
-
-        await self.update_player_stat(
-            user, 'tokens', rank_up_tokens, add_self=True)
-        await self.update_player_stat(
-            user, 'starpoints', rank_up_starpoints, add_self=True)
-        await self.update_player_stat(
-            user, 'token_doubler', upd_td)
+        await self.ledger.add(user.id, "starpoints", rank_up_starpoints, "rank up")
 
         embed = discord.Embed(
             color=EMBED_COLOR,
@@ -381,7 +382,7 @@ class MixinMeta(ABC):
                 name="Star Points",
                 value=f"{emojis['starpoints']} {rank_up_starpoints}"
             )
-        if token_doubler > 0:
+        if upd_td is not None:
             embed.add_field(
                 name="Token Doubler",
                 value=f"{emojis['tokendoubler']} x{upd_td} remaining!",
@@ -389,38 +390,38 @@ class MixinMeta(ABC):
             )
         return embed
 
-    async def handle_trophy_road(self, user: discord.User):
+    def handle_trophy_road(self, session: PlayerSession):
         """Function to handle trophy road progress."""
 
-        trophies = await self.get_trophies(user)
-        tppased = await self.get_player_stat(user, 'tppassed')
+        user = session.user
 
-        for tier in self.TROPHY_ROAD:
-            if tier in tppased:
+        trophies = session.trophies()
+        tppassed = session['tppassed']
+
+        for tier in self.lookups.trophy_road_reached(trophies):
+            if tier in tppassed:
                 continue
             threshold = self.TROPHY_ROAD[tier]['Trophies']
 
-            if trophies > threshold:
-                async with self.config.user(user).tppassed() as tppassed:
-                    tppassed.append(tier)
-                async with self.config.user(user).tpstored() as tpstored:
-                    tpstored.append(tier)
+            tppassed.append(tier)
+            session['tppassed'] = tppassed
+            session['tpstored'].append(tier)
+            session.mark_dirty('tpstored')
 
-                reward_name, reward_emoji, reward_str = self.tp_reward_strings(
-                    self.TROPHY_ROAD[tier], tier)
+            reward_name, reward_emoji, reward_str = self.tp_reward_strings(
+                self.TROPHY_ROAD[tier], tier)
 
-                desc = "Claim the reward by using the `-rewards` command!"
-                title = f"Trophy Road Reward [{threshold} trophies]"
-                embed = discord.Embed(
-                    color=EMBED_COLOR, title=title, description=desc)
-                embed.set_author(name=user.name, icon_url=user.avatar_url)
-                embed.add_field(name=reward_name,
-                                value=f"{reward_emoji} {reward_str}")
+            desc = "Claim the reward by using the `-rewards` command!"
+            title = f"Trophy Road Reward [{threshold} trophies]"
+            embed = discord.Embed(
+                color=EMBED_COLOR, title=title, description=desc)
+            embed.set_author(name=user.name, icon_url=user.avatar_url)
+            embed.add_field(name=reward_name,
+                            value=f"{reward_emoji} {reward_str}")
 
-                return embed
+            return embed
 
-        else:
-            return False
+        return False
 
     def tp_reward_strings(self, reward_data, tier):
         reward_type = reward_data["RewardType"]
@@ -453,12 +454,12 @@ class MixinMeta(ABC):
         reward_extra = self.TROPHY_ROAD[reward_number]["RewardExtraData"]
 
         if reward_type == 1:
-            await self.update_player_stat(
-                user, 'gold', reward_count, add_self=True)
+            await self.ledger.add(user.id, "gold", reward_count, "trophy road")
 
         elif reward_type == 3:
             async with self.config.user(user).brawlers() as brawlers:
                 brawlers[reward_extra] = default_stats
+            self.update_leaderboards(user.id, brawlers)
 
         elif reward_type == 6:
             async with self.config.user(user).boxes() as boxes:
@@ -467,8 +468,8 @@ class MixinMeta(ABC):
             brawler_data = await self.get_player_stat(
                 user, 'brawlers', is_iter=True)
 
-            box = Box(self.BRAWLERS, brawler_data)
-            embed = await box.brawlbox(self.config.user(user), user)
+            box = Box(self.registry, brawler_data)
+            embed = await box.brawlbox(self.config.user(user), user, self.ledger)
 
             try:
                 await ctx.send(embed=embed)
@@ -479,12 +480,10 @@ class MixinMeta(ABC):
                 )
 
         elif reward_type == 7:
-            await self.update_player_stat(
-                user, 'tickets', reward_count, add_self=True)
+            await self.ledger.add(user.id, "tickets", reward_count, "trophy road")
 
         elif reward_type == 9:
-            await self.update_player_stat(
-                user, 'token_doubler', reward_count, add_self=True)
+            await self.ledger.add(user.id, "token_doubler", reward_count, "trophy road")
 
         elif reward_type == 10:
             async with self.config.user(user).boxes() as boxes:
@@ -493,8 +492,8 @@ class MixinMeta(ABC):
             brawler_data = await self.get_player_stat(
                 user, 'brawlers', is_iter=True)
 
-            box = Box(self.BRAWLERS, brawler_data)
-            embed = await box.megabox(self.config.user(user), user)
+            box = Box(self.registry, brawler_data)
+            embed = await box.megabox(self.config.user(user), user, self.ledger)
 
             try:
                 await ctx.send(embed=embed)
@@ -578,8 +577,8 @@ class MixinMeta(ABC):
             brawler_data = await self.get_player_stat(
                 user, 'brawlers', is_iter=True)
 
-            box = Box(self.BRAWLERS, brawler_data)
-            embed = await box.bigbox(self.config.user(user), user)
+            box = Box(self.registry, brawler_data)
+            embed = await box.bigbox(self.config.user(user), user, self.ledger)
 
             try:
                 await ctx.send(embed=embed)
@@ -592,16 +591,35 @@ class MixinMeta(ABC):
         async with self.config.user(user).tpstored() as tpstored:
             tpstored.remove(reward_number)
 
+    def add_pending_gifts(self, gifts: dict) -> bool:
+        """Add gifts given to all users since `gifts["epoch"]` to `gifts`.
+
+        Returns True if any gifts were pending.
+        """
+
+        pending = self.gift_epochs[gifts["epoch"]:]
+        if not pending:
+            return False
+
+        for epoch in pending:
+            for gift_type, quantity in epoch.items():
+                gifts[gift_type] = gifts.get(gift_type, 0) + quantity
+        gifts["epoch"] = len(self.gift_epochs)
+
+        return True
+
+    async def collect_gifts(self, user: discord.User):
+        """Save gifts given to all users which the user hasn't collected yet."""
+
+        async with self.config.user(user).gifts() as gifts:
+            self.add_pending_gifts(gifts)
+
     def get_sp_info(self, brawler_name: str, sp: str):
         """Return name and emoji of the Star Power."""
 
-        for brawler in self.BRAWLERS:
-            if brawler == brawler_name:
-                sp_name = self.BRAWLERS[brawler][sp]['name']
-                sp_ind = int(sp[2]) - 1
-                sp_icon = sp_icons[brawler][sp_ind]
+        star_power = self.registry.star_power(brawler_name, sp)
 
-        return sp_name, sp_icon
+        return star_power.name, star_power.icon
 
     def parse_brawler_name(self, brawler_name: str):
         """Parse brawler name."""
@@ -615,55 +633,125 @@ class MixinMeta(ABC):
 
         return brawler_name
 
+    async def build_leaderboards(self):
+        """Build the leaderboard indexes from stored user data."""
+
+        self.trophy_leaderboard.clear()
+        self.pb_leaderboard.clear()
+        self.brawler_leaderboards = {
+            brawler: LeaderboardIndex() for brawler in self.BRAWLERS
+        }
+
+        if self.store is not None:
+            # Only the Brawlers are needed, which the store can load alone.
+            all_brawlers = await self.store.all_brawlers()
+        else:
+            all_users = await self.config.all_users()
+            all_brawlers = {user_id: data["brawlers"] for user_id, data in all_users.items()}
+
+        for user_id, brawlers in all_brawlers.items():
+            self.update_leaderboards(user_id, brawlers)
+
+    async def open_store(self) -> SQLiteStore:
+        """Open the SQLite store in the cog's data folder, if not open."""
+
+        if self.store is None:
+            store = SQLiteStore(cog_data_path(self) / "brawlcord.sqlite3")
+            await store.open()
+            self.store = store
+
+        return self.store
+
+    async def save_to_store(self, user: discord.User):
+        """Copy the user's committed document to the SQLite store, if open.
+
+        Currencies are taken from the ledger.
+        """
+
+        if self.store is None:
+            return
+
+        data = await self.ledger.overlay(user.id, await self.config.user(user).all())
+        await self.store.save_user(user.id, data, time.time())
+
+    def update_leaderboards(self, user_id: int, brawlers: dict):
+        """Update user's entries in the leaderboard indexes."""
+
+        self.trophy_leaderboard.update(
+            user_id, sum([brawlers[brawler]["trophies"] for brawler in brawlers])
+        )
+        self.pb_leaderboard.update(
+            user_id, sum([brawlers[brawler]["pb"] for brawler in brawlers])
+        )
+
+        for brawler in brawlers:
+            if brawler not in self.brawler_leaderboards:
+                self.brawler_leaderboards[brawler] = LeaderboardIndex()
+            # Personal best is stored to show rank emoji.
+            self.brawler_leaderboards[brawler].update(
+                user_id, brawlers[brawler]["trophies"], brawlers[brawler]["pb"]
+            )
+
+    def remove_from_leaderboards(self, user_id: int):
+        """Remove user's entries from the leaderboard indexes."""
+
+        self.trophy_leaderboard.remove(user_id)
+        self.pb_leaderboard.remove(user_id)
+
+        for leaderboard in self.brawler_leaderboards.values():
+            leaderboard.remove(user_id)
+
+    async def get_leaderboard(
+        self, user: discord.User, pb=False, brawler_name=None
+    ) -> LeaderboardIndex:
+        """Return the leaderboard index to display to the user."""
+
+        if user.id not in self.trophy_leaderboard:
+            # User has not brawled since the indexes were built.
+            brawlers = await self.get_player_stat(user, "brawlers")
+            self.update_leaderboards(user.id, brawlers)
+
+        if brawler_name:
+            return self.brawler_leaderboards[brawler_name]
+
+        return self.pb_leaderboard if pb else self.trophy_leaderboard
+
     async def leaderboard_handler(
         self, ctx: Context, title: str, thumb_url: str,
         padding: int, pb=False, brawler_name=None
     ):
         """Handler for all leaderboards."""
 
-        all_users = await self.config.all_users()
-        users = []
-        for user_id in all_users:
-            try:
-                user = self.bot.get_user(user_id)
-                if not user:
-                    continue
-                trophies = await self.get_trophies(
-                    user, pb=pb, brawler_name=brawler_name)
-                users.append((user, trophies))
-            except Exception:
-                pass
-
-        # remove duplicates
-        users = list(set(users))
-        users = sorted(users, key=lambda k: k[1], reverse=True)
+        leaderboard = await self.get_leaderboard(ctx.author, pb, brawler_name)
 
         embed_desc = (
             "Check out who is at the top of the Brawlcord leaderboard!\n\u200b"
         )
         add_user = True
-        # return first 10 (or fewer) members
-        for i in range(10):
-            try:
-                trophies = users[i][1]
-                user = users[i][0]
-                if brawler_name:
-                    emoji = await self.get_rank_emoji(user, brawler_name)
-                else:
-                    _, emoji = await self.get_league_data(trophies)
-                if user.id == ctx.author.id:
-                    embed_desc += (
-                        f"**\n`{(i+1):02d}.` {user} {emoji}"
-                        f"{trophies:>{padding},}**"
-                    )
-                    add_user = False
-                else:
-                    embed_desc += (
-                        f"\n`{(i+1):02d}.` {user} {emoji}"
-                        f"{trophies:>{padding},}"
-                    )
-            except Exception:
-                pass
+        count = 0
+        # show first 10 (or fewer) members
+        for position, (user_id, trophies) in enumerate(leaderboard, start=1):
+            if count == 10:
+                break
+            user = user_cache.get(self.bot, user_id)
+            if not user:
+                continue
+            count += 1
+            if brawler_name:
+                emoji = self.get_rank_emoji(leaderboard.extra(user_id))
+            else:
+                _, emoji = self.get_league_data(trophies)
+            if user.id == ctx.author.id:
+                embed_desc += (
+                    f"**\n`{position:02d}.` {user} {emoji}"
+                    f"{trophies:>{padding},}**"
+                )
+                add_user = False
+            else:
+                embed_desc += (
+                    f"\n`{position:02d}.` {user} {emoji}"
+                    f"{trophies:>{padding},}"
+                )
 
         embed = discord.Embed(color=EMBED_COLOR, description=embed_desc)
         embed.set_author(name=title, icon_url=ctx.me.avatar_url)
@@ -671,31 +759,23 @@ class MixinMeta(ABC):
 
         # add rank of user
         if add_user:
-            for idx, user in enumerate(users):
-                if ctx.author == user[0]:
-                    val_str = ""
-                    try:
-                        trophies = users[idx][1]
-                        user = users[idx][0]
-                        if brawler_name:
-                            emoji = await self.get_rank_emoji(
-                                user, brawler_name)
-                        else:
-                            _, emoji = await self.get_league_data(trophies)
-                        val_str += (
-                            f"\n**`{(idx+1):02d}.` {user} {emoji}"
-                            f"{trophies:>{padding},}**"
-                        )
-                    except Exception:
-                        pass
-            try:
-                embed.add_field(name="Your position", value=val_str)
-            except UnboundLocalError:
+            position = leaderboard.position(ctx.author.id)
+            if position is None:
                 # happens only in case of brawlers
                 embed.add_field(name=f"\u200bNo one owns {brawler_name}!",
                                 value="Open boxes to unlock new Brawlers.")
-            except Exception:
-                pass
+            else:
+                user = ctx.author
+                trophies = leaderboard.score(user.id)
+                if brawler_name:
+                    emoji = self.get_rank_emoji(leaderboard.extra(user.id))
+                else:
+                    _, emoji = self.get_league_data(trophies)
+                val_str = (
+                    f"\n**`{position:02d}.` {user} {emoji}"
+                    f"{trophies:>{padding},}**"
+                )
+                embed.add_field(name="Your position", value=val_str)
 
         try:
             await ctx.send(embed=embed)
@@ -705,20 +785,10 @@ class MixinMeta(ABC):
                 " Please give/ask someone to give me that permission."
             )
 
-    async def get_league_data(self, trophies: int):
+    def get_league_data(self, trophies: int):
         """Return league number and emoji."""
-        for league in self.LEAGUES:
-            name = self.LEAGUES[league]["League"]
-            start = self.LEAGUES[league]["ProgressStart"]
-            end = start + self.LEAGUES[league]["Progress"]
-
-            # end = 14000 for Star V
-            if end != 14000:
-                if trophies in range(start, end + 1):
-                    break
-            else:
-                if trophies >= 14000:
-                    name = "Star V"
+
+        name = self.lookups.league(trophies)
 
         if name == "No League":
             return False, league_emojis[name]
@@ -728,50 +798,51 @@ class MixinMeta(ABC):
 
         return league_number, league_emojis[league_name]
 
-    async def get_rank_emoji(self, user: discord.User, brawler: str):
+    def get_rank_emoji(self, pb: int):
+        """Return rank emoji of a Brawler with the personal best."""
 
-        data = await self.get_player_stat(
-            user, 'brawlers', is_iter=True, substat=brawler)
-        rank = self.get_rank(data['pb'])
+        rank = self.get_rank(pb)
 
         return rank_emojis['br' + str(rank)]
 
-    def _box_name(self, box: str):
-        """Return box name"""
-
-        return box.split("box")[0].title() + " Box"
-
-    async def create_shop(self, user: discord.User, update=True) -> Shop:
+    async def create_shop(self, user: discord.User, shop_reset_ts: float) -> Shop:
+        """Generate and save a new daily shop for the user."""
 
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True
         )
 
-        shop = Shop(self.BRAWLERS, brawler_data)
+        shop = Shop(self.registry, brawler_data)
         shop.generate_shop_items()
         data = shop.to_json()
 
         await self.config.user(user).shop.set(data)
-
-        if update:
-            time_now = datetime.utcnow()
-            epoch = datetime(1970, 1, 1)
-            # get timestamp in UTC
-            timestamp = (time_now - epoch).total_seconds()
-            await self.config.shop_reset_ts.set(timestamp)
+        await self.config.user(user).shop_reset_ts.set(shop_reset_ts)
 
         return shop
 
+    async def get_shop(self, user: discord.User) -> Shop:
+        """Return user's daily shop.
+
+        A new shop is generated on first access after the daily shop reset.
+        """
+
+        shop_reset_ts = await self.config.shop_reset_ts()
+
+        shop_data = await self.config.user(user).shop()
+        last_reset = await self.config.user(user).shop_reset_ts()
+
+        if shop_data and last_reset == shop_reset_ts:
+            return Shop.from_json(shop_data)
+
+        return await self.create_shop(user, shop_reset_ts)
+
     async def _view_shop(self, ctx: Context):
         """Sends shop embeds."""
 
         user = ctx.author
 
-        shop_data = await self.config.user(user).shop()
-        if not shop_data:
-            shop = await self.create_shop(user, update=False)
-        else:
-            shop = Shop.from_json(shop_data)
+        shop = await self.get_shop(user)
 
         last_reset = datetime.utcfromtimestamp(
             await self.config.shop_reset_ts()
@@ -787,28 +858,31 @@ class MixinMeta(ABC):
 
         await menu(ctx, em, DEFAULT_CONTROLS)
 
-    async def reset_st(self, user: discord.User):
-        """Reset user star tokens list and update timestamp."""
+    async def refresh_star_tokens(self, session: PlayerSession):
+        """Clear today's star tokens if they were collected before the daily reset."""
+
+        st_reset_ts = await self.config.st_reset_ts()
 
-        async with self.config.user(user).todays_st() as todays_st:
-            todays_st.clear()
+        if session["st_reset_ts"] != st_reset_ts:
+            session["todays_st"] = []
+            session["st_reset_ts"] = st_reset_ts
 
-        time_now = datetime.utcnow()
-        epoch = datetime(1970, 1, 1)
-        # get timestamp in UTC
-        timestamp = (time_now - epoch).total_seconds()
-        await self.config.st_reset_ts.set(timestamp)
+    async def save_battle_log(self, log_data: list):
+        """Save complete log entry.
 
-    async def save_battle_log(self, log_data: dict):
-        """Save complete log entry."""
+        Each item of `log_data` holds the `PlayerSession` of a player. The log
+        entries are added to the sessions and must be committed by the caller.
+        """
+
+        size = await self.config.battle_log_size()
 
         if len(log_data) == 1:
             # One user is the bot.
-            user = log_data[0]["user"]
-            partial_logs = await self.config.user(user).partial_battle_log()
-            partial_log_json = partial_logs[-1]
+            session: PlayerSession = log_data[0]["session"]
+            partial_log_json = session["partial_battle_log"].pop()
+            session.mark_dirty("partial_battle_log")
 
-            partial_log = await PartialBattleLogEntry.from_json(partial_log_json, self.bot)
+            partial_log = PartialBattleLogEntry.from_json(partial_log_json, self.bot)
             player_extras = {
                 "brawler_trophies": log_data[0]["trophies"],
                 "reward_trophies": log_data[0]["reward"]
@@ -818,8 +892,9 @@ class MixinMeta(ABC):
                 "reward_trophies": 0
             }
             log_entry = BattleLogEntry(partial_log, player_extras, opponent_extras).to_json()
-            async with self.config.user(user).battle_log() as battle_log:
-                battle_log.append(log_entry)
+            session["battle_log"].append(log_entry)
+            trim_log(session["battle_log"], size)
+            session.mark_dirty("battle_log")
         else:
             for i in [0, 1]:
                 if i == 0:
@@ -827,11 +902,11 @@ class MixinMeta(ABC):
                 else:
                     other = 0
 
-                user = log_data[i]["user"]
-                partial_logs = await self.config.user(user).partial_battle_log()
-                partial_log_json = partial_logs[-1]
+                session: PlayerSession = log_data[i]["session"]
+                partial_log_json = session["partial_battle_log"].pop()
+                session.mark_dirty("partial_battle_log")
 
-                partial_log = await PartialBattleLogEntry.from_json(partial_log_json, self.bot)
+                partial_log = PartialBattleLogEntry.from_json(partial_log_json, self.bot)
                 player_extras = {
                     "brawler_trophies": log_data[i]["trophies"],
                     "reward_trophies": log_data[i]["reward"]
@@ -841,8 +916,46 @@ class MixinMeta(ABC):
                     "reward_trophies": log_data[other]["reward"]
                 }
                 log_entry = BattleLogEntry(partial_log, player_extras, opponent_extras).to_json()
-                async with self.config.user(user).battle_log() as battle_log:
-                    battle_log.append(log_entry)
+                session["battle_log"].append(log_entry)
+                trim_log(session["battle_log"], size)
+                session.mark_dirty("battle_log")
+
+    async def compact_battle_logs(self):
+        """Trim battle logs of all users to the configured size.
+
+        Returns the number of users trimmed and total size of their data
+        (in bytes) before and after trimming.
+        """
+
+        size = await self.config.battle_log_size()
+
+        users = 0
+        before = 0
+        after = 0
+
+        all_users = await self.config.all_users()
+        for user_id, data in all_users.items():
+            battle_log = data.get("battle_log", [])
+            partial_battle_log = data.get("partial_battle_log", [])
+            if (
+                len(battle_log) <= size
+                and len(partial_battle_log) <= PARTIAL_BATTLE_LOG_SIZE
+            ):
+                continue
+
+            users += 1
+            before += len(json.dumps(data))
+
+            trim_log(battle_log, size)
+            trim_log(partial_battle_log, PARTIAL_BATTLE_LOG_SIZE)
+
+            conf = self.config.user_from_id(user_id)
+            await conf.battle_log.set(battle_log)
+            await conf.partial_battle_log.set(partial_battle_log)
+
+            after += len(json.dumps(data))
+
+        return users, before, after
 
     def parse_gamemode(self, gamemode: str):
         """Returns full game mode name from user input.
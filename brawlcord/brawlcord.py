@@ -15,8 +15,18 @@ from .misc import MiscMixin
 from .owner import OwnerMixin
 from .stats import StatisticsMixin
 from .tasks import TasksMixin
-from .utils.constants import default_stats
+from .utils.brawlers import BrawlerRegistry
+from .utils.constants import BATTLE_LOG_SIZE, default_stats
+from .utils.cooldown import CooldownManager
 from .utils.errors import MaintenanceError
+from .utils.gamemodes import MOVE_TIMEOUT
+from .utils.leaderboard import LeaderboardIndex
+from .utils.ledger import LEDGER, Ledger, default_ledger
+from .utils.lookup import LookupTables
+from .utils.matches import MatchRegistry
+from .utils.matchmaking import MatchmakingQueue
+from .utils.metrics import Metrics
+from .utils.users import user_cache
 
 __version__ = "2.3.1"
 __author__ = "Snowsee"
@@ -35,6 +45,16 @@ default = {
     "st_reset_ts": None,  # star tokens reset timestamp
     "clubs": [],
     "club_id_length": 5,
+    # Total trophies and sorted member trophies of each club, by club ID.
+    "club_stats": {},
+    # Gifts given to all users, as a list of `{gift_type: quantity}`.
+    # Users add the gifts to their own when they next use economy commands.
+    "gift_epochs": [],
+    # Whether user data is also kept in a SQLite database, see `storage`.
+    "sqlite_storage": False,
+    "battle_log_size": BATTLE_LOG_SIZE,
+    # Whether battle logs stored before they were capped have been trimmed.
+    "battle_logs_compacted": False,
     # Whether the bot has informed the bot owners about discontinuation of the Red cog or not.
     "informed_about_discontinuation": False,
 }
@@ -84,12 +104,16 @@ default_user = {
     "gifts": {
         "brawlbox": 0,
         "bigbox": 0,
-        "megabox": 0
+        "megabox": 0,
+        # number of `gift_epochs` already added to the gifts
+        "epoch": 0
     },
     "shop": {},
+    "shop_reset_ts": None,  # daily shop reset the shop was generated for
     # list of gamemodes where the user
     # already received daily star tokens
     "todays_st": [],
+    "st_reset_ts": None,  # star tokens reset `todays_st` belongs to
     "battle_log": [],
     "partial_battle_log": [],
     "club": None,  # club identifier
@@ -122,7 +146,14 @@ class Brawlcord(
 
         self.bot = bot
 
-        self.sessions = []
+        # Brawls without a move for twice the move timeout are stale.
+        self.matches = MatchRegistry(stale_after=2 * MOVE_TIMEOUT)
+        # Players waiting for an opponent, see `-brawl`.
+        self.queue = MatchmakingQueue(self.matches)
+
+        self.trophy_leaderboard = LeaderboardIndex()
+        self.pb_leaderboard = LeaderboardIndex()
+        self.brawler_leaderboards = {}
 
         self.config = Config.get_conf(
             self, 1_070_701_001, force_registration=True)
@@ -131,6 +162,15 @@ class Brawlcord(
 
         self.config.register_global(**default)
         self.config.register_user(**default_user)
+        self.config.init_custom(LEDGER, 1)
+        self.config.register_custom(LEDGER, **default_ledger)
+
+        # Latencies and Config calls of each command, see `perfstats`.
+        self.metrics = Metrics()
+        self.metrics.instrument(self.config)
+
+        self.cooldowns = CooldownManager(self.config)
+        self.ledger = Ledger(self.config)
 
         self.BRAWLERS: dict = None
         self.REWARDS: dict = None
@@ -141,6 +181,13 @@ class Brawlcord(
         self.GAMEMODES: dict = None
         self.LEAGUES: dict = None
 
+        self.lookups: LookupTables = None
+        self.registry: BrawlerRegistry = None
+
+        self.maintenance: dict = {"setting": False, "duration": 0}
+        self.gift_epochs: list = []
+        self.store = None
+
         def error_callback(fut):
             try:
                 fut.result()
@@ -150,11 +197,17 @@ class Brawlcord(
                 logging.exception("Error in task", exc_info=exc)
                 print("Error in task:", exc)
 
-        self.bank_update_task = self.bot.loop.create_task(self.update_token_bank())
         self.status_task = self.bot.loop.create_task(self.update_status())
         self.shop_and_st_task = self.bot.loop.create_task(self.update_shop_and_st())
-        self.bank_update_task.add_done_callback(error_callback)
+        self.cooldowns_task = self.bot.loop.create_task(self.flush_cooldowns())
+        self.reaper_task = self.bot.loop.create_task(self.reap_matches())
+        self.ledger_task = self.bot.loop.create_task(self.flush_ledger())
+        self.matchmaking_task = self.bot.loop.create_task(self.sweep_matchmaking())
         self.shop_and_st_task.add_done_callback(error_callback)
+        self.cooldowns_task.add_done_callback(error_callback)
+        self.reaper_task.add_done_callback(error_callback)
+        self.ledger_task.add_done_callback(error_callback)
+        self.matchmaking_task.add_done_callback(error_callback)
         self.status_task.add_done_callback(error_callback)
 
     async def initialize(self):
@@ -184,6 +237,28 @@ class Brawlcord(
         with leagues_fp.open("r") as f:
             self.LEAGUES = json.load(f)
 
+        self.lookups = LookupTables(
+            self.REWARDS, self.RANKS, self.LEAGUES, self.TROPHY_ROAD
+        )
+
+        self.maintenance = await self.config.maintenance()
+        self.gift_epochs = await self.config.gift_epochs()
+
+        self.registry = BrawlerRegistry(self.BRAWLERS)
+
+        if await self.config.sqlite_storage():
+            await self.open_store()
+
+        await self.build_leaderboards()
+
+        if not await self.config.battle_logs_compacted():
+            users, before, after = await self.compact_battle_logs()
+            log.info(
+                f"Compacted battle logs of {users} users."
+                f" Their data size: {before / 1024:,.1f} KiB -> {after / 1024:,.1f} KiB"
+            )
+            await self.config.battle_logs_compacted.set(True)
+
         custom_help = await self.config.custom_help()
         if custom_help:
             self.bot._help_formatter = BrawlcordHelp(self.bot)
@@ -208,6 +283,12 @@ class Brawlcord(
         if old_info:
             await ctx.invoke(old_info)
 
+    async def cog_before_invoke(self, ctx: Context):
+        self.metrics.start(ctx.command.qualified_name)
+
+    async def cog_after_invoke(self, ctx: Context):
+        self.metrics.finish()
+
     async def cog_command_error(self, ctx: Context, error: Exception):
         if not isinstance(
             getattr(error, "original", error),
@@ -224,11 +305,31 @@ class Brawlcord(
             ctx, getattr(error, "original", error), unhandled_by_cog=True
         )
 
+    async def flush_ledger_and_close_store(self):
+        """Save the ledgers, then close the SQLite store they are synced to."""
+
+        store = self.store
+        await self.ledger.flush(store)
+        if store is not None:
+            await store.close()
+
     def cog_unload(self):
         # Cancel various tasks.
-        self.bank_update_task.cancel()
         self.status_task.cancel()
         self.shop_and_st_task.cancel()
+        self.cooldowns_task.cancel()
+        self.reaper_task.cancel()
+        self.ledger_task.cancel()
+        self.matchmaking_task.cancel()
+
+        # Players still waiting for an opponent are dropped.
+        self.queue.close()
+
+        # Save cooldowns and ledgers changed since the last flush.
+        self.bot.loop.create_task(self.cooldowns.flush())
+        self.bot.loop.create_task(self.flush_ledger_and_close_store())
+
+        user_cache.clear()
 
         # Restore old invite command.
         global old_invite
@@ -7,7 +7,6 @@ from redbot.core.utils.chat_formatting import pagify
 from .abc import MixinMeta
 from .utils.box import Box
 from .utils.constants import EMBED_COLOR
-from .utils.cooldown import user_cooldown, user_cooldown_msg
 from .utils.core import maintenance
 from .utils.emojis import emojis
 
@@ -25,9 +24,9 @@ class EconomyMixin(MixinMeta):
 
         user = ctx.author
 
-        tokens = await self.get_player_stat(user, 'tokens')
+        await self.collect_gifts(user)
 
-        if tokens < 100:
+        if not await self.ledger.spend(user.id, "tokens", 100, "brawl box"):
             return await ctx.send(
                 "You do not have enough Tokens to open a brawl box."
             )
@@ -35,10 +34,11 @@ class EconomyMixin(MixinMeta):
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True)
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
         try:
-            embed = await box.brawlbox(self.config.user(user), user)
+            embed = await box.brawlbox(self.config.user(user), user, self.ledger)
         except Exception as exc:
+            await self.ledger.add(user.id, "tokens", 100, "brawl box refund")
             return await ctx.send(
                 f"Error \"{exc}\" while opening a Brawl Box."
                 " Please notify bot creator using `-report` command."
@@ -52,8 +52,6 @@ class EconomyMixin(MixinMeta):
                 " Please give/ask someone to give me that permission."
             )
 
-        await self.update_player_stat(user, 'tokens', -100, add_self=True)
-
     @commands.command(name="bigbox", aliases=['big'])
     @maintenance()
     async def _big_box(self, ctx: Context):
@@ -61,6 +59,8 @@ class EconomyMixin(MixinMeta):
 
         user = ctx.author
 
+        await self.collect_gifts(user)
+
         startokens = await self.get_player_stat(user, 'startokens')
 
         if startokens < 10:
@@ -71,9 +71,9 @@ class EconomyMixin(MixinMeta):
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True)
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
         try:
-            embed = await box.bigbox(self.config.user(user), user)
+            embed = await box.bigbox(self.config.user(user), user, self.ledger)
         except Exception as exc:
             return await ctx.send(
                 f"Error {exc} while opening a Big Box."
@@ -94,7 +94,8 @@ class EconomyMixin(MixinMeta):
     @maintenance()
     async def _rewards(self, ctx: Context):
         """View and claim collected trophy road rewards"""
-        pass
+
+        await self.collect_gifts(ctx.author)
 
     @_rewards.command(name="list")
     async def rewards_list(self, ctx: Context):
@@ -235,24 +236,25 @@ class EconomyMixin(MixinMeta):
     @maintenance()
     async def _claim(self, ctx: Context):
         """Claim daily/weekly rewards"""
-        pass
+
+        await self.collect_gifts(ctx.author)
 
     @_claim.command(name="daily")
     async def claim_daily(self, ctx: Context):
         """Claim daily reward"""
 
-        if not await user_cooldown(1, DAY, self.config, ctx):
-            msg = await user_cooldown_msg(ctx, self.config)
-            return await ctx.send(msg)
+        command = ctx.command.qualified_name
+        if not await self.cooldowns.use(ctx.author.id, command, 1, DAY):
+            return await ctx.send(self.cooldowns.cooldown_msg(ctx.author.id, command))
 
         user = ctx.author
 
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True)
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
         try:
-            embed = await box.brawlbox(self.config.user(user), user)
+            embed = await box.brawlbox(self.config.user(user), user, self.ledger)
         except Exception as exc:
             return await ctx.send(
                 f"Error \"{exc}\" while opening a Brawl Box."
@@ -271,18 +273,18 @@ class EconomyMixin(MixinMeta):
     async def claim_weekly(self, ctx: Context):
         """Claim weekly reward"""
 
-        if not await user_cooldown(1, WEEK, self.config, ctx):
-            msg = await user_cooldown_msg(ctx, self.config)
-            return await ctx.send(msg)
+        command = ctx.command.qualified_name
+        if not await self.cooldowns.use(ctx.author.id, command, 1, WEEK):
+            return await ctx.send(self.cooldowns.cooldown_msg(ctx.author.id, command))
 
         user = ctx.author
 
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True)
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
         try:
-            embed = await box.bigbox(self.config.user(user), user)
+            embed = await box.bigbox(self.config.user(user), user, self.ledger)
         except Exception as exc:
             return await ctx.send(
                 f"Error \"{exc}\" while opening a Big Box."
@@ -310,6 +312,8 @@ class EconomyMixin(MixinMeta):
         user = ctx.author
 
         gifts = await self.get_player_stat(user, 'gifts')
+        # Show gifts given to all users too, they are saved when collected.
+        self.add_pending_gifts(gifts)
 
         desc = "Use `-gift` command to learn more about claiming rewards!"
         embed = discord.Embed(
@@ -349,6 +353,8 @@ class EconomyMixin(MixinMeta):
 
         user = ctx.author
 
+        await self.collect_gifts(user)
+
         saved = await self.get_player_stat(
             user, "gifts", is_iter=True, substat="megabox")
 
@@ -358,9 +364,9 @@ class EconomyMixin(MixinMeta):
         brawler_data = await self.get_player_stat(
             user, 'brawlers', is_iter=True)
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
         try:
-            embed = await box.megabox(self.config.user(user), user)
+            embed = await box.megabox(self.config.user(user), user, self.ledger)
         except Exception as exc:
             return await ctx.send(
                 f"Error \"{exc}\" while opening a Mega Box."
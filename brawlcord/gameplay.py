@@ -1,5 +1,7 @@
 import asyncio
+import logging
 import random
+import time
 import traceback
 from datetime import datetime
 
@@ -11,14 +13,15 @@ from redbot.core.utils.predicates import ReactionPredicate
 
 from .abc import MixinMeta
 from .utils.battlelog import BattleLogEntry
-from .utils.brawlers import Brawler, brawlers_map
+from .utils.brawlers import Brawler
 from .utils.club import Club
 from .utils.constants import COMMUNITY_SERVER, EMBED_COLOR, SHELLY_TUT
 from .utils.core import maintenance
 from .utils.emojis import brawler_emojis, club_icons, emojis, gamemode_emotes, level_emotes
 from .utils.errors import AmbiguityError, UserRejected
 from .utils.gamemodes import GameMode, gamemodes_map
-from .utils.shop import Shop
+from .utils.matchmaking import rating
+from .utils.session import PlayerSession
 
 LOG_COLORS = {
     "Victory": 0x6CFF52,
@@ -28,6 +31,8 @@ LOG_COLORS = {
 
 gamemode_thumb = "https://www.starlist.pro/assets/gamemode/{}.png"
 
+log = logging.getLogger("red.brawlcord.gameplay")
+
 
 class GameplayMixin(MixinMeta):
     """Class for gameplay commands."""
@@ -61,28 +66,80 @@ class GameplayMixin(MixinMeta):
                 return await ctx.send(
                     f"{opponent} is a bot account. Can't brawl against bots.")
 
-        if user.id in self.sessions:
+        if user.id in self.matches:
             return await ctx.send("You are already in a brawl!")
 
-        if opponent:
-            if opponent.id in self.sessions:
-                return await ctx.send(f"{opponent} is already in a brawl!")
+        if user.id in self.queue:
+            return await ctx.send("You are already looking for a brawl!")
 
-            if opponent != guild.me:
-                self.sessions.append(opponent.id)
+        # Opponents found by the matchmaking queue don't need to accept.
+        matched = False
+        if not opponent:
+            selected = await self.get_player_stat(user, "selected", is_iter=True)
+            brawler_data = await self.get_player_stat(
+                user, "brawlers", is_iter=True, substat=selected["brawler"]
+            )
 
-        self.sessions.append(user.id)
+            # Checked again since the user could have used the command meanwhile.
+            if user.id in self.matches or user.id in self.queue:
+                return await ctx.send("You are already in a brawl!")
 
-        gm = await self.get_player_stat(
-            user, "selected", is_iter=True, substat="gamemode"
-        )
+            ticket = self.queue.join(
+                user,
+                selected["gamemode"],
+                rating(brawler_data["trophies"], brawler_data["level"])
+            )
+            if not ticket.future.done():
+                await ctx.send("Looking for an opponent...")
+
+            try:
+                opponent_ticket = await ticket.future
+            except asyncio.CancelledError:
+                self.queue.leave(ticket)
+                if ticket.match is not None:
+                    self.matches.end(ticket.match)
+                raise
+
+            # No opponent before the deadline means a brawl against a bot.
+            if opponent_ticket is not None:
+                if not ticket.host:
+                    # The opponent's command runs the brawl.
+                    return await ctx.send(
+                        f"{user.mention} Found an opponent: {opponent_ticket.user}!"
+                        " Please check your Direct Messages."
+                    )
+                opponent = opponent_ticket.user
+                matched = True
+        elif opponent.id in self.queue:
+            return await ctx.send(f"{opponent} is looking for a brawl!")
+
+        if matched:
+            # Both users were registered in the brawl when they were paired.
+            match = ticket.match
+        else:
+            user_ids = [user.id]
+            if opponent:
+                if opponent.id in self.matches:
+                    return await ctx.send(f"{opponent} is already in a brawl!")
 
-        g: GameMode = gamemodes_map[gm](
-            ctx, user, opponent, self.config.user, self.BRAWLERS)
+                if opponent != guild.me:
+                    user_ids.append(opponent.id)
 
-        await ctx.send(f"Please check your Direct Messages.")
+            # Register the brawl before any await so that users can't start two.
+            match = self.matches.start(None, *user_ids)
 
         try:
+            gm = await self.get_player_stat(
+                user, "selected", is_iter=True, substat="gamemode"
+            )
+
+            g: GameMode = gamemodes_map[gm](
+                ctx, user, opponent, self.config.user, self.registry, matched)
+            match.game = g
+            g.match = match
+
+            await ctx.send(f"Please check your Direct Messages.")
+
             first_player, second_player = await g.initialize(ctx)
             winner, loser = await g.play(ctx)
         except (asyncio.TimeoutError, UserRejected, discord.Forbidden):
@@ -94,11 +151,9 @@ class GameplayMixin(MixinMeta):
                 " Please notify bot owner by using `-report` command."
             )
         finally:
-            self.sessions.remove(user.id)
-            try:
-                self.sessions.remove(opponent.id)
-            except (ValueError, AttributeError):
-                pass
+            self.matches.end(match)
+
+        match_end = time.perf_counter()
 
         players = [first_player, second_player]
 
@@ -113,11 +168,7 @@ class GameplayMixin(MixinMeta):
                 " The match ended in a draw!"
             )
 
-        log_data = []
-        count = 0
-        for player in players:
-            if player == guild.me:
-                continue
+        async def compute_rewards(player: discord.User) -> dict:
             if player == winner:
                 points = 1
             elif player == loser:
@@ -125,25 +176,80 @@ class GameplayMixin(MixinMeta):
             else:
                 points = 0
 
-            # brawl rewards, rank up rewards and trophy road rewards
-            br, rur, trr = await self.brawl_rewards(player, points, gm)
+            session = await PlayerSession.load(self.config, player)
 
-            log_data.append({"user": player, "trophies": br[1], "reward": br[2]})
-
-            count += 1
-            if count == 1:
-                await ctx.send("Direct messaging rewards!")
-            level_up = await self.xp_handler(player)
-            await player.send(embed=br[0])
+            # brawl rewards, rank up rewards and trophy road rewards
+            br, rur, trr = await self.brawl_rewards(session, points, gm)
+            level_up = await self.xp_handler(session)
+
+            return {
+                "session": session,
+                "trophies": br[1],
+                "reward": br[2],
+                "rewards": (br[0], level_up, rur, trr)
+            }
+
+        async def send_rewards(player: discord.User, rewards: tuple):
+            reward_embed, level_up, rur, trr = rewards
+            # Level up message is sent with the reward embed.
             if level_up:
-                await player.send(f"{level_up[0]}\n{level_up[1]}")
+                await player.send(f"{level_up[0]}\n{level_up[1]}", embed=reward_embed)
+            else:
+                await player.send(embed=reward_embed)
             if rur:
                 await player.send(embed=rur)
             if trr:
                 await player.send(embed=trr)
 
+        # Both players are handled concurrently.
+        log_data = await asyncio.gather(
+            *[compute_rewards(player) for player in players if player != guild.me]
+        )
+
         await self.save_battle_log(log_data)
 
+        async def commit(session: PlayerSession):
+            await session.commit()
+            await self.save_to_store(session.user)
+
+        await asyncio.gather(*[commit(data["session"]) for data in log_data])
+
+        for data in log_data:
+            session: PlayerSession = data["session"]
+            self.update_leaderboards(session.user.id, session["brawlers"])
+            # Not concurrent, as both players can be in the same club.
+            if session["club"] is not None:
+                await Club.update_member_trophies(
+                    session["club"],
+                    session.user.id,
+                    self.trophy_leaderboard.score(session.user.id),
+                    self.config
+                )
+            log.debug(
+                f"Post-brawl update of {session.user.id} used {session.reads}"
+                f" Config reads and {session.writes} writes."
+            )
+
+        await ctx.send("Direct messaging rewards!")
+        results = await asyncio.gather(
+            *[
+                send_rewards(data["session"].user, data["rewards"])
+                for data in log_data
+            ],
+            return_exceptions=True
+        )
+
+        log.debug(
+            f"Delivered rewards {(time.perf_counter() - match_end) * 1000:.0f} ms"
+            " after the end of the match."
+        )
+
+        for data, result in zip(log_data, results):
+            if isinstance(result, Exception):
+                log.warning(
+                    f"Unable to DM rewards to {data['session'].user.id}: {result}"
+                )
+
     @commands.command(name="tutorial", aliases=["tut"])
     @commands.guild_only()
     @maintenance()
@@ -223,6 +329,11 @@ class GameplayMixin(MixinMeta):
         timestamp = (dt_now - epoch).total_seconds()
         await self.update_player_stat(author, 'bank_update_ts', timestamp)
 
+        # New players don't get gifts given to all users before they joined.
+        await self.update_player_stat(
+            author, "gifts", len(self.gift_epochs), substat="epoch"
+        )
+
     @commands.command(name="brawler", aliases=['binfo'])
     @maintenance()
     async def _brawler(self, ctx: Context, *, brawler_name: str):
@@ -230,7 +341,7 @@ class GameplayMixin(MixinMeta):
 
         user = ctx.author
 
-        brawlers = self.BRAWLERS
+        brawlers = self.registry
 
         # for users who input 'el_primo' or 'primo'
         brawler_name = brawler_name.replace("_", " ")
@@ -253,7 +364,7 @@ class GameplayMixin(MixinMeta):
 
         owned = True if brawler in owned_brawlers else False
 
-        b: Brawler = brawlers_map[brawler](self.BRAWLERS, brawler)
+        b: Brawler = self.registry[brawler]
 
         if owned:
             brawler_data = await self.get_player_stat(
@@ -300,9 +411,8 @@ class GameplayMixin(MixinMeta):
                     "Super Rare", "Epic", "Mythic", "Legendary"]
         for rarity in rarities:
             rarity_str = ""
-            for brawler in self.BRAWLERS:
-                if rarity != self.BRAWLERS[brawler]["rarity"]:
-                    continue
+            for brawler in self.registry.by_rarity.get(rarity, ()):
+                brawler = brawler.name
                 rarity_str += f"\n{brawler_emojis[brawler]} {brawler}"
                 if brawler in owned:
                     rarity_str += " [Owned]"
@@ -394,7 +504,7 @@ class GameplayMixin(MixinMeta):
                 f" ({powerpoints}/{required_powerpoints})"
             )
 
-        gold = await self.get_player_stat(user, 'gold', is_iter=False)
+        gold = await self.ledger.balance(user.id, "gold")
 
         required_gold = self.LEVEL_UPS[str(level)]["RequiredCurrency"]
 
@@ -418,13 +528,15 @@ class GameplayMixin(MixinMeta):
             # User responded with cross
             return await ctx.send("Upgrade cancelled.")
 
+        if not await self.ledger.spend(user.id, "gold", required_gold, "upgrade"):
+            return await ctx.send("You do not have enough gold!")
+
         await self.update_player_stat(
             user, 'brawlers', level + 1, substat=brawler, sub_index='level')
         await self.update_player_stat(
             user, 'brawlers', powerpoints - required_powerpoints,
             substat=brawler, sub_index='powerpoints'
         )
-        await self.update_player_stat(user, 'gold', gold - required_gold)
 
         await ctx.send(f"Upgraded {brawler} to power {level+1}!")
 
@@ -457,7 +569,7 @@ class GameplayMixin(MixinMeta):
 
         sps = [f"sp{ind}" for ind, sp in enumerate(
             [brawler_data["sp1"], brawler_data["sp2"]], start=1) if sp]
-        sps = [self.BRAWLERS[brawler_name][sp]["name"] for sp in sps]
+        sps = [self.registry.star_power(brawler_name, sp).name for sp in sps]
 
         if sps:
             await self.update_player_stat(
@@ -589,19 +701,17 @@ class GameplayMixin(MixinMeta):
     async def _shop_buy(self, ctx: Context, item_number: str):
         """Buy items from the daily shop"""
 
-        data = await self.config.user(ctx.author).shop()
-
-        shop = Shop.from_json(data)
+        shop = await self.get_shop(ctx.author)
 
         try:
             item_number = int(item_number)
             new_data = await shop.buy_item(
-                ctx, ctx.author, self.config, self.BRAWLERS, item_number
+                ctx, ctx.author, self.config, self.registry, item_number, self.ledger
             )
         except ValueError:
             new_data = await shop.buy_skin(
                 ctx, ctx.author, self.config,
-                self.BRAWLERS, item_number.upper()
+                self.registry, item_number.upper(), self.ledger
             )
 
         if new_data:
@@ -620,10 +730,10 @@ class GameplayMixin(MixinMeta):
         """Show the battle log with last 10 (or fewer) entries"""
 
         battle_log = await self.config.user(ctx.author).battle_log()
-        battle_log.reverse()
 
-        # Only show 10 (or fewer) most recent logs.
+        # Only show 10 (or fewer) most recent logs, newest first.
         battle_log = battle_log[-10:]
+        battle_log.reverse()
         total_pages = len(battle_log)
 
         if total_pages < 1:
@@ -634,7 +744,7 @@ class GameplayMixin(MixinMeta):
         embeds = []
 
         for page_num, entry_json in enumerate(battle_log, start=1):
-            entry: BattleLogEntry = await BattleLogEntry.from_json(entry_json, self.bot)
+            entry: BattleLogEntry = BattleLogEntry.from_json(entry_json, self.bot)
 
             embed = discord.Embed(
                 color=LOG_COLORS[entry.result],
@@ -644,7 +754,7 @@ class GameplayMixin(MixinMeta):
                 name=f"{ctx.author.name}'s Battle Log", icon_url=ctx.author.avatar_url
             )
             embed.description = (
-                f"Opponent: **{entry.opponent}**"
+                f"Opponent: **{entry.opponent_name}**"
                 f"\nResult: **{entry.result}**"
                 f"\nGame Mode: {gamemode_emotes[entry.game_mode]} **{entry.game_mode}**"
             )
@@ -773,6 +883,8 @@ class GameplayMixin(MixinMeta):
                 club = await Club.club_from_id(club_id, self.config, self.bot)
                 await club.remove_user(ctx.author, self.config)
                 await self.config.user(ctx.author).club.set(None)
+                if self.store is not None:
+                    await self.store.set_stat(ctx.author.id, "club", None)
                 await ctx.send("Left the club!")
             else:
                 await ctx.send("Cancelled leaving club.")
@@ -832,7 +944,9 @@ class GameplayMixin(MixinMeta):
         except ValueError as e:
             return await ctx.send(e)
 
-        await self.config.user(ctx.author).club.set(club_id)
+        await self.config.user(ctx.author).club.set(club.id)
+        if self.store is not None:
+            await self.store.set_stat(ctx.author.id, "club", club.id)
         await ctx.send("Joined the club!")
 
     @_club.command(name="info")
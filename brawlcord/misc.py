@@ -1,5 +1,6 @@
 import asyncio
-import json
+import functools
+import io
 import logging
 import re
 import urllib.request
@@ -9,7 +10,7 @@ from distutils.version import LooseVersion
 import discord
 from redbot.core import commands, checks
 from redbot.core.commands import Context
-from redbot.core.utils.chat_formatting import humanize_timedelta, text_to_file
+from redbot.core.utils.chat_formatting import humanize_timedelta
 from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
 
@@ -25,6 +26,7 @@ from .utils.constants import (
     SOURCE_LINK
 )
 from .utils.core import maintenance
+from .utils.export import build_export
 
 # NOTE: `.brawlcord.__version__` is imported in `MiscMixin._brawlcord` method
 # to avoid circular imports.
@@ -317,7 +319,14 @@ class MiscMixin(MixinMeta):
                 return await ctx.send("You took too long to respond. Data deletion cancelled.")
 
             if inner_pred.content.strip() == "CONFIRM":
+                # Clearing the ledger waits for a flush in progress, which
+                # could otherwise write the user's balances back.
+                await self.ledger.clear(ctx.author.id)
                 await self.config.user(ctx.author).clear()
+                self.remove_from_leaderboards(ctx.author.id)
+                if self.store is not None:
+                    await self.store.delete_user(ctx.author.id)
+                self.cooldowns.forget(ctx.author.id)
             else:
                 return await ctx.send("Cancelled data deletion.")
 
@@ -332,20 +341,31 @@ class MiscMixin(MixinMeta):
     @commands.command(name="getdata")
     @commands.cooldown(rate=1, per=21600, type=commands.BucketType.user)
     async def _get_data(self, ctx: Context):
-        """DM a `json` file with all your data.
+        """DM a `zip` archive with all your data.
 
         You can request data once every 6 hours.
         """
 
-        data = await self.config.user(ctx.author).all()
-
-        data_json = json.dumps(data)
+        data = await self.ledger.overlay(
+            ctx.author.id, await self.config.user(ctx.author).all()
+        )
 
-        file = text_to_file(data_json, filename=f"{ctx.author.name.lower()}_brawlcord_data.json")
+        # Serializing and compressing large data would block the bot.
+        parts = await self.bot.loop.run_in_executor(
+            None,
+            functools.partial(build_export, data, f"{ctx.author.name.lower()}_brawlcord_data")
+        )
 
         try:
-            await ctx.author.send(file=file)
+            for filename, content in parts:
+                await ctx.author.send(file=discord.File(io.BytesIO(content), filename=filename))
         except discord.Forbidden:
-            await ctx.send("Unable to DM you.")
+            return await ctx.send("Unable to DM you.")
 
-        await ctx.send("Sent you the file!")
+        if len(parts) == 1:
+            await ctx.send("Sent you the file!")
+        else:
+            await ctx.send(
+                f"Sent you the file in {len(parts)} parts!"
+                " Join them in order before extracting the archive."
+            )
@@ -1,13 +1,23 @@
+import functools
 import logging
+import time
+from datetime import datetime
 
 import discord
 from redbot.core import checks, commands
 from redbot.core.commands import Context
+from redbot.core.utils.chat_formatting import box, pagify
 
 from .abc import MixinMeta
+from .utils import simulator
+from .utils.club import Club
+from .utils.constants import BOXES
 
 log = logging.getLogger("red.brawlcord.owner")
 
+# Users saved to SQLite per transaction by `storage migrate`.
+STORAGE_BATCH_SIZE = 1000
+
 
 class OwnerMixin(MixinMeta):
     """Class for owner-only commands."""
@@ -27,34 +37,287 @@ class OwnerMixin(MixinMeta):
     async def clear_cooldown(self, ctx: Context, user: discord.User = None):
         if not user:
             user = ctx.author
-        async with self.config.user(user).cooldown() as cooldown:
-            cooldown.clear()
+        await self.cooldowns.clear(user.id)
 
     @commands.command()
     @checks.is_owner()
     async def add_mega(self, ctx: Context, quantity=1):
-        """Add a mega box to each user who has used the bot at least once."""
-
-        users_data = await self.config.all_users()
-        user_ids = users_data.keys()
-
-        for user_id in user_ids:
-            try:
-                user_group = self.config.user_from_id(user_id)
-            except Exception:
-                log.exception(f"Couldn't fetch user group of {user_id}.")
-                continue
-            try:
-                async with user_group.gifts() as gifts:
-                    gifts["megabox"] += quantity
-            except Exception:
-                log.exception(f"Couldn't fetch gifts for {user_id}.")
-                continue
+        """Add a mega box to each user who has finished the tutorial."""
+
+        # Users add the gift to their own the next time they use it.
+        self.gift_epochs.append({"megabox": quantity})
+        await self.config.gift_epochs.set(self.gift_epochs)
+
+        await ctx.send(
+            f"Added {quantity} mega boxes to all users."
+        )
+
+    @commands.command()
+    @checks.is_owner()
+    async def rebuildlb(self, ctx: Context):
+        """Rebuild the leaderboard indexes from stored user data."""
+
+        async with ctx.typing():
+            await self.build_leaderboards()
+
+        await ctx.send(
+            f"Rebuilt the leaderboards with {len(self.trophy_leaderboard)} users."
+        )
+
+    @commands.command()
+    @checks.is_owner()
+    async def lbinfo(self, ctx: Context):
+        """Show size and approximate memory use of the leaderboard indexes."""
+
+        leaderboards = {
+            "Trophies": self.trophy_leaderboard,
+            "Highest Trophies": self.pb_leaderboard,
+            **self.brawler_leaderboards
+        }
+
+        total = 0
+        lines = []
+        for name, leaderboard in leaderboards.items():
+            size = leaderboard.memory_usage()
+            total += size
+            lines.append(f"{name}: {len(leaderboard):,} users, {size / 1024:,.1f} KiB")
+
+        lines.append(f"\nTotal: {total / 1024:,.1f} KiB")
+
+        for page in pagify("\n".join(lines)):
+            await ctx.send(box(page))
+
+    @commands.command()
+    @checks.is_owner()
+    async def matchstats(self, ctx: Context):
+        """Show number of brawls in progress."""
+
+        await ctx.send(
+            box(
+                f"Active: {len(self.matches)}"
+                f"\nPeak: {self.matches.peak}"
+                f"\nStarted: {self.matches.started}"
+                f"\nStale (freed): {self.matches.reaped}"
+            )
+        )
+
+    @commands.command()
+    @checks.is_owner()
+    async def queuestats(self, ctx: Context):
+        """Show matchmaking queue depth and wait times."""
+
+        await ctx.send(box(self.queue.table()))
+
+    @commands.command(name="ledger")
+    @checks.is_owner()
+    async def _ledger(self, ctx: Context, user: discord.User = None, count: int = 20):
+        """Show balances and latest currency changes of a user."""
+
+        if not user:
+            user = ctx.author
+
+        balances = await self.ledger.balances(user.id)
+        entries = await self.ledger.history(user.id, count)
+
+        lines = [", ".join(f"{currency}: {balance:,}" for currency, balance in balances.items())]
+        lines.append("")
+        for timestamp, currency, delta, reason in reversed(entries):
+            lines.append(
+                f"{datetime.utcfromtimestamp(timestamp):%Y-%m-%d %H:%M:%S}"
+                f" {currency:<14}{delta:>+8,} {reason}"
+            )
+
+        for page in pagify("\n".join(lines)):
+            await ctx.send(box(page))
+
+    @commands.group()
+    @checks.is_owner()
+    async def storage(self, ctx: Context):
+        """Manage the SQLite copy of user data."""
+        pass
+
+    @storage.command(name="migrate")
+    async def storage_migrate(self, ctx: Context):
+        """Copy all user data from Config to SQLite and keep it in sync."""
+
+        start = time.perf_counter()
+
+        async with ctx.typing():
+            store = await self.open_store()
+            all_users = await self.config.all_users()
+            users = [
+                (user_id, await self.ledger.overlay(user_id, data))
+                for user_id, data in all_users.items()
+            ]
+            for idx in range(0, len(users), STORAGE_BATCH_SIZE):
+                await store.save_users(users[idx:idx + STORAGE_BATCH_SIZE])
+
+        await self.config.sqlite_storage.set(True)
+
+        await ctx.send(
+            f"Migrated {len(users):,} users to SQLite"
+            f" in {time.perf_counter() - start:,.1f} seconds."
+        )
+
+    @storage.command(name="disable")
+    async def storage_disable(self, ctx: Context):
+        """Stop keeping user data in SQLite.
+
+        The database is kept. Run `storage migrate` to enable it again.
+        """
+
+        await self.config.sqlite_storage.set(False)
+        if self.store is not None:
+            store = self.store
+            self.store = None
+            await store.close()
+
+        await ctx.send("Stopped keeping user data in SQLite.")
+
+    @storage.command(name="info")
+    async def storage_info(self, ctx: Context):
+        """Show size of the SQLite database."""
+
+        if self.store is None:
+            return await ctx.send("User data is not kept in SQLite. Use `storage migrate`.")
+
+        users, size = await self.store.info()
+
+        await ctx.send(box(f"Users: {users:,}\nSize: {size / 1024 / 1024:,.1f} MiB"))
+
+    @commands.command()
+    @checks.is_owner()
+    async def perfstats(self, ctx: Context):
+        """Show latencies and Config calls of commands, then reset them."""
+
+        metrics = self.metrics
+        minutes = (time.time() - metrics.since) / 60
+        table = metrics.table()
+        metrics.reset()
+
+        await ctx.send(f"Stats of the last {minutes:,.1f} minutes:")
+        for page in pagify(table):
+            await ctx.send(box(page))
+
+    @commands.command()
+    @checks.is_owner()
+    async def clubcheck(self, ctx: Context, fix: bool = False):
+        """Recompute club stats and report drift from the stored stats.
+
+        Stored stats are replaced with the recomputed ones if `fix` is true.
+        """
+
+        lines = []
+
+        async with ctx.typing():
+            clubs = await self.config.clubs()
+            for club in clubs:
+                member_ids = (
+                    [club["president_id"]]
+                    + club["vice_president_ids"]
+                    + club["senior_ids"]
+                    + club["member_ids"]
+                )
+                computed = await Club.compute_stats(member_ids, self.config)
+                stored = await Club.get_stats(club["id"], self.config)
+
+                if stored is None:
+                    lines.append(f"{club['id']}: no stored stats")
+                else:
+                    stored_members = dict(stored["members"])
+                    computed_members = dict(computed["members"])
+                    if (
+                        stored["total_trophies"] == computed["total_trophies"]
+                        and stored_members == computed_members
+                    ):
+                        continue
+                    drifted = [
+                        user_id for user_id in set(stored_members) | set(computed_members)
+                        if stored_members.get(user_id) != computed_members.get(user_id)
+                    ]
+                    lines.append(
+                        f"{club['id']}: total {stored['total_trophies']:,}"
+                        f" -> {computed['total_trophies']:,},"
+                        f" {len(drifted)} member(s) drifted"
+                    )
+
+                if fix:
+                    await self.config.set_raw("club_stats", club["id"], value=computed)
+
+        if not lines:
+            return await ctx.send(f"Stats of all {len(clubs)} clubs are consistent.")
+
+        lines.append(
+            f"\n{len(lines)} of {len(clubs)} clubs drifted."
+            + (" Fixed." if fix else " Run with `fix` set to true to fix them.")
+        )
+
+        for page in pagify("\n".join(lines)):
+            await ctx.send(box(page))
+
+    @commands.command()
+    @checks.is_owner()
+    async def battlelogsize(self, ctx: Context, size: int = None):
+        """Show or set the number of battle log entries kept per user.
+
+        Existing battle logs are trimmed when the size is set.
+        """
+
+        if size is None:
+            size = await self.config.battle_log_size()
+            return await ctx.send(f"Battle logs keep the last {size} entries.")
+
+        if size < 1:
+            return await ctx.send("Size should be at least 1.")
+
+        await self.config.battle_log_size.set(size)
+
+        async with ctx.typing():
+            users, before, after = await self.compact_battle_logs()
 
         await ctx.send(
-            f"Added {quantity} mega boxes to all users (bar errors)."
+            f"Battle logs now keep the last {size} entries. Trimmed logs of"
+            f" {users} users ({before / 1024:,.1f} KiB -> {after / 1024:,.1f} KiB)."
         )
 
+    @commands.command()
+    @checks.is_owner()
+    async def simboxes(
+        self,
+        ctx: Context,
+        box_type: str = "brawlbox",
+        count: int = 1_000_000,
+        user: discord.User = None
+    ):
+        """Simulate box openings for a user's Brawlers.
+
+        `box_type` can be brawlbox, bigbox or megabox.
+        """
+
+        if simulator.np is None:
+            return await ctx.send("NumPy is required to run the box simulator.")
+
+        if box_type not in BOXES:
+            return await ctx.send(
+                f"Box type should be one of {', '.join(BOXES)}."
+            )
+
+        if count < 1:
+            return await ctx.send("Number of boxes should be positive.")
+
+        if not user:
+            user = ctx.author
+
+        brawler_data = await self.get_player_stat(user, "brawlers", is_iter=True)
+        profile = simulator.BoxProfile(self.BRAWLERS, brawler_data)
+
+        async with ctx.typing():
+            results = await self.bot.loop.run_in_executor(
+                None, functools.partial(simulator.simulate, box_type, profile, count)
+            )
+
+        await ctx.send(box(simulator.format_results(box_type, results)))
+
     @commands.command(aliases=["maintenance"])
     @checks.is_owner()
     async def maint(
@@ -65,9 +328,10 @@ class OwnerMixin(MixinMeta):
         if duration:
             setting = True
 
-        async with self.config.maintenance() as maint:
-            maint["setting"] = setting
-            maint["duration"] = duration if duration else 0
+        maint = {"setting": setting, "duration": duration if duration else 0}
+        if maint != self.maintenance:
+            await self.config.maintenance.set(maint)
+            self.maintenance = maint
 
         if setting:
             await ctx.send(
@@ -82,9 +346,8 @@ class OwnerMixin(MixinMeta):
     async def minfo(self, ctx: Context):
         """Display maintenance info."""
 
-        async with self.config.maintenance() as maint:
-            setting = maint["setting"]
-            duration = maint["duration"]
+        setting = self.maintenance["setting"]
+        duration = self.maintenance["duration"]
 
         await ctx.send(f"**Setting:** {setting}\n**Duration:** {duration}")
 
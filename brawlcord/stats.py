@@ -1,3 +1,4 @@
+
 import discord
 from redbot.core import commands
 from redbot.core.commands import Context
@@ -5,6 +6,7 @@ from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
 from redbot.core.utils.chat_formatting import pagify
 
 from .abc import MixinMeta
+from .utils import simulator
 from .utils.box import Box
 from .utils.brawlers import brawler_thumb
 from .utils.constants import EMBED_COLOR
@@ -13,6 +15,7 @@ from .utils.emojis import (
     brawler_emojis, emojis, gamemode_emotes, level_emotes, rank_emojis, sp_icons
 )
 from .utils.gamemodes import gamemodes_map
+from .utils.session import PlayerSession
 
 
 class StatisticsMixin(MixinMeta):
@@ -37,7 +40,11 @@ class StatisticsMixin(MixinMeta):
         embed.add_field(name="Highest Trophies",
                         value=f"{emojis['pb']} {pb:,}")
 
-        user_data = await self.config.user(user).all()
+        session = await PlayerSession.load(self.config, user)
+        self.refresh_token_bank(session)
+        await session.commit()
+
+        user_data = await self.ledger.overlay(user.id, dict(session.data))
 
         xp = user_data['xp']
         lvl = user_data['lvl']
@@ -95,7 +102,7 @@ class StatisticsMixin(MixinMeta):
                          icon_url=user.avatar_url)
 
         trophies = await self.get_trophies(user)
-        league_number, league_emoji = await self.get_league_data(trophies)
+        league_number, league_emoji = self.get_league_data(trophies)
         if league_number:
             extra = f"`{league_number}`"
         else:
@@ -283,7 +290,7 @@ class StatisticsMixin(MixinMeta):
 
         embeds = []
         if embed_str:
-            gold = await self.get_player_stat(user, 'gold')
+            gold = await self.ledger.balance(user.id, "gold")
             desc = (
                 "The following Brawlers can be upgraded by using the"
                 " `-upgrade <brawler_name>` command."
@@ -435,6 +442,11 @@ class StatisticsMixin(MixinMeta):
 
         todays_st = await self.config.user(ctx.author).todays_st()
 
+        # Star tokens are reset on the first brawl after the daily reset.
+        st_reset_ts = await self.config.st_reset_ts()
+        if await self.config.user(ctx.author).st_reset_ts() != st_reset_ts:
+            todays_st = []
+
         user_gamemodes = await self.config.user(ctx.author).gamemodes()
 
         collected = ""
@@ -527,7 +539,7 @@ class StatisticsMixin(MixinMeta):
             ctx.author, "brawlers", is_iter=True
         )
 
-        box = Box(self.BRAWLERS, brawler_data)
+        box = Box(self.registry, brawler_data)
 
         embed = discord.Embed(color=EMBED_COLOR)
         embed.set_author(name="Drop Rates", icon_url=ctx.author.avatar_url)
@@ -546,4 +558,20 @@ class StatisticsMixin(MixinMeta):
         embed.add_field(name="Tickets", value=get_value_str(box.tickets))
         embed.add_field(name="Token Doubler", value=get_value_str(box.td))
 
+        profile = simulator.BoxProfile(self.BRAWLERS, brawler_data)
+        results = simulator.expected("brawlbox", profile)
+        unlocks = sum(
+            results[f"unlocks_{rarity}"] for rarity in simulator.RARITIES
+        )
+        embed.add_field(
+            name="Expected per Brawl Box",
+            value=(
+                f"Gold: {results['gold']:.1f}"
+                f"\nPower Points: {results['powerpoints']:.1f}"
+                f"\nBrawlers: {unlocks * 100:.2f}%"
+                f"\nStar Powers: {results['starpowers'] * 100:.2f}%"
+            ),
+            inline=False
+        )
+
         await ctx.send(embed=embed)
@@ -1,11 +1,12 @@
 import asyncio
 import logging
+import time
 from datetime import datetime
-from math import ceil
 
 import discord
 
 from .abc import MixinMeta
+from .utils.core import utc_timestamp
 
 log = logging.getLogger("red.brawlcord.tasks")
 
@@ -13,44 +14,6 @@ log = logging.getLogger("red.brawlcord.tasks")
 class TasksMixin(MixinMeta):
     """Class for tasks."""
 
-    async def update_token_bank(self):
-        """Task to update token banks."""
-
-        while True:
-            for user in await self.config.all_users():
-                user = self.bot.get_user(user)
-                if not user:
-                    continue
-                tokens_in_bank = await self.get_player_stat(
-                    user, 'tokens_in_bank')
-                if tokens_in_bank == 200:
-                    continue
-                tokens_in_bank += 20
-                if tokens_in_bank > 200:
-                    tokens_in_bank = 200
-
-                bank_update_timestamp = await self.get_player_stat(user, 'bank_update_ts')
-
-                if not bank_update_timestamp:
-                    continue
-
-                bank_update_ts = datetime.utcfromtimestamp(ceil(bank_update_timestamp))
-                time_now = datetime.utcnow()
-                delta = time_now - bank_update_ts
-                delta_min = delta.total_seconds() / 60
-
-                if delta_min >= 80:
-                    await self.update_player_stat(
-                        user, 'tokens_in_bank', tokens_in_bank)
-                    epoch = datetime(1970, 1, 1)
-
-                    # get timestamp in UTC
-                    timestamp = (time_now - epoch).total_seconds()
-                    await self.update_player_stat(
-                        user, 'bank_update_ts', timestamp)
-
-            await asyncio.sleep(60)
-
     async def update_status(self):
         """Task to update bot's status with total guilds.
 
@@ -70,39 +33,74 @@ class TasksMixin(MixinMeta):
             await asyncio.sleep(120)
 
     async def update_shop_and_st(self):
-        """Task to update daily shop and star tokens."""
+        """Task to update daily shop and star tokens reset timestamps.
+
+        Shops and star tokens of users are reset when they are next used.
+        """
 
         while True:
-            s_reset = await self.config.shop_reset_ts()
-            create_shop = False
-            if not s_reset:
-                # first reset
-                create_shop = True
-            shop_diff = datetime.utcnow() - datetime.utcfromtimestamp(s_reset)
-
-            st_reset = await self.config.st_reset_ts()
-            reset = False
-            if not st_reset:
-                # first reset
-                reset = True
-                continue
-            st_diff = datetime.utcnow() - datetime.utcfromtimestamp(st_reset)
-
-            for user in await self.config.all_users():
-                user = self.bot.get_user(user)
-                if not user:
-                    continue
-                if create_shop:
-                    await self.create_shop(user)
-                    continue
-                if shop_diff.days > 0:
-                    await self.create_shop(user)
-
-                st_reset = await self.config.st_reset_ts()
-                if reset:
-                    await self.reset_st(user)
-                    continue
-                if st_diff.days > 0:
-                    await self.reset_st(user)
+            time_now = datetime.utcnow()
+
+            for reset_ts in [self.config.shop_reset_ts, self.config.st_reset_ts]:
+                last_reset = await reset_ts()
+                if last_reset:
+                    diff = time_now - datetime.utcfromtimestamp(last_reset)
+                    if diff.days < 1:
+                        continue
+                await reset_ts.set(utc_timestamp(time_now))
 
             await asyncio.sleep(300)
+
+    async def flush_cooldowns(self):
+        """Task to remove expired cooldowns and save changed ones.
+
+        Runs every minute.
+        """
+
+        while True:
+            await asyncio.sleep(60)
+
+            self.cooldowns.expire()
+            saved = await self.cooldowns.flush()
+            if saved:
+                log.debug(f"Saved cooldowns of {saved} users.")
+
+    async def flush_ledger(self):
+        """Task to save ledger entries appended since the last flush.
+
+        Runs every 10 seconds.
+        """
+
+        while True:
+            await asyncio.sleep(10)
+
+            saved = await self.ledger.flush(self.store)
+            if saved:
+                log.debug(f"Saved ledgers of {saved} users.")
+
+    async def reap_matches(self):
+        """Task to free users of brawls which have stopped responding.
+
+        Runs every minute.
+        """
+
+        while True:
+            await asyncio.sleep(60)
+
+            for match in self.matches.reap():
+                log.warning(
+                    f"Freed users {match.user_ids} of a stale brawl"
+                    f" started {time.monotonic() - match.started:.0f} seconds ago."
+                )
+
+    async def sweep_matchmaking(self):
+        """Task to pair queued players whose rating windows have widened.
+
+        Players waiting past the deadline are sent to brawl a bot.
+        Runs every second.
+        """
+
+        while True:
+            await asyncio.sleep(1)
+
+            self.queue.sweep()
@@ -1,9 +1,33 @@
 from datetime import datetime
 
-import discord
 from redbot.core.bot import Red
 
 from .core import utc_timestamp
+from .users import user_cache
+
+
+def trim_log(battle_log: list, size: int) -> int:
+    """Remove oldest entries of the log so that at most `size` are kept.
+
+    Returns the number of entries removed.
+    """
+
+    extra = len(battle_log) - size
+    if extra <= 0:
+        return 0
+
+    del battle_log[:extra]
+    return extra
+
+
+def get_name(user_id: int, bot: Red) -> str:
+    """Return name of the user from cache, for entries saved without names."""
+
+    user = user_cache.get(bot, user_id)
+    if user is None:
+        return "Unknown User"
+
+    return str(user)
 
 
 class PartialBattleLogEntry:
@@ -25,14 +49,18 @@ class PartialBattleLogEntry:
 
     Attributes
     -------------
-    player: `discord.User`
-        The player the log is saved for.
+    player_id: `int`
+        ID of the player the log is saved for.
+    player_name: `str`
+        Name and discriminator of the player when the log was saved.
     player_brawler_name: `str`
         Name of player's brawler.
     player_brawler_level: `int`
         Level of player's brawler.
-    opponent: `discord.User`
-        The opponent in the brawl.
+    opponent_id: `int`
+        ID of the opponent in the brawl.
+    opponent_name: `str`
+        Name and discriminator of the opponent when the log was saved.
     opponent_brawler_name: `str`
         Name of opponent's brawler.
     opponent_brawler_level: `int`
@@ -45,11 +73,13 @@ class PartialBattleLogEntry:
 
     def __init__(self, player=None, opponent=None, game_mode: str = None, result: bool = None):
         if player and opponent and game_mode:
-            self.player: discord.User = player.player
+            self.player_id: int = player.player.id
+            self.player_name: str = str(player.player)
             self.player_brawler_name: str = player.brawler_name
             self.player_brawler_level: int = player.brawler_level
 
-            self.opponent: discord.User = opponent.player
+            self.opponent_id: int = opponent.player.id
+            self.opponent_name: str = str(opponent.player)
             self.opponent_brawler_name: str = opponent.brawler_name
             self.opponent_brawler_level: int = opponent.brawler_level
 
@@ -66,10 +96,12 @@ class PartialBattleLogEntry:
         """Return a dictionary representing the `PartialBattleLogEntry` object."""
 
         return {
-            "player_id": self.player.id,
+            "player_id": self.player_id,
+            "player_name": self.player_name,
             "player_brawler_name": self.player_brawler_name,
             "player_brawler_level": self.player_brawler_level,
-            "opponent_id": self.opponent.id,
+            "opponent_id": self.opponent_id,
+            "opponent_name": self.opponent_name,
             "opponent_brawler_name": self.opponent_brawler_name,
             "opponent_brawler_level": self.opponent_brawler_level,
             "game_mode": self.game_mode,
@@ -77,23 +109,22 @@ class PartialBattleLogEntry:
         }
 
     @classmethod
-    async def from_json(cls, data: dict, bot: Red):
-        """Return a `BattleLog` object from dictionary representation of the log."""
+    def from_json(cls, data: dict, bot: Red):
+        """Return a `BattleLog` object from dictionary representation of the log.
+
+        `bot` is only used to get names of users of entries saved without them.
+        """
 
         self = cls()
 
-        # Get player's `User` instance.
-        self.player = bot.get_user(data["player_id"])
-        if self.player is None:
-            self.player = await bot.fetch_user(data["player_id"])
+        self.player_id = data["player_id"]
+        self.player_name = data.get("player_name") or get_name(self.player_id, bot)
 
         self.player_brawler_name = data["player_brawler_name"]
         self.player_brawler_level = data["player_brawler_level"]
 
-        # Get opponent's `User` instance.
-        self.opponent = bot.get_user(data["opponent_id"])
-        if self.opponent is None:
-            self.opponent = await bot.fetch_user(data["opponent_id"])
+        self.opponent_id = data["opponent_id"]
+        self.opponent_name = data.get("opponent_name") or get_name(self.opponent_id, bot)
 
         self.opponent_brawler_name = data["opponent_brawler_name"]
         self.opponent_brawler_level = data["opponent_brawler_level"]
@@ -122,8 +153,10 @@ class BattleLogEntry:
 
     Attributes
     -------------
-    player: `discord.User`
-        The player the log is saved for.
+    player_id: `int`
+        ID of the player the log is saved for.
+    player_name: `str`
+        Name and discriminator of the player when the log was saved.
     player_brawler_name: `str`
         Name of player's brawler.
     player_brawler_level: `int`
@@ -132,8 +165,10 @@ class BattleLogEntry:
         Trophies of player's brawler.
     player_reward_trophies: `int`
         Reward trophies of the player.
-    opponent: `discord.User`
-        The opponent in the brawl.
+    opponent_id: `int`
+        ID of the opponent in the brawl.
+    opponent_name: `str`
+        Name and discriminator of the opponent when the log was saved.
     opponent_brawler_name: `str`
         Name of opponent's brawler.
     opponent_brawler_level: `int`
@@ -158,11 +193,13 @@ class BattleLogEntry:
     ):
         if partial_log and player_extras and opponent_extras:
             # Get data from `partial_log`.
-            self.player = partial_log.player
+            self.player_id = partial_log.player_id
+            self.player_name = partial_log.player_name
             self.player_brawler_name = partial_log.player_brawler_name
             self.player_brawler_level = partial_log.player_brawler_level
 
-            self.opponent = partial_log.opponent
+            self.opponent_id = partial_log.opponent_id
+            self.opponent_name = partial_log.opponent_name
             self.opponent_brawler_name = partial_log.opponent_brawler_name
             self.opponent_brawler_level = partial_log.opponent_brawler_level
 
@@ -182,10 +219,12 @@ class BattleLogEntry:
         """Return a dictionary representing the `BattleLogEntry` object."""
 
         return {
-            "player_id": self.player.id,
+            "player_id": self.player_id,
+            "player_name": self.player_name,
             "player_brawler_name": self.player_brawler_name,
             "player_brawler_level": self.player_brawler_level,
-            "opponent_id": self.opponent.id,
+            "opponent_id": self.opponent_id,
+            "opponent_name": self.opponent_name,
             "opponent_brawler_name": self.opponent_brawler_name,
             "opponent_brawler_level": self.opponent_brawler_level,
             "game_mode": self.game_mode,
@@ -198,23 +237,22 @@ class BattleLogEntry:
         }
 
     @classmethod
-    async def from_json(cls, data: dict, bot: Red):
-        """Return a `BattleLogEntry` object from dictionary representation of the log entry."""
+    def from_json(cls, data: dict, bot: Red):
+        """Return a `BattleLogEntry` object from dictionary representation of the log entry.
+
+        `bot` is only used to get names of users of entries saved without them.
+        """
 
         self = cls()
 
-        # Get player's `User` instance.
-        self.player = bot.get_user(data["player_id"])
-        if self.player is None:
-            self.player = await bot.fetch_user(data["player_id"])
+        self.player_id = data["player_id"]
+        self.player_name = data.get("player_name") or get_name(self.player_id, bot)
 
         self.player_brawler_name = data["player_brawler_name"]
         self.player_brawler_level = data["player_brawler_level"]
 
-        # Get opponent's `User` instance.
-        self.opponent = bot.get_user(data["opponent_id"])
-        if self.opponent is None:
-            self.opponent = await bot.fetch_user(data["opponent_id"])
+        self.opponent_id = data["opponent_id"]
+        self.opponent_name = data.get("opponent_name") or get_name(self.opponent_id, bot)
 
         self.opponent_brawler_name = data["opponent_brawler_name"]
         self.opponent_brawler_level = data["opponent_brawler_level"]
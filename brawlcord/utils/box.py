@@ -2,8 +2,17 @@ import random
 
 import discord
 
-from .constants import default_stats
-from .emojis import brawler_emojis, emojis, sp_icons
+from .brawlers import BrawlerRegistry
+from .constants import (
+    BOX_GEMS_ODDS,
+    BOX_ODDS,
+    BOX_TD_ODDS,
+    BOX_TICKETS_ODDS,
+    BOXES,
+    default_stats
+)
+from .emojis import brawler_emojis, emojis
+from .ledger import Ledger
 
 EMBED_COLOR = 0xD574FF
 
@@ -11,7 +20,7 @@ EMBED_COLOR = 0xD574FF
 class Box:
     """A class to represent Boxes."""
 
-    def __init__(self, all_brawlers, brawler_data):
+    def __init__(self, registry: BrawlerRegistry, brawler_data: dict):
         # variables to store possibilities data
         self.can_unlock = {
             "Rare": [],
@@ -24,17 +33,17 @@ class Box:
         self.can_get_sp = {}
 
         # odds
-        self.powerpoint = 94.6516
-        self.rare = 2.2103
-        self.superrare = 1.2218
-        self.epic = 0.5527
-        self.mythic = 0.2521
-        self.legendary = 0.1115
-        self.starpower = 1
-
-        self.tickets = 25
-        self.gems = 9
-        self.td = 3  # token doubler
+        self.powerpoint = BOX_ODDS["Power Points"]
+        self.rare = BOX_ODDS["Rare"]
+        self.superrare = BOX_ODDS["Super Rare"]
+        self.epic = BOX_ODDS["Epic"]
+        self.mythic = BOX_ODDS["Mythic"]
+        self.legendary = BOX_ODDS["Legendary"]
+        self.starpower = BOX_ODDS["Star Power"]
+
+        self.tickets = BOX_TICKETS_ODDS
+        self.gems = BOX_GEMS_ODDS
+        self.td = BOX_TD_ODDS  # token doubler
 
         # number of powerpoints required to max
         self.max_pp = 1410
@@ -53,16 +62,18 @@ class Box:
             self.starpower
         ]
 
-        self.BRAWLERS = all_brawlers
+        self.registry = registry
 
-        for brawler in all_brawlers:
-            rarity = all_brawlers[brawler]["rarity"]
-            if rarity != "Trophy Road":
-                if brawler not in brawler_data:
-                    self.can_unlock[rarity].append(brawler)
+        for brawler in registry.prototypes:
+            if brawler.rarity != "Trophy Road":
+                if brawler.name not in brawler_data:
+                    self.can_unlock[brawler.rarity].append(brawler.name)
 
         for brawler in brawler_data:
-            # self.owned.append(brawler)
+            # Brawlers removed from `brawlers.json` can't be rewarded.
+            if brawler not in registry:
+                continue
+
             total_powerpoints = brawler_data[brawler]['total_powerpoints']
             if total_powerpoints < self.max_pp:
                 self.can_get_pp[brawler] = self.max_pp - total_powerpoints
@@ -109,17 +120,19 @@ class Box:
             buckets[idx] += (breaks[idx + 1] - breaks[idx] - 1)
         return buckets
 
-    async def brawlbox(self, conf, user):
+    async def brawlbox(self, conf, user, ledger: Ledger):
         """Function to handle brawl box openings."""
 
-        gold = self.weighted_random(12, 70, 19)
+        data = BOXES["brawlbox"]
+
+        gold = self.weighted_random(*data["gold"])
 
         rarities = []
         starpowers = 0
         stacks = 0
 
         selected = random.choices(
-            population=self.pop, weights=self.weights, k=2
+            population=self.pop, weights=self.weights, k=data["draws"]
         )
 
         for i in selected:
@@ -139,7 +152,7 @@ class Box:
             stacks = 1
 
         if stacks > 0:
-            powerpoints = int(self.weighted_random(7, 25, 14))
+            powerpoints = int(self.weighted_random(*data["powerpoints"]))
 
             pieces = self.split_in_integers(powerpoints, stacks)
 
@@ -162,8 +175,7 @@ class Box:
                             continue
                         break
 
-        old_gold = await conf.gold()
-        await conf.gold.set(old_gold + gold)
+        await ledger.add(user.id, "gold", gold, "brawl box")
 
         embed = discord.Embed(
             color=EMBED_COLOR,
@@ -199,37 +211,33 @@ class Box:
         chance = random.randint(1, 100)
 
         if chance <= self.td:
-            old_td = await conf.token_doubler()
-            await conf.token_doubler.set(200 + old_td)
+            await ledger.add(user.id, "token_doubler", 200, "brawl box")
             embed.add_field(
                 name="Token Doubler", value=f"{emojis['tokendoubler']} 200"
             )
         elif chance <= self.gems:
-            try:
-                old_gems = await conf.gems()
-            except Exception:
-                old_gems = 0
-            gems = random.randint(2, 5)
-            await conf.gems.set(gems + old_gems)
+            gems = random.randint(*data["gems"])
+            await ledger.add(user.id, "gems", gems, "brawl box")
             embed.add_field(name="Gems", value=f"{emojis['gem']} {gems}")
         elif chance <= self.tickets:
-            old_tickets = await conf.tickets()
-            await conf.tickets.set(1 + old_tickets)
-            embed.add_field(name="Tickets", value=f"{emojis['ticket']} 1")
+            await ledger.add(user.id, "tickets", data["tickets"], "brawl box")
+            embed.add_field(name="Tickets", value=f"{emojis['ticket']} {data['tickets']}")
 
         return embed
 
-    async def bigbox(self, conf, user):
+    async def bigbox(self, conf, user, ledger: Ledger):
         """Function to handle brawl box openings."""
 
-        gold = self.weighted_random(36, 210, 63)
+        data = BOXES["bigbox"]
+
+        gold = self.weighted_random(*data["gold"])
 
         rarities = []
         starpowers = 0
         stacks = 0
 
         selected = random.choices(
-            population=self.pop, weights=self.weights, k=5
+            population=self.pop, weights=self.weights, k=data["draws"]
         )
 
         for i in selected:
@@ -248,12 +256,12 @@ class Box:
             stacks = 1
         elif len(self.can_get_pp) < stacks:
             stacks = len(self.can_get_pp)
-            self.tickets *= 1.5
-            self.gems *= 1.5
-            self.td *= 1.5
+            self.tickets *= data["stack_limit_multiplier"]
+            self.gems *= data["stack_limit_multiplier"]
+            self.td *= data["stack_limit_multiplier"]
 
         if stacks > 0:
-            powerpoints = int(self.weighted_random(27, 75, 46))
+            powerpoints = int(self.weighted_random(*data["powerpoints"]))
 
             pieces = self.split_in_integers(powerpoints, stacks)
 
@@ -276,8 +284,7 @@ class Box:
                             continue
                         break
 
-        old_gold = await conf.gold()
-        await conf.gold.set(old_gold + gold)
+        await ledger.add(user.id, "gold", gold, "big box")
 
         embed = discord.Embed(
             color=EMBED_COLOR,
@@ -315,37 +322,33 @@ class Box:
         chance = random.randint(1, 100)
 
         if chance <= self.td:
-            old_td = await conf.token_doubler()
-            await conf.token_doubler.set(200 + old_td)
+            await ledger.add(user.id, "token_doubler", 200, "big box")
             embed.add_field(
                 name="Token Doubler", value=f"{emojis['tokendoubler']} 200"
             )
         elif chance <= self.gems:
-            try:
-                old_gems = await conf.gems()
-            except Exception:
-                old_gems = 0
-            gems = random.randint(6, 15)
-            await conf.gems.set(gems + old_gems)
+            gems = random.randint(*data["gems"])
+            await ledger.add(user.id, "gems", gems, "big box")
             embed.add_field(name="Gems", value=f"{emojis['gem']} {gems}")
         elif chance <= self.tickets:
-            old_tickets = await conf.tickets()
-            await conf.tickets.set(4 + old_tickets)
-            embed.add_field(name="Tickets", value=f"{emojis['ticket']} 4")
+            await ledger.add(user.id, "tickets", data["tickets"], "big box")
+            embed.add_field(name="Tickets", value=f"{emojis['ticket']} {data['tickets']}")
 
         return embed
 
-    async def megabox(self, conf, user):
+    async def megabox(self, conf, user, ledger: Ledger):
         """Function to handle mega box openings."""
 
-        gold = self.weighted_random(36, 210, 63)
+        data = BOXES["megabox"]
+
+        gold = self.weighted_random(*data["gold"])
 
         rarities = []
         starpowers = 0
         stacks = 0
 
         selected = random.choices(
-            population=self.pop, weights=self.weights, k=9
+            population=self.pop, weights=self.weights, k=data["draws"]
         )
 
         for i in selected:
@@ -364,12 +367,12 @@ class Box:
             stacks = 1
         elif len(self.can_get_pp) < stacks:
             stacks = len(self.can_get_pp)
-            self.tickets *= 2
-            self.gems *= 2
-            self.td *= 2
+            self.tickets *= data["stack_limit_multiplier"]
+            self.gems *= data["stack_limit_multiplier"]
+            self.td *= data["stack_limit_multiplier"]
 
         if stacks > 0:
-            powerpoints = int(self.weighted_random(81, 225, 132))
+            powerpoints = int(self.weighted_random(*data["powerpoints"]))
 
             pieces = self.split_in_integers(powerpoints, stacks)
             pp_str = ""
@@ -391,8 +394,7 @@ class Box:
                             continue
                         break
 
-        old_gold = await conf.gold()
-        await conf.gold.set(old_gold + gold)
+        await ledger.add(user.id, "gold", gold, "mega box")
 
         embed = discord.Embed(
             color=EMBED_COLOR, title=f" {emojis['megabox']} Mega Box"
@@ -427,30 +429,24 @@ class Box:
         chance = random.randint(1, 100)
 
         if chance <= self.td:
-            old_td = await conf.token_doubler()
-            await conf.token_doubler.set(200 + old_td)
+            await ledger.add(user.id, "token_doubler", 200, "mega box")
             embed.add_field(
                 name="Token Doubler", value=f"{emojis['tokendoubler']} 200"
             )
         elif chance <= self.gems:
-            try:
-                old_gems = await conf.gems()
-            except Exception:
-                old_gems = 0
-            gems = random.randint(18, 45)
-            await conf.gems.set(gems + old_gems)
+            gems = random.randint(*data["gems"])
+            await ledger.add(user.id, "gems", gems, "mega box")
             embed.add_field(name="Gems", value=f"{emojis['gem']} {gems}")
         elif chance <= self.tickets:
-            old_tickets = await conf.tickets()
-            await conf.tickets.set(12 + old_tickets)
-            embed.add_field(name="Tickets", value=f"{emojis['ticket']} 12")
+            await ledger.add(user.id, "tickets", data["tickets"], "mega box")
+            embed.add_field(name="Tickets", value=f"{emojis['ticket']} {data['tickets']}")
 
         return embed
 
     async def unlock_brawler(self, rarity, conf, embed):
         brawler = random.choice(self.can_unlock[rarity])
         free_skins = [
-            skin for skin in self.BRAWLERS[brawler]["skins"] if skin[0] == 0
+            skin for skin in self.registry[brawler].skins if skin[0] == 0
         ]
 
         async with conf.brawlers() as brawlers:
@@ -499,14 +495,12 @@ class Box:
 
         self.can_get_sp[sp_brawler].remove(sp)
 
-        sp_name = self.BRAWLERS[sp_brawler][sp]["name"]
-        sp_desc = self.BRAWLERS[sp_brawler][sp]["desc"]
-        sp_index = int(sp[2]) - 1
+        star_power = self.registry.star_power(sp_brawler, sp)
 
         sp_str = (
-            f"{sp_icons[sp_brawler][sp_index]} {sp_name}"
+            f"{star_power.icon} {star_power.name}"
             f" - {brawler_emojis[sp_brawler]}"
-            f" {sp_brawler}\n> {sp_desc}"
+            f" {sp_brawler}\n> {star_power.desc}"
         )
 
         async with conf.brawlers() as brawlers:
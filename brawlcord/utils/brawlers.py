@@ -1,8 +1,11 @@
 import random
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import discord
 
 from .emojis import brawler_emojis, emojis, rank_emojis, sp_icons
+from .records import BrawlerCatalog
 
 
 # Credits to Star List, developed by Henry.
@@ -20,8 +23,43 @@ rarity_colors = {
 }
 
 
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of JSON data, with dicts as mapping proxies and lists as tuples."""
+
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 class Brawler:
-    """Base class to represent a Brawler."""
+    """Base class to represent a Brawler.
+
+    Brawlers are immutable prototypes, created once by `BrawlerRegistry`
+    and shared by all commands and brawls. Their data is frozen, nested
+    dicts and lists included. Buffed stats and info embed fields of each
+    level are computed when the Brawler is created, so they are rebuilt
+    with the registry.
+    """
+
+    __slots__ = (
+        "name",
+        "desc",
+        "health",
+        "attack",
+        "speed",
+        "rarity",
+        "unlockTrp",
+        "ult",
+        "sp1",
+        "sp2",
+        "skins",
+        "stats",
+        "stat_table",
+        "info_table",
+        "_frozen",
+    )
 
     def __init__(self, raw_data: dict, brawler: str):
 
@@ -30,15 +68,33 @@ class Brawler:
         self.name = brawler
         self.desc = data["desc"]
         self.health = data["health"]
-        self.attack = data["attack"]
+        self.attack = _freeze(data["attack"])
         self.speed = data["speed"]
         self.rarity = data["rarity"]
         self.unlockTrp = data["unlockTrp"]
-        self.ult = data["ult"]
-        self.sp1 = data["sp1"]
-        self.sp2 = data["sp2"]
+        self.ult = _freeze(data["ult"])
+        self.sp1 = _freeze(data["sp1"])
+        self.sp2 = _freeze(data["sp2"])
+        self.skins = _freeze(data["skins"])
 
         self.init()
+        self.stats = _freeze(self.stats)
+
+        # Buffed stats of each level, indexed by level.
+        self.stat_table: Tuple[Optional[MappingProxyType], ...] = (None,) + tuple(
+            MappingProxyType(self.compute_stats(level)) for level in range(1, 11)
+        )
+        # Health, attack and super field values of the info embed, indexed by level.
+        self.info_table: Tuple[Optional[Tuple[str, str, str]], ...] = (None,) + tuple(
+            self.compute_info_fields(level) for level in range(1, 11)
+        )
+
+        self._frozen = True
+
+    def __setattr__(self, name: str, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{self.name} is immutable")
+        object.__setattr__(self, name, value)
 
     def init(self):
         # These are the stats that are "buffed", unless overridden in specific classes.
@@ -75,9 +131,9 @@ class Brawler:
     def _health(self, level) -> int:
         """Get the health of the Brawler at specified power level."""
 
-        return self.buff_stat(self.health, level)
+        return self.buff_stats(level)["health"]
 
-    def _attack(self, level):
+    def _attack(self, level, rng=random):
         """Represents the attack ability of the Brawler."""
 
         # getting all values
@@ -91,9 +147,9 @@ class Brawler:
 
         raw = damage * projectiles * 0.8
 
-        return self.chance_calculation(raw)
+        return self.chance_calculation(raw, rng)
 
-    def _ult(self, level):
+    def _ult(self, level, rng=random):
         """Represents the Super ability of the Brawler."""
 
         # getting all values
@@ -106,7 +162,7 @@ class Brawler:
 
         raw = damage * projectiles * 0.8
 
-        return self.chance_calculation(raw), None  # None is the spawn health
+        return self.chance_calculation(raw, rng), None  # None is the spawn health
 
     def _sp1(self):
         """Represents the first SP of the Brawler."""
@@ -116,11 +172,19 @@ class Brawler:
         """Represents the second SP of the Brawler."""
         pass
 
-    def _spawn(self, level):
+    def _spawn(self, level, rng=random):
         """Represents the move of the spawned character of the Brawler."""
 
-    def buff_stats(self, level: int):
-        """Get all Brawler stats buffed by specified level."""
+    def buff_stats(self, level: int) -> dict:
+        """Get all Brawler stats buffed by specified level.
+
+        The returned mapping is shared and read-only.
+        """
+
+        return self.stat_table[level]
+
+    def compute_stats(self, level: int) -> dict:
+        """Compute all Brawler stats buffed by specified level."""
 
         if level == 10:
             level = 9
@@ -198,15 +262,11 @@ class Brawler:
         if not level:
             level = 1
 
-        stats = self.buff_stats(level)
+        health_str, attack_str, super_str = self.info_fields(level)
 
-        embed.add_field(name="HEALTH", value=f"{emojis['health']} {stats['health']}")
+        embed.add_field(name="HEALTH", value=health_str)
         embed.add_field(name="SPEED", value=f"{emojis['speed']} {self.speed}")
-
-        attack_str = self.attack_info(stats)
         embed.add_field(name="ATTACK", value=attack_str, inline=False)
-
-        super_str = self.super_info(stats)
         embed.add_field(name="SUPER", value=super_str, inline=False)
 
         u1 = u2 = ""
@@ -226,6 +286,22 @@ class Brawler:
 
         return embed
 
+    def info_fields(self, level: int) -> Tuple[str, str, str]:
+        """Return health, attack and super field values of the info embed."""
+
+        return self.info_table[level]
+
+    def compute_info_fields(self, level: int) -> Tuple[str, str, str]:
+        """Compute health, attack and super field values of the info embed."""
+
+        stats = self.buff_stats(level)
+
+        return (
+            f"{emojis['health']} {stats['health']}",
+            self.attack_info(stats),
+            self.super_info(stats)
+        )
+
     def attack_info(self, stats: dict):
         try:
             attack_str = self.attack['extra']
@@ -248,8 +324,8 @@ class Brawler:
 
         return info
 
-    def chance_calculation(self, raw: int):
-        chance = random.randint(0, 10)
+    def chance_calculation(self, raw: int, rng=random):
+        chance = rng.randint(0, 10)
 
         if chance >= 9:
             raw *= 1
@@ -268,6 +344,8 @@ class Brawler:
 class Healer(Brawler):
     """Class to represent a Brawler that heals using Super."""
 
+    __slots__ = ()
+
     def init(self):
         self.stats = {
             "health": self.health,
@@ -275,7 +353,7 @@ class Healer(Brawler):
             "ult_heal": self.ult["heal"]
         }
 
-    def _ult(self, level):
+    def _ult(self, level, rng=random):
         """Represents the Super ability of Poco."""
 
         # getting all values
@@ -287,7 +365,7 @@ class Healer(Brawler):
 
         raw = heal * 0.8
 
-        return [self.chance_calculation(raw)], None
+        return [self.chance_calculation(raw, rng)], None
 
     def super_info(self, stats: dict):
         try:
@@ -304,6 +382,8 @@ class Healer(Brawler):
 class Spawner(Brawler):
     """Class to represent a Brawler that spawns a character."""
 
+    __slots__ = ()
+
     def init(self):
         self.stats = {
             "health": self.health,
@@ -312,7 +392,7 @@ class Spawner(Brawler):
             "spawn_health": self.ult["spawn"]["health"]
         }
 
-    def _ult(self, level):
+    def _ult(self, level, rng=random):
         """Represents the Super ability of Nita."""
 
         # getting all values
@@ -324,9 +404,9 @@ class Spawner(Brawler):
 
         raw = damage * 0.8
 
-        return self.chance_calculation(raw), health
+        return self.chance_calculation(raw, rng), health
 
-    def _spawn(self, level):
+    def _spawn(self, level, rng=random):
         """Represents the move of the spawned character of the Brawler."""
 
         stats = self.buff_stats(level)
@@ -335,7 +415,7 @@ class Spawner(Brawler):
 
         raw = damage * 0.8
 
-        return self.chance_calculation(raw)
+        return self.chance_calculation(raw, rng)
 
     def super_info(self, stats):
         try:
@@ -367,6 +447,8 @@ class HealSpawner(Brawler):
     This exists as a separate class because of the additional "spawn_heal" element.
     """
 
+    __slots__ = ()
+
     def init(self):
         self.stats = {
             "health": self.health,
@@ -375,7 +457,7 @@ class HealSpawner(Brawler):
             "spawn_health": self.ult["spawn"]["health"]
         }
 
-    def _ult(self, level):
+    def _ult(self, level, rng=random):
         """Represents the Super ability of Nita."""
 
         # getting all values
@@ -387,16 +469,16 @@ class HealSpawner(Brawler):
 
         raw = heal * 0.8
 
-        return self.chance_calculation(raw), health
+        return self.chance_calculation(raw, rng), health
 
-    def _spawn(self, level):
+    def _spawn(self, level, rng=random):
         """Represents the move of the spawned character of Pam."""
 
-        heal = self.buff_stat(self.ult["spawn"]["heal"], level)
+        heal = self.buff_stats(level)["spawn_heal"]
 
         raw = heal * 0.8
 
-        return [self.chance_calculation(raw)]
+        return [self.chance_calculation(raw, rng)]
 
     def super_info(self, stats):
         try:
@@ -429,7 +511,9 @@ class HealSpawner(Brawler):
 class Barley(Brawler):
     """Class to represent Barley."""
 
-    def _ult(self, level):
+    __slots__ = ()
+
+    def _ult(self, level, rng=random):
         """Represent the Super ability of Barley."""
 
         # getting all values
@@ -447,14 +531,16 @@ class Barley(Brawler):
 
         raw = damage * projectiles * 0.8
 
-        return self.chance_calculation(raw), None
+        return self.chance_calculation(raw, rng), None
 
 
 # Overrides `_ult` method to factor in spin duration.
 class Carl(Brawler):
     """Class to represent Carl."""
 
-    def _ult(self, level):
+    __slots__ = ()
+
+    def _ult(self, level, rng=random):
         """Represent the Super ability of Carl."""
 
         # getting all values
@@ -466,14 +552,16 @@ class Carl(Brawler):
 
         raw = damage * 0.8 * duration
 
-        return self.chance_calculation(raw), None
+        return self.chance_calculation(raw, rng), None
 
 
 # Overrides `_attack` method to factor in range scaling.
 class Piper(Brawler):
     """Class to represent Piper."""
 
-    def _attack(self, level):
+    __slots__ = ()
+
+    def _attack(self, level, rng=random):
         """Represents the attack ability of Piper."""
 
         # getting all values
@@ -485,17 +573,19 @@ class Piper(Brawler):
 
         damage = stats['att_damage']
 
-        range_scaling = random.randint(range_ - 4, range_) * 0.1
+        range_scaling = rng.randint(range_ - 4, range_) * 0.1
 
         raw = damage * projectiles * 0.8 * range_scaling
 
-        return self.chance_calculation(raw)
+        return self.chance_calculation(raw, rng)
 
 
 # Overrides `init`, `_attack`, `_ult` and `attack_info` methods to factor in poison damage.
 class Crow(Brawler):
     """Class to represent Crow."""
 
+    __slots__ = ()
+
     def init(self):
         self.stats = {
             "health": self.health,
@@ -504,7 +594,7 @@ class Crow(Brawler):
             "ult_damage": self.ult["damage"]
         }
 
-    def _attack(self, level):
+    def _attack(self, level, rng=random):
         """Represents the attack ability of Crow."""
 
         # getting all values
@@ -516,14 +606,14 @@ class Crow(Brawler):
 
         damage = (
             stats['att_damage']
-            + stats['poison_damage'] * random.randint(1, 3)
+            + stats['poison_damage'] * rng.randint(1, 3)
         )
 
         raw = damage * projectiles * 0.8
 
-        return self.chance_calculation(raw)
+        return self.chance_calculation(raw, rng)
 
-    def _ult(self, level):
+    def _ult(self, level, rng=random):
         """Represents the Super ability of Crow."""
 
         # getting all values
@@ -534,12 +624,12 @@ class Crow(Brawler):
 
         damage = (
             stats['ult_damage']
-            + stats['poison_damage'] * random.randint(1, 3)
+            + stats['poison_damage'] * rng.randint(1, 3)
         )
 
         raw = damage * projectiles * 0.8
 
-        return self.chance_calculation(raw), None
+        return self.chance_calculation(raw, rng), None
 
     def attack_info(self, stats):
         try:
@@ -568,6 +658,8 @@ class Crow(Brawler):
 class Leon(Brawler):
     """Class to represent Leon."""
 
+    __slots__ = ()
+
     def super_info(self, stats):
         super_str = self.ult['extra']
         super_desc = f"```{self.ult['desc']}```"
@@ -585,82 +677,122 @@ class Leon(Brawler):
 class Shelly(Brawler):
     """Class to represent Shelly."""
 
+    __slots__ = ()
+
 
 class Nita(Spawner):
     """Class to represent Nita."""
 
+    __slots__ = ()
+
 
 class Colt(Brawler):
     """Class to represent Colt."""
 
+    __slots__ = ()
+
 
 class Bull(Brawler):
     """Class to represent Bull."""
 
+    __slots__ = ()
+
 
 class Jessie(Spawner):
     """Class to represent Jessie."""
 
+    __slots__ = ()
+
 
 class Brock(Brawler):
     """Class to represent Brock."""
 
+    __slots__ = ()
+
 
 class Dynamike(Brawler):
     """Class to represent Dynamike."""
 
+    __slots__ = ()
+
 
 class ElPrimo(Brawler):
     """Class to represent El Primo."""
 
+    __slots__ = ()
+
 
 class Poco(Healer):
     """Class to represent Poco."""
 
+    __slots__ = ()
+
 
 class Rico(Brawler):
     """Class to represent Rico."""
 
+    __slots__ = ()
+
 
 class Darryl(Brawler):
     """Class to represent Darryl."""
 
+    __slots__ = ()
+
 
 class Penny(Spawner):
     """Class to represent Penny."""
 
+    __slots__ = ()
+
 
 class Bo(Brawler):
     """Class to represent Bo."""
 
+    __slots__ = ()
+
 
 class Pam(HealSpawner):
     """Class to represent Pam."""
 
+    __slots__ = ()
+
 
 class Mortis(Brawler):
     """Class to represent Mortis."""
 
+    __slots__ = ()
+
 
 class Frank(Brawler):
     """Class to represent Frank."""
 
+    __slots__ = ()
+
 
 class Tara(Brawler):
     """Class to represent Tara."""
 
+    __slots__ = ()
+
 
 class Spike(Brawler):
     """Class to represent Spike."""
 
+    __slots__ = ()
+
 
 class Gene(Brawler):
     """Class to represent Gene."""
 
+    __slots__ = ()
+
 
 class Tick(Brawler):
     """Class to represent Tick."""
 
+    __slots__ = ()
+
 
 brawlers_map = {
     "Shelly": Shelly,
@@ -689,3 +821,109 @@ brawlers_map = {
     "Gene": Gene,
     "Tick": Tick,
 }
+
+
+class StarPower(NamedTuple):
+    brawler: str
+    # "sp1" or "sp2"
+    key: str
+    name: str
+    desc: str
+    icon: str
+
+
+class BrawlerRegistry:
+    """Brawler prototypes, created once from the data of `brawlers.json`.
+
+    Prototypes are looked up by name or catalog ID in constant time and
+    are shared by brawls, boxes and the shop. Views of the Brawlers which
+    commands need are grouped when the registry is built.
+
+    Parameters
+    -------------
+    all_brawlers: `dict`
+        Data of `brawlers.json`.
+
+    Attributes
+    -------------
+    catalog: `BrawlerCatalog`
+        IDs of the Brawlers, shared with `BrawlerRecords`.
+    names: `Tuple[str, ...]`
+        Brawler names, indexed by ID.
+    prototypes: `Tuple[Brawler, ...]`
+        Brawler prototypes, indexed by ID.
+    by_rarity: `Dict[str, Tuple[Brawler, ...]]`
+        Brawlers of each rarity.
+    by_unlock_trophies: `Tuple[Brawler, ...]`
+        Trophy Road Brawlers, sorted by trophies required to unlock them.
+    star_powers: `Dict[Tuple[str, str], StarPower]`
+        Star Powers, by Brawler name and `"sp1"` or `"sp2"`.
+    gem_skins, starpoint_skins: `Dict[str, Tuple[Tuple[str, int], ...]]`
+        Names and costs of skins bought with gems or star points, by Brawler name.
+    """
+
+    def __init__(self, all_brawlers: dict):
+        self.catalog = BrawlerCatalog.get(all_brawlers)
+        self.names: Tuple[str, ...] = tuple(self.catalog.names)
+        self.prototypes: Tuple[Brawler, ...] = tuple(
+            brawlers_map[name](all_brawlers, name) for name in self.names
+        )
+        self._by_name: Dict[str, Brawler] = dict(zip(self.names, self.prototypes))
+
+        by_rarity: Dict[str, List[Brawler]] = {}
+        for brawler in self.prototypes:
+            by_rarity.setdefault(brawler.rarity, []).append(brawler)
+        self.by_rarity: Dict[str, Tuple[Brawler, ...]] = {
+            rarity: tuple(brawlers) for rarity, brawlers in by_rarity.items()
+        }
+
+        self.by_unlock_trophies: Tuple[Brawler, ...] = tuple(
+            sorted(self.by_rarity.get("Trophy Road", ()), key=lambda brawler: brawler.unlockTrp)
+        )
+
+        self.star_powers: Dict[Tuple[str, str], StarPower] = {}
+        self.gem_skins: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self.starpoint_skins: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        for brawler in self.prototypes:
+            name = brawler.name
+            for idx, key in enumerate(("sp1", "sp2")):
+                sp = getattr(brawler, key)
+                self.star_powers[(name, key)] = StarPower(
+                    name, key, sp["name"], sp["desc"], sp_icons[name][idx]
+                )
+
+            # Skins with a gem cost are only sold for gems.
+            self.gem_skins[name] = tuple(
+                (skin, gems) for skin, (gems, _) in brawler.skins.items() if gems != -1
+            )
+            self.starpoint_skins[name] = tuple(
+                (skin, starpoints) for skin, (gems, starpoints) in brawler.skins.items()
+                if gems == -1 and starpoints != -1
+            )
+
+    def __getitem__(self, name: str) -> Brawler:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Optional[Brawler]:
+        """Return prototype of the Brawler or None if it doesn't exist."""
+
+        return self._by_name.get(name)
+
+    def by_id(self, idx: int) -> Brawler:
+        """Return prototype of the Brawler with the catalog ID."""
+
+        return self.prototypes[idx]
+
+    def star_power(self, brawler: str, sp: str) -> StarPower:
+        """Return the Brawler's `"sp1"` or `"sp2"` Star Power."""
+
+        return self.star_powers[(brawler, sp)]
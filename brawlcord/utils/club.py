@@ -13,6 +13,7 @@ from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
 from .constants import EMBED_COLOR
 from .emojis import emojis
 from .errors import CancellationError
+from .users import user_cache
 
 # Credits to Star List
 club_thumb = "https://www.starlist.pro/assets/club/{}.png"
@@ -112,6 +113,9 @@ class Club:
             clubs.append(club.to_json())
 
         await config.user(ctx.author).club.set(club.id)
+        await config.set_raw(
+            "club_stats", club.id, value=await cls.compute_stats([ctx.author.id], config)
+        )
 
         if default_length != new_length:
             await config.club_id_length.set(new_length)
@@ -176,13 +180,7 @@ class Club:
         Returns `None` if user can't be found.
         """
 
-        user = bot.get_user(user_id)
-        if user is None:
-            try:
-                user = await bot.fetch_user(user_id)
-            except Exception:
-                pass
-        return user
+        return await user_cache.fetch(bot, user_id)
 
     @staticmethod
     async def show_club(
@@ -201,9 +199,10 @@ class Club:
             club: Club = await Club.from_json(data, bot)
 
         embeds = []
-        pages = await club.members_list(config, get_league)
+        stats = await club.load_stats(config)
+        pages = club.members_list(stats, get_league)
         total_pages = len(pages)
-        total_trophies = await club.total_trophies(config)
+        total_trophies = stats["total_trophies"]
         if club.icon_num not in range(1, 31):
             icon_url = "https://www.starlist.pro/assets/icon/Club.png"
         else:
@@ -244,16 +243,8 @@ class Club:
     async def total_trophies(self, config: Config) -> int:
         """Returns total club trophies."""
 
-        total = 0
-
-        for member in self.all_members:
-            try:
-                brawlers = await config.user(member).brawlers()
-                total += self.get_user_trophies(brawlers)
-            except Exception:
-                continue
-
-        return total
+        stats = await self.load_stats(config)
+        return stats["total_trophies"]
 
     @staticmethod
     def get_user_trophies(brawlers: dict) -> int:
@@ -261,26 +252,102 @@ class Club:
 
         return sum([brawlers[brawler]["trophies"] for brawler in brawlers])
 
-    async def members_list(self, config: Config, get_league: Callable) -> (str, str):
-        """Returns a tuple of two strings.
+    @staticmethod
+    async def get_stats(club_id: str, config: Config) -> Optional[dict]:
+        """Returns stored stats of the club.
 
-        First string is for top ten club members (in terms of trophies).
-        Second is for all. If the club has less than or equal to 10 members,
-        the second string is empty.
+        Stats hold total club trophies and a list of `[user_id, trophies]`
+        of members, sorted by trophies. Returns `None` if the club has no
+        stats stored.
         """
 
-        mapping = {}
+        try:
+            return await config.get_raw("club_stats", club_id)
+        except KeyError:
+            return None
+
+    @staticmethod
+    def add_to_stats(stats: dict, user_id: int, trophies: int):
+        """Adds member to club stats or updates their trophies."""
+
+        Club.remove_from_stats(stats, user_id)
+
+        members = stats["members"]
+        idx = 0
+        while idx < len(members) and members[idx][1] >= trophies:
+            idx += 1
+        members.insert(idx, [user_id, trophies])
+
+        stats["total_trophies"] += trophies
+
+    @staticmethod
+    def remove_from_stats(stats: dict, user_id: int):
+        """Removes member from club stats, if present."""
+
+        members = stats["members"]
+        for idx, (member_id, trophies) in enumerate(members):
+            if member_id == user_id:
+                del members[idx]
+                stats["total_trophies"] -= trophies
+                break
+
+    @staticmethod
+    async def compute_stats(member_ids: List[int], config: Config) -> dict:
+        """Computes club stats from data of the members."""
+
+        stats = {"total_trophies": 0, "members": []}
 
-        for member in self.all_members:
+        for member_id in member_ids:
             try:
-                brawlers = await config.user(member).brawlers()
-                mapping[member] = self.get_user_trophies(brawlers)
+                brawlers = await config.user_from_id(member_id).brawlers()
+                Club.add_to_stats(stats, member_id, Club.get_user_trophies(brawlers))
             except Exception:
-                pass
+                continue
+
+        return stats
+
+    async def load_stats(self, config: Config) -> dict:
+        """Returns stats of the club, computing them if not stored."""
+
+        stats = await self.get_stats(self.id, config)
+        if stats is None:
+            stats = await self.compute_stats([m.id for m in self.all_members], config)
+            await config.set_raw("club_stats", self.id, value=stats)
+
+        return stats
+
+    @classmethod
+    async def update_member_trophies(
+        cls, club_id: str, user_id: int, trophies: int, config: Config
+    ):
+        """Updates trophies of the member in the club stats."""
+
+        stats = await cls.get_stats(club_id, config)
+        if stats is None:
+            # Stats are computed when the club is next shown.
+            return
 
-        # Sort mapping to get users with most trophies at the top.
-        mapping = {k: v for k, v in sorted(mapping.items(), key=lambda x: x[1], reverse=True)}
-        # total_num = len(mapping)
+        for member_id, old_trophies in stats["members"]:
+            if member_id == user_id:
+                if old_trophies == trophies:
+                    return
+                break
+
+        cls.add_to_stats(stats, user_id, trophies)
+        await config.set_raw("club_stats", club_id, value=stats)
+
+    def members_list(self, stats: dict, get_league: Callable) -> List[str]:
+        """Returns a list of pages of club members, sorted by trophies.
+
+        Each page lists ten members.
+        """
+
+        users = {member.id: member for member in self.all_members}
+
+        mapping = {}
+        for member_id, trophies in stats["members"]:
+            if member_id in users:
+                mapping[users[member_id]] = trophies
 
         first_ten_txt = ""
         second_ten_txt = ""
@@ -299,7 +366,7 @@ class Club:
             elif user.id in [s.id for s in self.seniors]:
                 pos = "**Senior**"
 
-            _, emoji = await get_league(mapping[user])
+            _, emoji = get_league(mapping[user])
             txt = f"\n`{(idx+1):02d}.` {user} {emoji}{mapping[user]} ({pos})"
 
             if idx in range(0, 10):
@@ -385,7 +452,8 @@ class Club:
                         async with config.clubs() as clubs:
                             where = next(i for i, d in enumerate(clubs) if d.get('id') == self.id)
                             del clubs[where]
-                            return True
+                        await config.clear_raw("club_stats", self.id)
+                        return True
         else:
             if user in self.vice_presidents:
                 self.vice_presidents.remove(user)
@@ -396,6 +464,11 @@ class Club:
 
         await self.update_club(config)
 
+        stats = await self.get_stats(self.id, config)
+        if stats is not None:
+            self.remove_from_stats(stats, user.id)
+            await config.set_raw("club_stats", self.id, value=stats)
+
     async def add_user(self, user: discord.User, config: Config):
         """Adds users to the club list."""
 
@@ -406,6 +479,12 @@ class Club:
 
         await self.update_club(config)
 
+        stats = await self.get_stats(self.id, config)
+        if stats is not None:
+            brawlers = await config.user(user).brawlers()
+            self.add_to_stats(stats, user.id, self.get_user_trophies(brawlers))
+            await config.set_raw("club_stats", self.id, value=stats)
+
     async def promote_user(self, user: discord.User, ctx: Context, config: Config):
         """Promotes a user.
 
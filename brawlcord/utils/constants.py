@@ -16,6 +16,69 @@ BRAWLCORD_CODE_URL = (
 REDDIT_LINK = "https://www.reddit.com/user/Snowsee"
 SOURCE_LINK = "https://github.com/brawlcord/brawlcord"
 
+# Token bank regenerates `TOKEN_BANK_REFILL` tokens every
+# `TOKEN_BANK_PERIOD` seconds, up to `TOKEN_BANK_LIMIT` tokens.
+TOKEN_BANK_LIMIT = 200
+TOKEN_BANK_REFILL = 20
+TOKEN_BANK_PERIOD = 80 * 60
+
+# Number of battle log entries kept per user, unless set by the owner.
+BATTLE_LOG_SIZE = 25
+# Partial entries are removed when the complete entry is saved. Only entries
+# of brawls whose rewards could not be given are kept, up to this limit.
+PARTIAL_BATTLE_LOG_SIZE = 5
+
+# Data exports larger than this (in bytes) are sent in parts, to stay
+# under Discord's 8 MiB upload limit.
+EXPORT_PART_SIZE = 8_000_000
+
+# Odds (in percent) of each draw from a box.
+BOX_ODDS = {
+    "Power Points": 94.6516,
+    "Rare": 2.2103,
+    "Super Rare": 1.2218,
+    "Epic": 0.5527,
+    "Mythic": 0.2521,
+    "Legendary": 0.1115,
+    "Star Power": 1
+}
+# Odds (in percent) of the extra reward of a box. These get multiplied when
+# a draw can't be given to the user.
+BOX_TICKETS_ODDS = 25
+BOX_GEMS_ODDS = 9
+BOX_TD_ODDS = 3  # token doubler
+
+# Contents of each box. `gold` and `powerpoints` are (lower, upper, average)
+# ranges, `gems` is a (lower, upper) range and `stack_limit_multiplier`
+# multiplies the extra reward odds if the user has fewer Brawlers to give
+# power points to than there are power point stacks.
+BOXES = {
+    "brawlbox": {
+        "draws": 2,
+        "gold": (12, 70, 19),
+        "powerpoints": (7, 25, 14),
+        "gems": (2, 5),
+        "tickets": 1,
+        "stack_limit_multiplier": None
+    },
+    "bigbox": {
+        "draws": 5,
+        "gold": (36, 210, 63),
+        "powerpoints": (27, 75, 46),
+        "gems": (6, 15),
+        "tickets": 4,
+        "stack_limit_multiplier": 1.5
+    },
+    "megabox": {
+        "draws": 9,
+        "gold": (36, 210, 63),
+        "powerpoints": (81, 225, 132),
+        "gems": (18, 45),
+        "tickets": 12,
+        "stack_limit_multiplier": 2
+    }
+}
+
 default_stats = {
     "trophies": 0,
     "pb": 0,
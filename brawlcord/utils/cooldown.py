@@ -1,74 +1,135 @@
 from datetime import datetime
+from typing import Dict, Set
 
 from redbot.core import Config
-from redbot.core.commands.context import Context
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
 from .core import utc_timestamp
 
 
-async def user_cooldown(rate: int, per: int, config: Config, ctx: Context):
-    """Handle user cooldown"""
+class CooldownManager:
+    """Keeps command cooldowns of users in memory.
 
-    async with config.user(ctx.author).cooldown() as cooldown:
-        if ctx.command.qualified_name not in cooldown:
-            cooldown[ctx.command.qualified_name] = {
-                "last": utc_timestamp(datetime.utcnow()),
-                "rate": rate,
-                "per": per,
-                "uses": 1
-            }
-            return True
-        else:
-            if await check_user_cooldown(ctx, config, cooldown):
-                return True
-    return False
+    Cooldowns of a user are read from Config the first time the user runs a
+    command with a cooldown. Changes are written back by `flush`, which is
+    called periodically and when the cog is unloaded.
+
+    Parameters
+    -------------
+    config: `Config`
+        Config of the cog. Cooldowns are stored in the `cooldown` user value.
+
+    Attributes
+    -------------
+    cooldowns: `Dict[int, Dict[str, dict]]`
+        Mapping of user IDs to cooldowns of each command.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        self.cooldowns: Dict[int, Dict[str, dict]] = {}
+        # IDs of users whose cooldowns have changed since the last flush.
+        self._dirty: Set[int] = set()
+
+    async def _load(self, user_id: int) -> Dict[str, dict]:
+        if user_id not in self.cooldowns:
+            cooldown = await self.config.user_from_id(user_id).cooldown()
+            # Another command may have loaded the user while we were waiting.
+            self.cooldowns.setdefault(user_id, cooldown)
 
+        return self.cooldowns[user_id]
 
-async def check_user_cooldown(ctx: Context, config: Config, cooldown: dict):
-    """Check if command is on cooldown."""
+    async def use(self, user_id: int, command: str, rate: int, per: int) -> bool:
+        """Use the command if it is not on cooldown.
 
-    command = ctx.command.qualified_name
+        Returns True if the command can be run, False if it is on cooldown.
+        """
 
-    last = cooldown[command]["last"]
-    rate = cooldown[command]["rate"]
-    per = cooldown[command]["per"]
-    uses = cooldown[command]["uses"]
+        cooldown = await self._load(user_id)
+        now = utc_timestamp(datetime.utcnow())
 
-    now = utc_timestamp(datetime.utcnow())
+        bucket = cooldown.get(command)
+        if bucket is None or now >= bucket["last"] + bucket["per"]:
+            cooldown[command] = {"last": now, "rate": rate, "per": per, "uses": 1}
+        elif bucket["uses"] < bucket["rate"]:
+            bucket["uses"] += 1
+        else:
+            return False
 
-    if now >= last + per:
-        cooldown[command] = {
-            "last": utc_timestamp(datetime.utcnow()),
-            "rate": rate,
-            "per": per,
-            "uses": 1
-        }
+        self._dirty.add(user_id)
         return True
-    else:
-        if uses < rate:
-            cooldown[command] = {
-                "last": last,
-                "rate": rate,
-                "per": per,
-                "uses": uses + 1
-            }
-            return True
-    return False
-
-
-async def user_cooldown_msg(ctx: Context, config: Config):
-    """Return cooldown message with time remaining."""
-
-    async with config.user(ctx.author).cooldown() as cooldown:
-        command = ctx.command.qualified_name
-
-        per = cooldown[command]["per"]
-        last = cooldown[command]["last"] + per
+
+    def remaining(self, user_id: int, command: str) -> float:
+        """Return seconds until the command is off cooldown for the user."""
+
+        bucket = self.cooldowns.get(user_id, {}).get(command)
+        if bucket is None:
+            return 0
+
         now = utc_timestamp(datetime.utcnow())
+        return max(bucket["last"] + bucket["per"] - now, 0)
 
-        return (
-            "This command is on cooldown. Try again in {}.".format(
-                humanize_timedelta(seconds=last-now) or "1 second"
-            )
+    def cooldown_msg(self, user_id: int, command: str) -> str:
+        """Return cooldown message with time remaining."""
+
+        return "This command is on cooldown. Try again in {}.".format(
+            humanize_timedelta(seconds=self.remaining(user_id, command)) or "1 second"
         )
+
+    def expire(self):
+        """Remove cooldowns which have run out.
+
+        The removal is saved with the next flush.
+        """
+
+        now = utc_timestamp(datetime.utcnow())
+
+        for user_id, cooldown in self.cooldowns.items():
+            expired = [
+                command for command, bucket in cooldown.items()
+                if now >= bucket["last"] + bucket["per"]
+            ]
+            for command in expired:
+                del cooldown[command]
+            if expired:
+                self._dirty.add(user_id)
+
+        # Users with no cooldowns left are removed once their data is saved.
+        for user_id in [
+            user_id for user_id, cooldown in self.cooldowns.items()
+            if not cooldown and user_id not in self._dirty
+        ]:
+            del self.cooldowns[user_id]
+
+    async def flush(self) -> int:
+        """Save changed cooldowns to Config.
+
+        Returns the number of users saved.
+        """
+
+        dirty = self._dirty
+        self._dirty = set()
+
+        for user_id in dirty:
+            cooldown = self.cooldowns.get(user_id)
+            if cooldown is None:
+                continue
+            await self.config.user_from_id(user_id).cooldown.set(
+                {command: dict(bucket) for command, bucket in cooldown.items()}
+            )
+
+        return len(dirty)
+
+    async def clear(self, user_id: int):
+        """Remove all cooldowns of the user."""
+
+        self.cooldowns[user_id] = {}
+        self._dirty.discard(user_id)
+        await self.config.user_from_id(user_id).cooldown.clear()
+
+    def forget(self, user_id: int):
+        """Remove user's cooldowns from memory without saving them."""
+
+        self.cooldowns.pop(user_id, None)
+        self._dirty.discard(user_id)
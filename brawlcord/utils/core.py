@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Tuple
 
 from redbot.core import commands
 from redbot.core.commands import Context
 
+from .constants import TOKEN_BANK_LIMIT, TOKEN_BANK_PERIOD, TOKEN_BANK_REFILL
 from .errors import MaintenanceError
 
 
@@ -10,26 +12,21 @@ def maintenance():
     """A decorator which checks for maintenance."""
 
     async def predicate(ctx: Context):
-        if await ctx.bot.is_owner(ctx.author):
+        cog = ctx.cog
+        # The cog keeps a copy of the setting, so no Config access is needed.
+        if not cog or not cog.maintenance["setting"]:
             # True means command should run
             return True
 
-        cog = ctx.cog
-        if cog:
-            config = cog.config
-
-            async with config.maintenance() as maint:
-                setting = maint["setting"]
-
-                if setting:
-                    raise MaintenanceError(
-                        "The bot is currently under maintenance. It will end"
-                        f" in approx. {maint['duration']} minutes."
-                        " Commands will not work till then."
-                        " Sorry for the inconvenience!"
-                    )
-        # Run command if not maintenance
-        return True
+        if await ctx.bot.is_owner(ctx.author):
+            return True
+
+        raise MaintenanceError(
+            "The bot is currently under maintenance. It will end"
+            f" in approx. {cog.maintenance['duration']} minutes."
+            " Commands will not work till then."
+            " Sorry for the inconvenience!"
+        )
 
     return commands.check(predicate)
 
@@ -53,3 +50,48 @@ def utc_timestamp(time: datetime) -> float:
     timestamp = (time - epoch).total_seconds()
 
     return timestamp
+
+
+def regenerate_token_bank(
+    tokens_in_bank: int, bank_update_ts: float, now: float
+) -> Tuple[int, float]:
+    """Return token bank and its update timestamp with regeneration applied.
+
+    Every full `TOKEN_BANK_PERIOD` since `bank_update_ts` adds
+    `TOKEN_BANK_REFILL` tokens, capped at `TOKEN_BANK_LIMIT`. While the bank
+    is full, at most one period is kept pending so that the first refill
+    after spending tokens happens on the next check, like it did when banks
+    were refilled by a background task.
+
+    Parameters
+    --------------
+    tokens_in_bank : int
+        Tokens currently in the bank
+    bank_update_ts : float
+        Timestamp of the last bank update in UTC, None if the user has not
+        finished the tutorial
+    now : float
+        Current timestamp in UTC
+
+    Returns
+    ---------
+    Tuple[int, float]
+        Updated tokens in bank and bank update timestamp
+    """
+
+    if bank_update_ts is None:
+        return tokens_in_bank, bank_update_ts
+
+    periods = int((now - bank_update_ts) // TOKEN_BANK_PERIOD)
+    if periods <= 0:
+        return tokens_in_bank, bank_update_ts
+
+    if tokens_in_bank >= TOKEN_BANK_LIMIT:
+        return tokens_in_bank, now - TOKEN_BANK_PERIOD
+
+    tokens_in_bank = min(
+        TOKEN_BANK_LIMIT, tokens_in_bank + periods * TOKEN_BANK_REFILL
+    )
+    bank_update_ts += periods * TOKEN_BANK_PERIOD
+
+    return tokens_in_bank, bank_update_ts
@@ -0,0 +1,655 @@
+import random
+from math import ceil
+from typing import TYPE_CHECKING, Any, Callable, Generator, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .brawlers import Brawler
+
+spawn_text = {
+    "Nita": "Bear",
+    "Penny": "Cannon",
+    "Jessie": "Turrent",
+    "Pam": "Healing Station",
+    "8-Bit": "Turret"
+}
+
+healing_over_time = 100
+healing_time = 3
+
+
+class Player:
+    """A class for Player data and stats.
+
+    Parameters
+    -------------
+    user: `Any`
+        Identifier of the player. It is a `discord.User` when playing on
+        Discord but can be any object when running headless matches.
+    brawler: `Brawler`
+        The Brawler used by the player.
+    level: `int`
+        Level of the Brawler.
+    """
+
+    def __init__(self, user: Any, brawler: "Brawler", level: int):
+        self.player = user
+
+        self.attacks = 0
+
+        self.invincibility = False
+
+        self.respawning = None
+        self.is_respawning = False
+
+        self.spawn = None
+
+        self.brawler = brawler
+        self.brawler_name = brawler.name
+        self.brawler_level = level
+
+        self.static_health = self.brawler._health(self.brawler_level)
+        self.health = self.static_health
+
+        self.can_super = False
+
+        # round number when last attacked opponent
+        # or got attacked by the opponent
+        self.last_attack = -1
+
+        self.stunned = False
+
+        try:
+            self.spawn_str: str = spawn_text[self.brawler_name]
+        except KeyError:
+            self.spawn_str = ""
+
+    # We have these functions here because of type hinting.
+    # There is no other reason for them to exist here instead of
+    # in the game engine classes.
+    def gemgrab(self):
+        self.gems = 0
+        self.dropped = 0
+
+    def showdown(self):
+        self.powerups = 1
+
+    def brawlball(self):
+        self.goals = 0
+        self.progress = 0
+
+    def _to_json(self) -> dict:
+        """Return a dict with player data"""
+
+        return {
+            "player": self.player,
+            "brawler": self.brawler,
+            "brawler_name": self.brawler_name,
+            "brawler_level": self.brawler_level,
+            "attacks": self.attacks,
+            "invincibility": self.invincibility,
+            "respawning": self.respawning,
+            "spawn": self.spawn,
+            "static_health": self.static_health,
+            "health": self.health,
+            "spawn_str": self.spawn_str
+        }
+
+
+# Events yielded by `GameEngine.play`.
+
+class MoveRequest(NamedTuple):
+    """`first` has to pick a move. Send the move number (1 to `moves`) back."""
+
+    first: Player
+    second: Player
+    moves: int
+    round_num: int
+
+
+class Respawning(NamedTuple):
+    """`player` is respawning and skips the turn."""
+
+    player: Player
+    other: Player
+
+
+class Stunned(NamedTuple):
+    """`stunned` is stunned and skips the turn."""
+
+    stunned: Player
+    other: Player
+
+
+class Defeated(NamedTuple):
+    """`loser` was defeated by `winner` and respawns next round."""
+
+    winner: Player
+    loser: Player
+
+
+class GameOver(NamedTuple):
+    """The match has ended.
+
+    `winner` and `loser` are None in case of a draw. `time_up` is True if
+    the match ran out of rounds.
+    """
+
+    winner: Optional[Player]
+    loser: Optional[Player]
+    time_up: bool
+
+
+def random_move(request: MoveRequest) -> int:
+    """Move provider which picks a random available move."""
+
+    return random.randint(1, request.moves)
+
+
+class GameEngine:
+    """Base class for the turn rules of game modes.
+
+    The engine does no I/O. `play` returns a generator of events and
+    expects the chosen move to be sent back for every `MoveRequest`.
+
+    Parameters
+    -------------
+    first: `Player`
+        The player who moves first.
+    second: `Player`
+        The player who moves second.
+    rng: `Optional[random.Random]`
+        Random number generator used by the rules and the Brawlers'
+        attacks, Supers and spawns. Defaults to the `random` module.
+    """
+
+    # Number of turns, both players move once per round.
+    rounds = 150
+    # Whether a defeated player respawns instead of losing.
+    respawns = True
+    # Number of moves available when the opponent is respawning.
+    respawn_moves = 3
+
+    def __init__(self, first: Player, second: Player, rng: random.Random = None):
+        self.first = first
+        self.second = second
+
+        self.rng = rng or random
+
+    def play(self) -> Generator[Any, Optional[int], None]:
+        """Run the match, yielding events until `GameOver`."""
+
+        i = 0
+        while i < self.rounds:
+            if i % 2 == 0:
+                first = self.first
+                second = self.second
+            else:
+                first = self.second
+                second = self.first
+
+            if first.is_respawning:
+                yield Respawning(first, second)
+            else:
+                self.healing(i, first)
+                if first.stunned:
+                    first.stunned = False
+                    yield Stunned(first, second)
+                    i += 1
+                    continue
+
+                moves = self.available_moves(first, second)
+                choice = yield MoveRequest(first, second, moves, i)
+
+                self.move_handler(choice, first, second, i)
+                self.after_move(i)
+
+                if self.respawns and second.health <= 0:
+                    self.respawning(second)
+                    yield Defeated(first, second)
+
+                    # go to next loop
+                    i += 1
+                    continue
+
+            winner, loser = self.check_if_win(first, second)
+
+            if winner is not False:
+                yield GameOver(winner, loser, False)
+                return
+            # go to next loop
+            i += 1
+
+        yield GameOver(None, None, True)
+
+    def run(self, provider: Callable[[MoveRequest], int] = random_move) -> GameOver:
+        """Run the match to the end, getting moves from `provider`."""
+
+        game = self.play()
+        event = next(game)
+        while not isinstance(event, GameOver):
+            if isinstance(event, MoveRequest):
+                event = game.send(provider(event))
+            else:
+                event = next(game)
+
+        return event
+
+    def available_moves(self, first: Player, second: Player) -> int:
+        """Return number of moves `first` can pick from."""
+
+        if not second.is_respawning:
+            if first.attacks >= 6:
+                first.can_super = True
+                end = 4
+            else:
+                first.can_super = False
+                end = 3
+        else:
+            end = self.respawn_moves
+
+        if second.spawn:
+            if second.spawn > 0:
+                end += 1
+            else:
+                second.spawn = None
+
+        return end
+
+    def check_if_win(self, first: Player, second: Player):
+        """Needs to be implemented in inherited classes.
+
+        `None` is expected in case of draws. `False` if game hasn't ended.
+        """
+
+    def move_handler(
+        self, choice: int, first: Player, second: Player, round_num: int
+    ):
+        """Needs to be implemented in inherited classes."""
+
+    def after_move(self, round_num: int):
+        """Called after every move. Can be implemented in inherited classes."""
+
+    def _move_attack(self, first: Player, second: Player, round_num: int):
+        first.last_attack = round_num
+
+        damage = self.apply_powerups(first, first.brawler._attack(first.brawler_level, self.rng))
+        if not second.invincibility:
+            second.health -= damage
+            second.last_attack = round_num
+            first.attacks += 1
+        else:
+            second.invincibility = False
+
+    def _move_invinc(self, first: Player, second: Player):
+        first.invincibility = True
+        if second.invincibility:
+            second.invincibility = False
+
+    def _move_super(self, first: Player, second: Player, round_num: int):
+        first.last_attack = round_num
+
+        # Hardcoding for Leon's invisibility.
+        if first.brawler.name == "Leon":
+            first.invincibility = True
+            return
+
+        vals, first.spawn = first.brawler._ult(first.brawler_level, self.rng)
+        first.attacks = 0
+        if isinstance(vals, list):
+            # heal
+            first.health += self.apply_powerups(first, vals[0])
+            if first.health > first.static_health:
+                first.health = first.static_health
+
+            # hardcoding for Mortis to both
+            # deal damage and heal
+            vals = vals[0]
+            if first.brawler_name != "Mortis":
+                return
+
+        if not second.invincibility:
+            second.health -= self.apply_powerups(first, vals)
+        else:
+            second.health -= (self.apply_powerups(first, vals) * 0.5)
+            second.invincibility = False
+
+        second.last_attack = round_num
+
+        # hardcoding for Frank's stun
+        if first.brawler_name == "Frank":
+            second.stunned = True
+
+    def _move_attack_spawn(self, first: Player, second: Player):
+        second.spawn -= self.apply_powerups(first, first.brawler._attack(first.brawler_level, self.rng))
+
+    def _move_spawn_attack(
+        self, first: Player, second: Player, round_num: int
+    ):
+        # spawns have 50% chance of attacking/healing
+        if not self.rng.randint(0, 1):
+            return
+        if first.spawn:
+            vals = first.brawler._spawn(first.brawler_level, self.rng)
+            if isinstance(vals, list):
+                # heal
+                first.health += self.apply_powerups(first, vals[0])
+                if first.health > first.static_health:
+                    first.health = first.static_health
+            else:
+                if not second.invincibility:
+                    second.health -= self.apply_powerups(first, vals)
+                    second.last_attack = round_num
+                    first.attacks += 1
+                else:
+                    second.invincibility = False
+
+    def respawning(self, player: Player):
+        player.is_respawning = True
+        player.health = player.static_health
+
+    def healing(self, round_num: int, player: Player):
+        """Heal Player over time."""
+
+        if player.last_attack + healing_time < round_num:
+            player.health += healing_over_time
+            if player.health > player.static_health:
+                player.health = player.static_health
+
+    def apply_powerups(self, player: Player, value: int):
+        return value
+
+
+class GemGrabEngine(GameEngine):
+    """Turn rules of Gem Grab."""
+
+    # game ends after 75th round
+    rounds = 150
+    respawns = True
+    respawn_moves = 3
+
+    def __init__(self, first: Player, second: Player, rng: random.Random = None):
+        super().__init__(first, second, rng)
+
+        self.first.gemgrab()
+        self.second.gemgrab()
+
+    def check_if_win(self, first: Player, second: Player):
+        if first.gems >= 10 and second.gems < 10:
+            winner = first
+            loser = second
+        elif second.gems >= 10 and first.gems < 10:
+            winner = second
+            loser = first
+        elif second.gems >= 10 and first.gems >= 10:
+            winner = None
+            loser = None
+        else:
+            winner = False
+            loser = False
+
+        return winner, loser
+
+    def respawning(self, player: Player):
+        super().respawning(player)
+
+        player.dropped = ceil(player.gems * 0.5)
+        player.gems -= player.dropped
+
+    def move_handler(
+        self, choice: int, first: Player, second: Player, round_num: int
+    ):
+
+        if not second.is_respawning:
+            if choice == 1:
+                # attack
+                self._move_attack(first, second, round_num)
+            elif choice == 2:
+                # collect gem
+                self._move_gem(first, second)
+            elif choice == 3:
+                # invincibility
+                self._move_invinc(first, second)
+            elif choice == 4:
+                if first.can_super:
+                    # super
+                    self._move_super(first, second, round_num)
+                else:
+                    # attack spawn
+                    self._move_attack_spawn(first, second)
+            elif choice == 5:
+                # attack spawn
+                self._move_attack_spawn(first, second)
+
+            # spawn's attack
+            self._move_spawn_attack(first, second, round_num)
+
+        else:
+            second.is_respawning = False
+            if choice == 1:
+                # collect gem
+                self._move_gem(first, second)
+            elif choice == 2:
+                # invincibility
+                self._move_invinc(first, second)
+            elif choice == 3:
+                # collect dropped gems
+                self._move_dropped_gems(first, second)
+            elif choice == 4:
+                # attack spawn
+                self._move_attack_spawn(first, second)
+
+            # spawn's attack
+            self._move_spawn_attack(first, second, round_num)
+
+    def _move_gem(self, first: Player, second: Player):
+        # 0.75 of collecting one gem
+        collected_gem = self.rng.choice([0, 1, 1, 1])
+        first.gems += collected_gem
+        if second.invincibility:
+            second.invincibility = False
+
+    def _move_dropped_gems(self, first: Player, second: Player):
+        collected = self.rng.randint(0, second.dropped)
+        second.dropped = 0
+        first.gems += collected
+        if second.invincibility:
+            second.invincibility = False
+
+
+class ShowdownEngine(GameEngine):
+    """Turn rules of Solo Showdown."""
+
+    # Game ends after 50th round.
+    rounds = 100
+    respawns = False
+
+    def __init__(self, first: Player, second: Player, rng: random.Random = None):
+        super().__init__(first, second, rng)
+
+        self.first.showdown()
+        self.second.showdown()
+
+        # Poison effect starts at the 20th round.
+        # We set this variable to 40 so we can directly compare
+        # it with `i` (the loop variable using in GameEngine.play).
+        self.poison_starting = 40
+
+        # The poison damage actually appears as 200 to the user.
+        # This is because the poison_effect method is called twice
+        # before a user sees his stats again.
+        self.poison_damage = 100
+
+        # This is useful when checking for poison in the embed setup method.
+        # Currently, it gets set to `True` each time the condition in `poison_effect`
+        # method evaluates to `True`.
+        self.poison_started = False
+
+    def check_if_win(self, first: Player, second: Player):
+        if first.health > 0 and second.health <= 0:
+            winner = first
+            loser = second
+        elif second.health > 0 and first.health <= 0:
+            winner = second
+            loser = first
+        elif second.health <= 0 and first.health <= 0:
+            # draw
+            winner = None
+            loser = None
+        else:
+            # continues game
+            winner = False
+            loser = False
+
+        return winner, loser
+
+    def move_handler(
+        self, choice: int, first: Player, second: Player, round_num: int
+    ):
+        if choice == 1:
+            # attack
+            self._move_attack(first, second, round_num)
+        elif choice == 2:
+            # collect powerup
+            self._move_powerup(first, second, round_num)
+        elif choice == 3:
+            # invincibility
+            self._move_invinc(first, second)
+        elif choice == 4:
+            if first.can_super:
+                # super
+                self._move_super(first, second, round_num)
+            else:
+                # attack spawn
+                self._move_attack_spawn(first, second)
+        elif choice == 5:
+            # attack spawn
+            self._move_attack_spawn(first, second)
+
+        # spawn's attack
+        self._move_spawn_attack(first, second, round_num)
+
+    def after_move(self, round_num: int):
+        # poison damage
+        self.poison_effect(round_num)
+
+    def _move_powerup(self, first: Player, second: Player, round_num: int):
+        first.last_attack = round_num
+
+        # 0.5 of collecting powerup
+        collected_powerup = self.rng.choice([0, 1])
+        first.powerups += collected_powerup
+        if collected_powerup:
+            self.buff_health(first)
+        if second.invincibility:
+            second.invincibility = False
+
+    def buff_health(self, player: Player):
+        player.static_health += 400
+        player.health += 400
+
+    def apply_powerups(self, player: Player, value: int):
+        # 10% increase per powerup
+        for _ in range(1, player.powerups):
+            value += round(value * 0.1)
+
+        return value
+
+    def poison_effect(self, round_num: int):
+        if round_num >= self.poison_starting:
+            self.poison_started = True
+            self.first.health -= self.poison_damage
+            self.second.health -= self.poison_damage
+
+
+class BrawlBallEngine(GameEngine):
+    """Turn rules of Brawl Ball."""
+
+    # Game ends after 75th round.
+    rounds = 150
+    respawns = True
+    respawn_moves = 2
+
+    def __init__(self, first: Player, second: Player, rng: random.Random = None):
+        super().__init__(first, second, rng)
+
+        self.first.brawlball()
+        self.second.brawlball()
+
+        self.ball_holder = None
+
+    def check_if_win(self, first: Player, second: Player):
+        if first.goals == 2:
+            winner = first
+            loser = second
+        elif second.goals == 2:
+            winner = second
+            loser = first
+        else:
+            winner = False
+            loser = False
+
+        return winner, loser
+
+    def move_handler(
+        self, choice: int, first: Player, second: Player, round_num: int
+    ):
+
+        if not second.is_respawning:
+            if choice == 1:
+                # attack
+                self._move_attack(first, second, round_num)
+            elif choice == 2:
+                # kick ball
+                self._move_kick(first, second)
+            elif choice == 3:
+                # invincibility
+                self._move_invinc(first, second)
+            elif choice == 4:
+                if first.can_super:
+                    # super
+                    self._move_super(first, second, round_num)
+                else:
+                    # attack spawn
+                    self._move_attack_spawn(first, second)
+            elif choice == 5:
+                # attack spawn
+                self._move_attack_spawn(first, second)
+
+            # spawn's attack
+            self._move_spawn_attack(first, second, round_num)
+
+        else:
+            second.is_respawning = False
+            if choice == 1:
+                # kick ball
+                self._move_kick(first, second)
+            elif choice == 2:
+                # invincibility
+                self._move_invinc(first, second)
+            elif choice == 3:
+                # attack spawn
+                self._move_attack_spawn(first, second)
+
+            # spawn's attack
+            self._move_spawn_attack(first, second, round_num)
+
+    def _move_kick(self, first: Player, second: Player):
+        if second.is_respawning:
+            # 0.50 chance of scoring a goal
+            goal = self.rng.choice([0, 1])
+        else:
+            # 0.10 chance of scoring a goal
+            goal = self.rng.choices([0, 1], [0.9, 0.1], k=1)[0]
+        if first.can_super and not goal:
+            # 0.40 chance of scoring
+            goal = self.rng.choices([0, 1], [0.6, 0.4], k=1)[0]
+        first.goals += goal
+        if second.invincibility:
+            second.invincibility = False
+
+
+engines_map = {
+    "Gem Grab": GemGrabEngine,
+    "Solo Showdown": ShowdownEngine,
+    "Brawl Ball": BrawlBallEngine
+}
@@ -0,0 +1,79 @@
+import io
+import json
+import zipfile
+from typing import Any, List, Tuple
+
+from .constants import EXPORT_PART_SIZE
+
+# Keys of the user data written to their own files. The rest of the data
+# goes in `profile.json`.
+SECTIONS = ("brawlers", "battle_log", "partial_battle_log")
+
+# Encoded JSON is written to the archive in chunks of about this size.
+CHUNK_SIZE = 64 * 1024
+
+_encoder = json.JSONEncoder()
+
+
+def _write_json(archive: zipfile.ZipFile, name: str, obj: Any):
+    """Encode `obj` into a new file of the archive, one chunk at a time."""
+
+    with archive.open(name, "w") as f:
+        chunks = []
+        size = 0
+        for chunk in _encoder.iterencode(obj):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= CHUNK_SIZE:
+                f.write("".join(chunks).encode())
+                chunks = []
+                size = 0
+        f.write("".join(chunks).encode())
+
+
+def build_export(
+    data: dict, name: str, part_size: int = EXPORT_PART_SIZE
+) -> List[Tuple[str, bytes]]:
+    """Return user data as a zip archive split into parts.
+
+    Large sections of the data (Brawlers and battle logs) are serialized
+    into separate files. This is CPU bound and should be run in an executor.
+
+    Parameters
+    -------------
+    data: `dict`
+        The user data, as returned by `config.user(user).all()`.
+    name: `str`
+        Name of the archive, without extension.
+    part_size: `int`
+        Maximum size of a part in bytes.
+
+    Returns
+    -------------
+    `List[Tuple[str, bytes]]`
+        File name and content of each part. If the archive fits in a single
+        part, it is named `<name>.zip`. Otherwise parts are numbered like
+        `<name>.zip.001` and must be joined before extracting.
+    """
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        _write_json(
+            archive, "profile.json",
+            {key: value for key, value in data.items() if key not in SECTIONS}
+        )
+        for brawler, stats in data.get("brawlers", {}).items():
+            _write_json(archive, f"brawlers/{brawler}.json", stats)
+        for key in ("battle_log", "partial_battle_log"):
+            _write_json(archive, f"{key}.json", data.get(key, []))
+
+    content = buffer.getvalue()
+    filename = f"{name}.zip"
+
+    if len(content) <= part_size:
+        return [(filename, content)]
+
+    return [
+        (f"{filename}.{idx:03d}", content[start:start + part_size])
+        for idx, start in enumerate(range(0, len(content), part_size), start=1)
+    ]
@@ -0,0 +1,122 @@
+import sys
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class LeaderboardIndex:
+    """Represents an in-memory leaderboard ordered by score.
+
+    Entries are kept sorted by score (highest first) and then by user ID, so
+    looking up a user's position is a binary search instead of a sort of
+    all users.
+
+    Attributes
+    -------------
+    scores: `Dict[int, int]`
+        Mapping of user IDs to their scores.
+    extras: `Dict[int, Any]`
+        Mapping of user IDs to extra data stored with their scores.
+    """
+
+    def __init__(self):
+        self.scores: Dict[int, int] = {}
+        self.extras: Dict[int, Any] = {}
+
+        # Sorted list of `(-score, user_id)` tuples.
+        self._entries: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.scores
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over `(user_id, score)` tuples, highest score first."""
+
+        for neg_score, user_id in self._entries:
+            yield user_id, -neg_score
+
+    def _remove_entry(self, user_id: int, score: int):
+        idx = bisect_left(self._entries, (-score, user_id))
+        del self._entries[idx]
+
+    def update(self, user_id: int, score: int, extra: Any = None):
+        """Add user to the leaderboard or update their score.
+
+        `extra` is stored with the score and can be retrieved with `extra`.
+        """
+
+        if extra is not None:
+            self.extras[user_id] = extra
+
+        old_score = self.scores.get(user_id)
+        if old_score == score:
+            return
+        if old_score is not None:
+            self._remove_entry(user_id, old_score)
+
+        self.scores[user_id] = score
+        insort(self._entries, (-score, user_id))
+
+    def remove(self, user_id: int):
+        """Remove user from the leaderboard, if present."""
+
+        self.extras.pop(user_id, None)
+        old_score = self.scores.pop(user_id, None)
+        if old_score is not None:
+            self._remove_entry(user_id, old_score)
+
+    def clear(self):
+        """Remove all entries from the leaderboard."""
+
+        self.scores.clear()
+        self.extras.clear()
+        self._entries.clear()
+
+    def score(self, user_id: int) -> Optional[int]:
+        """Return user's score or None if the user is not on the leaderboard."""
+
+        return self.scores.get(user_id)
+
+    def extra(self, user_id: int) -> Any:
+        """Return extra data stored with user's score."""
+
+        return self.extras.get(user_id)
+
+    def position(self, user_id: int) -> Optional[int]:
+        """Return user's position (starting at 1) on the leaderboard.
+
+        Returns None if the user is not on the leaderboard.
+        """
+
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+
+        return bisect_left(self._entries, (-score, user_id)) + 1
+
+    def top(self, count: int = 10) -> List[Tuple[int, int]]:
+        """Return `(user_id, score)` tuples of the top `count` users."""
+
+        return list(islice(self, count))
+
+    def memory_usage(self) -> int:
+        """Return approximate memory used by the index in bytes."""
+
+        size = (
+            sys.getsizeof(self.scores)
+            + sys.getsizeof(self.extras)
+            + sys.getsizeof(self._entries)
+        )
+        for neg_score, user_id in self._entries:
+            size += (
+                sys.getsizeof((neg_score, user_id))
+                + sys.getsizeof(neg_score)
+                + sys.getsizeof(user_id)
+            )
+        for extra in self.extras.values():
+            size += sys.getsizeof(extra)
+
+        return size
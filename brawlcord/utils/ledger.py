@@ -0,0 +1,228 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+from redbot.core import Config
+
+from .storage import SQLiteStore
+
+# Name of the Config custom group holding the ledgers.
+LEDGER = "LEDGER"
+
+# Currencies kept in the ledger.
+CURRENCIES = ("gold", "tokens", "gems", "starpoints", "token_doubler", "tickets")
+
+# Entries of the tail are folded into the snapshot once there are this many.
+TAIL_SIZE = 50
+# Number of folded entries kept for auditing.
+HISTORY_SIZE = 100
+
+default_ledger = {
+    # Balances at the time of the last compaction, None until first used.
+    "snapshot": None,
+    # Entries since the snapshot, as `[timestamp, currency, delta, reason]`,
+    # keyed by their position in the tail so new entries are saved one by one.
+    "tail": {},
+    # Entries folded into the snapshot, newest last.
+    "history": [],
+}
+
+
+class Ledger:
+    """Append-only ledger of the currencies of users.
+
+    The balance of a currency is its value in the snapshot plus the deltas
+    in the tail. Changes are appended in memory, so they are never lost to
+    a concurrent read-modify-write, and are saved to Config by `flush`,
+    which is called periodically and when the cog is unloaded. Only the
+    entries appended since the previous flush are written, unless the
+    tail was compacted.
+
+    The ledger is the only source of currency balances. Balances stored in
+    the user document before the ledger existed are taken as the first
+    snapshot and are not updated afterwards, so user documents must be
+    read through `overlay` wherever their currencies are shown or copied.
+
+    Parameters
+    -------------
+    config: `Config`
+        Config of the cog, with the `LEDGER` custom group registered.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        # Loaded accounts, with the tail as a list.
+        self.accounts: Dict[int, dict] = {}
+        self._balances: Dict[int, Dict[str, int]] = {}
+        # Currencies changed since the last flush, by user ID.
+        self._dirty: Dict[int, Set[str]] = {}
+        # Number of tail entries saved to Config, by user ID. None if the
+        # whole account has to be written.
+        self._saved: Dict[int, Optional[int]] = {}
+
+        # Held while saving, so a ledger isn't cleared in the middle of a flush.
+        self._lock = asyncio.Lock()
+
+    async def _load(self, user_id: int) -> dict:
+        if user_id not in self.accounts:
+            account = await self.config.custom(LEDGER, user_id).all()
+            saved = len(account["tail"])
+            account["tail"] = [account["tail"][key] for key in sorted(account["tail"], key=int)]
+            if account["snapshot"] is None:
+                user_data = await self.config.user_from_id(user_id).all()
+                account["snapshot"] = {currency: user_data[currency] for currency in CURRENCIES}
+                saved = None
+
+            # Another command may have loaded the user while we were waiting.
+            if user_id not in self.accounts:
+                balances = dict(account["snapshot"])
+                for _, currency, delta, _ in account["tail"]:
+                    balances[currency] += delta
+                self.accounts[user_id] = account
+                self._balances[user_id] = balances
+                self._saved[user_id] = saved
+
+        return self.accounts[user_id]
+
+    async def balance(self, user_id: int, currency: str) -> int:
+        """Return balance of the currency."""
+
+        await self._load(user_id)
+        return self._balances[user_id][currency]
+
+    async def balances(self, user_id: int) -> Dict[str, int]:
+        """Return balances of all currencies."""
+
+        await self._load(user_id)
+        return dict(self._balances[user_id])
+
+    async def overlay(self, user_id: int, data: dict) -> dict:
+        """Return `data`, a user document, with its currencies replaced by the balances.
+
+        `data` is updated in place.
+        """
+
+        data.update(await self.balances(user_id))
+        return data
+
+    def _append(self, user_id: int, currency: str, delta: int, reason: str):
+        self.accounts[user_id]["tail"].append([time.time(), currency, delta, reason])
+        self._balances[user_id][currency] += delta
+        self._dirty.setdefault(user_id, set()).add(currency)
+
+    async def add(self, user_id: int, currency: str, delta: int, reason: str) -> int:
+        """Add `delta` (which can be negative) to the balance.
+
+        Returns the new balance.
+        """
+
+        await self._load(user_id)
+        if delta:
+            self._append(user_id, currency, delta, reason)
+
+        return self._balances[user_id][currency]
+
+    async def spend(self, user_id: int, currency: str, amount: int, reason: str) -> bool:
+        """Remove `amount` from the balance if it is large enough.
+
+        Returns False, without changing the balance, if it is too small.
+        """
+
+        await self._load(user_id)
+        if self._balances[user_id][currency] < amount:
+            return False
+
+        self._append(user_id, currency, -amount, reason)
+        return True
+
+    async def history(self, user_id: int, count: int = 20) -> List[list]:
+        """Return the user's latest `count` entries, newest last."""
+
+        account = await self._load(user_id)
+        return (account["history"] + account["tail"])[-count:]
+
+    def compact(self, account: dict):
+        """Fold the tail of the account into its snapshot."""
+
+        snapshot = account["snapshot"]
+        for _, currency, delta, _ in account["tail"]:
+            snapshot[currency] += delta
+
+        account["history"] = (account["history"] + account["tail"])[-HISTORY_SIZE:]
+        account["tail"] = []
+
+    async def _save(self, user_id: int, account: dict):
+        """Write the tail entries appended since the last save to Config.
+
+        The whole account is written if it was never saved or was compacted.
+        """
+
+        group = self.config.custom(LEDGER, user_id)
+        tail = account["tail"]
+        # Entries appended while saving are left to the next flush.
+        end = len(tail)
+        saved = self._saved[user_id]
+
+        if saved is None:
+            await group.set(
+                {
+                    "snapshot": dict(account["snapshot"]),
+                    "tail": {str(idx): tail[idx] for idx in range(end)},
+                    "history": list(account["history"]),
+                }
+            )
+        else:
+            await asyncio.gather(
+                *[group.set_raw("tail", str(idx), value=tail[idx]) for idx in range(saved, end)]
+            )
+
+        self._saved[user_id] = end
+
+    async def flush(self, store: Optional[SQLiteStore] = None) -> int:
+        """Save changed ledgers to Config, compacting long tails.
+
+        Changed balances are also written to `store`. Ledgers which had no
+        changes since the previous flush are removed from memory. Returns
+        the number of users saved.
+        """
+
+        async with self._lock:
+            dirty = self._dirty
+            self._dirty = {}
+
+            changed: Dict[int, Dict[str, int]] = {}
+            for user_id, currencies in dirty.items():
+                account = self.accounts.get(user_id)
+                if account is None:
+                    continue
+                if len(account["tail"]) >= TAIL_SIZE:
+                    self.compact(account)
+                    self._saved[user_id] = None
+                await self._save(user_id, account)
+
+                balances = self._balances[user_id]
+                changed[user_id] = {currency: balances[currency] for currency in currencies}
+
+            if store is not None and changed:
+                await store.set_balances(changed)
+
+            for user_id in [
+                user_id for user_id in self.accounts
+                if user_id not in dirty and user_id not in self._dirty
+            ]:
+                del self.accounts[user_id]
+                del self._balances[user_id]
+                del self._saved[user_id]
+
+        return len(dirty)
+
+    async def clear(self, user_id: int):
+        """Remove the user's ledger, waiting for a flush in progress to finish."""
+
+        async with self._lock:
+            self.accounts.pop(user_id, None)
+            self._balances.pop(user_id, None)
+            self._dirty.pop(user_id, None)
+            self._saved.pop(user_id, None)
+            await self.config.custom(LEDGER, user_id).clear()
@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from typing import List
+
+
+class LookupTables:
+    """Sorted threshold tables compiled from the bundled game data.
+
+    Each lookup is a single binary search over the thresholds instead of a
+    scan of the data.
+
+    Parameters
+    -------------
+    rewards: `dict`
+        Data of `rewards.json`.
+    ranks: `dict`
+        Data of `ranks.json`.
+    leagues: `dict`
+        Data of `leagues.json`.
+    trophy_road: `dict`
+        Data of `trophy_road.json`.
+    """
+
+    def __init__(self, rewards: dict, ranks: dict, leagues: dict, trophy_road: dict):
+        self.rewards = rewards
+
+        # Reward bands are named "start-end" or "start+".
+        self.reward_bands: List[str] = sorted(
+            rewards["3v3"], key=lambda band: int(band.rstrip("+").split("-")[0])
+        )
+        self.reward_starts: List[int] = [
+            int(band.rstrip("+").split("-")[0]) for band in self.reward_bands
+        ]
+
+        # Rank covers trophies from `ProgressStart` to `ProgressStart + Progress`,
+        # exclusive. Ranks are contiguous, so only start and end are needed.
+        rank_list = sorted(ranks, key=lambda rank: ranks[rank]["ProgressStart"])
+        self.ranks: List[int] = [int(rank) for rank in rank_list]
+        self.rank_starts: List[int] = [
+            ranks[rank]["ProgressStart"] for rank in rank_list
+        ]
+        self.ranks_end: int = (
+            ranks[rank_list[-1]]["ProgressStart"] + ranks[rank_list[-1]]["Progress"]
+        )
+
+        # League covers trophies up to `ProgressStart + Progress`, inclusive.
+        # The last league has no upper bound.
+        league_list = sorted(leagues, key=lambda league: leagues[league]["ProgressStart"])
+        self.leagues: List[str] = [
+            leagues[league]["League"] for league in league_list
+        ]
+        self.league_ends: List[int] = [
+            leagues[league]["ProgressStart"] + leagues[league]["Progress"]
+            for league in league_list
+            # end = 14000 for Star V
+            if leagues[league]["ProgressStart"] + leagues[league]["Progress"] != 14000
+        ]
+
+        self.trophy_road_tiers: List[str] = sorted(
+            trophy_road, key=lambda tier: trophy_road[tier]["Trophies"]
+        )
+        self.trophy_road_thresholds: List[int] = [
+            trophy_road[tier]["Trophies"] for tier in self.trophy_road_tiers
+        ]
+
+    def reward_band(self, trophies: int) -> str:
+        """Return name of the reward band of the trophies."""
+
+        idx = bisect_right(self.reward_starts, trophies) - 1
+        if idx < 0:
+            return self.reward_bands[-1]
+
+        return self.reward_bands[idx]
+
+    def reward(self, trophies: int, game_type="3v3", position=1) -> int:
+        """Return reward trophies for the position in the game type."""
+
+        return self.rewards[game_type][self.reward_band(trophies)][position]
+
+    def rank(self, pb: int) -> int:
+        """Return rank of the Brawler based on its personal best."""
+
+        if pb < self.rank_starts[0] or pb >= self.ranks_end:
+            return 35
+
+        return self.ranks[bisect_right(self.rank_starts, pb) - 1]
+
+    def league(self, trophies: int) -> str:
+        """Return name of the league of the trophies."""
+
+        if trophies < 0:
+            return self.leagues[-1]
+
+        idx = bisect_left(self.league_ends, trophies)
+        if idx == len(self.league_ends):
+            return self.leagues[-1]
+
+        return self.leagues[idx]
+
+    def trophy_road_reached(self, trophies: int) -> List[str]:
+        """Return trophy road tiers with threshold lower than the trophies."""
+
+        return self.trophy_road_tiers[:bisect_left(self.trophy_road_thresholds, trophies)]
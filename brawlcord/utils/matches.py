@@ -0,0 +1,122 @@
+import time
+from typing import Any, Dict, List, Optional
+
+
+class Match:
+    """Represents a brawl in progress.
+
+    Parameters
+    -------------
+    game: `Any`
+        The game mode instance running the brawl.
+    user_ids: `List[int]`
+        IDs of the users in the brawl.
+
+    Attributes
+    -------------
+    game: `Any`
+        The game mode instance running the brawl.
+    user_ids: `List[int]`
+        IDs of the users in the brawl.
+    started: `float`
+        Monotonic time at which the brawl started.
+    last_activity: `float`
+        Monotonic time of the last move or event of the brawl.
+    """
+
+    __slots__ = ("game", "user_ids", "started", "last_activity")
+
+    def __init__(self, game: Any, user_ids: List[int]):
+        self.game = game
+        self.user_ids = user_ids
+        self.started = time.monotonic()
+        self.last_activity = self.started
+
+    def touch(self):
+        """Record activity in the brawl."""
+
+        self.last_activity = time.monotonic()
+
+
+class MatchRegistry:
+    """Registry of brawls in progress, keyed by user ID.
+
+    Parameters
+    -------------
+    stale_after: `float`
+        Seconds without activity after which a brawl is considered stale
+        and its users are freed by `reap`.
+
+    Attributes
+    -------------
+    peak: `int`
+        Highest number of brawls in progress at the same time.
+    started: `int`
+        Number of brawls started.
+    reaped: `int`
+        Number of stale brawls freed by `reap`.
+    """
+
+    def __init__(self, stale_after: float):
+        self.stale_after = stale_after
+
+        self._matches: Dict[int, Match] = {}
+        self._active: Dict[int, Match] = {}  # keyed by `id(match)`
+
+        self.peak = 0
+        self.started = 0
+        self.reaped = 0
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._matches
+
+    def __len__(self) -> int:
+        """Return number of brawls in progress."""
+
+        return len(self._active)
+
+    def get(self, user_id: int) -> Optional[Match]:
+        """Return brawl of the user or None if the user is not in a brawl."""
+
+        return self._matches.get(user_id)
+
+    def start(self, game: Any, *user_ids: int) -> Match:
+        """Register a brawl between the users and return it."""
+
+        match = Match(game, list(user_ids))
+        for user_id in user_ids:
+            self._matches[user_id] = match
+        self._active[id(match)] = match
+
+        self.started += 1
+        self.peak = max(self.peak, len(self._active))
+
+        return match
+
+    def end(self, match: Match):
+        """Remove the brawl from the registry.
+
+        Users who have started another brawl since are not affected.
+        """
+
+        for user_id in match.user_ids:
+            if self._matches.get(user_id) is match:
+                del self._matches[user_id]
+        self._active.pop(id(match), None)
+
+    def reap(self) -> List[Match]:
+        """Remove brawls with no activity for `stale_after` seconds.
+
+        Returns the removed brawls.
+        """
+
+        now = time.monotonic()
+        stale = [
+            match for match in self._active.values()
+            if now - match.last_activity > self.stale_after
+        ]
+        for match in stale:
+            self.end(match)
+
+        self.reaped += len(stale)
+        return stale
@@ -0,0 +1,330 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from .matches import Match, MatchRegistry
+from .metrics import LatencyHistogram
+
+# Trophies a power level of the selected Brawler is worth in the rating.
+LEVEL_RATING = 50
+# Largest rating difference accepted for players who have just joined.
+BASE_WINDOW = 50
+# Increase of the accepted rating difference per second of waiting.
+WINDOW_GROWTH = 20
+# Largest rating difference accepted, however long players have waited.
+MAX_WINDOW = 600
+# Seconds after which a waiting player brawls a bot instead.
+BOT_DEADLINE = 30
+
+
+def rating(trophies: int, level: int) -> int:
+    """Return matchmaking rating of a Brawler."""
+
+    return trophies + LEVEL_RATING * (level - 1)
+
+
+def window(waited: float) -> float:
+    """Return the largest rating difference accepted after waiting `waited` seconds."""
+
+    return min(BASE_WINDOW + WINDOW_GROWTH * waited, MAX_WINDOW)
+
+
+class Ticket:
+    """A player waiting in the matchmaking queue.
+
+    Attributes
+    -------------
+    user: `Any`
+        The waiting user.
+    game_mode: `str`
+        Game mode the user wants to brawl in.
+    rating: `int`
+        Rating of the user's selected Brawler, see `rating`.
+    joined: `float`
+        Monotonic time at which the user joined the queue.
+    future: `asyncio.Future`
+        Resolved with the opponent's ticket, or None if the deadline passed.
+    host: `bool`
+        Whether the user runs the brawl. Set when an opponent is found.
+    match: `Optional[Match]`
+        Brawl both users were registered in when an opponent was found.
+    """
+
+    __slots__ = ("user", "game_mode", "rating", "joined", "future", "host", "match")
+
+    def __init__(self, user: Any, game_mode: str, rating: int):
+        self.user = user
+        self.game_mode = game_mode
+        self.rating = rating
+        self.joined = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_event_loop().create_future()
+        self.host = False
+        self.match: Optional[Match] = None
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.rating, self.user.id
+
+
+class ModeQueue:
+    """Tickets waiting to brawl in one game mode, sorted by rating.
+
+    Adding and removing a ticket and finding the closest opponents of a
+    player take logarithmic time.
+    """
+
+    def __init__(self):
+        self.tickets: Dict[int, Ticket] = {}
+
+        # `(rating, user_id)` tuples.
+        self._entries = SortedList()
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def __iter__(self) -> Iterator[Ticket]:
+        """Iterate over the tickets, lowest rating first."""
+
+        for _, user_id in list(self._entries):
+            yield self.tickets[user_id]
+
+    def __contains__(self, ticket: Ticket) -> bool:
+        return self.tickets.get(ticket.user.id) is ticket
+
+    def add(self, ticket: Ticket):
+        self.tickets[ticket.user.id] = ticket
+        self._entries.add(ticket.key)
+
+    def remove(self, ticket: Ticket):
+        if ticket not in self:
+            return
+        del self.tickets[ticket.user.id]
+        self._entries.remove(ticket.key)
+
+    def _at(self, pos: int) -> Optional[Ticket]:
+        if 0 <= pos < len(self._entries):
+            return self.tickets[self._entries[pos][1]]
+        return None
+
+    def neighbours(self, ticket: Ticket) -> Tuple[Optional[Ticket], Optional[Ticket]]:
+        """Return the tickets with the closest lower and higher ratings, or None.
+
+        `ticket` itself is skipped if it is in the queue.
+        """
+
+        idx = self._entries.bisect_left(ticket.key)
+        after = idx + 1 if ticket in self else idx
+        return self._at(idx - 1), self._at(after)
+
+
+class MatchmakingQueue:
+    """Queues of players waiting for an opponent, one per game mode.
+
+    A player is paired with the waiting player of the same game mode whose
+    rating is closest to theirs, if the difference is within the window of
+    the longer waiting of the two. Windows widen the longer players wait,
+    so `sweep` is called periodically to pair players whose windows have
+    grown and to send players who waited `BOT_DEADLINE` seconds to a bot.
+
+    Neither is a scan of the queues. Tickets expire in the order they
+    joined, so `sweep` only looks at the oldest ones. Players who are
+    neighbours by rating have their pairing scheduled at the time their
+    window will cover the difference, and `sweep` pairs those which are
+    due and still neighbours.
+
+    Paired users are registered in `matches` right away, so neither can
+    start another brawl before the host's brawl begins.
+
+    Parameters
+    -------------
+    matches: `MatchRegistry`
+        Registry of brawls in progress.
+
+    Attributes
+    -------------
+    queues: `Dict[str, ModeQueue]`
+        Waiting players of each game mode.
+    waits: `LatencyHistogram`
+        Time players waited before finding an opponent or a bot, in ms.
+    matched: `int`
+        Number of pairs of players matched.
+    bot_fallbacks: `int`
+        Number of players who brawled a bot after the deadline.
+    """
+
+    def __init__(self, matches: MatchRegistry):
+        self.matches = matches
+
+        self.queues: Dict[str, ModeQueue] = {}
+        self._users: Dict[int, Ticket] = {}
+
+        # Tickets in the order they joined, which is also their deadline order.
+        # Tickets which have left are skipped when they reach the front.
+        self._expiry: Deque[Ticket] = deque()
+        # Heap of `(due, seq, lower, higher)` pairings of neighbours. Pairings
+        # of tickets which have left or are no longer neighbours are skipped.
+        self._pairings: List[Tuple[float, int, Ticket, Ticket]] = []
+        self._seq = itertools.count()
+
+        self.waits = LatencyHistogram()
+        self.matched = 0
+        self.bot_fallbacks = 0
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._users
+
+    def __len__(self) -> int:
+        """Return number of waiting players."""
+
+        return len(self._users)
+
+    def _acceptable(self, first: Ticket, second: Ticket, now: float) -> bool:
+        waited = now - min(first.joined, second.joined)
+        return abs(first.rating - second.rating) <= window(waited)
+
+    def _schedule(self, lower: Optional[Ticket], higher: Optional[Ticket]):
+        """Schedule pairing of neighbours at the time their window covers their difference."""
+
+        if lower is None or higher is None:
+            return
+
+        difference = abs(higher.rating - lower.rating)
+        if difference > MAX_WINDOW:
+            return
+
+        due = min(lower.joined, higher.joined) + max(0, (difference - BASE_WINDOW) / WINDOW_GROWTH)
+        heapq.heappush(self._pairings, (due, next(self._seq), lower, higher))
+
+    def _remove(self, ticket: Ticket):
+        """Remove the ticket from its queue and schedule its former neighbours."""
+
+        queue = self.queues[ticket.game_mode]
+        if ticket in queue:
+            lower, higher = queue.neighbours(ticket)
+            queue.remove(ticket)
+            self._schedule(lower, higher)
+        if self._users.get(ticket.user.id) is ticket:
+            del self._users[ticket.user.id]
+
+    def _leave(self, ticket: Ticket, now: float):
+        self._remove(ticket)
+        self.waits.add((now - ticket.joined) * 1000)
+
+    def _pair(self, host: Ticket, guest: Ticket, now: float):
+        for ticket in (host, guest):
+            self._leave(ticket, now)
+        host.host = True
+        host.match = guest.match = self.matches.start(None, host.user.id, guest.user.id)
+        host.future.set_result(guest)
+        guest.future.set_result(host)
+        self.matched += 1
+
+    def join(self, user: Any, game_mode: str, rating: int) -> Ticket:
+        """Add the user to the queue of the game mode.
+
+        The user is paired right away if a suitable opponent is waiting.
+        Await the ticket's `future` for the opponent.
+        """
+
+        ticket = Ticket(user, game_mode, rating)
+        queue = self.queues.setdefault(game_mode, ModeQueue())
+
+        now = ticket.joined
+        candidates = [
+            other for other in queue.neighbours(ticket)
+            if other is not None and not other.future.done()
+            and self._acceptable(ticket, other, now)
+        ]
+        if candidates:
+            opponent = min(candidates, key=lambda other: abs(other.rating - rating))
+            # The player who waited longer runs the brawl.
+            self._pair(opponent, ticket, now)
+        else:
+            queue.add(ticket)
+            self._users[user.id] = ticket
+            self._expiry.append(ticket)
+
+            lower, higher = queue.neighbours(ticket)
+            self._schedule(lower, ticket)
+            self._schedule(ticket, higher)
+
+        return ticket
+
+    def leave(self, ticket: Ticket):
+        """Remove the ticket from the queue, e.g. when its command is cancelled."""
+
+        if self._users.get(ticket.user.id) is ticket:
+            self._remove(ticket)
+
+    def sweep(self, now: float = None):
+        """Expire tickets past the deadline and pair players whose windows have widened.
+
+        `now` is the monotonic time to sweep at, the current time by default.
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        expiry = self._expiry
+        while expiry:
+            ticket = expiry[0]
+            if self._users.get(ticket.user.id) is not ticket:
+                # Paired or left the queue.
+                expiry.popleft()
+            elif ticket.future.done():
+                # The waiting command was cancelled.
+                expiry.popleft()
+                self.leave(ticket)
+            elif now - ticket.joined >= BOT_DEADLINE:
+                expiry.popleft()
+                self._leave(ticket, now)
+                ticket.future.set_result(None)
+                self.bot_fallbacks += 1
+            else:
+                break
+
+        pairings = self._pairings
+        while pairings and pairings[0][0] <= now:
+            _, _, lower, higher = heapq.heappop(pairings)
+            queue = self.queues[lower.game_mode]
+            if lower not in queue or higher not in queue or queue.neighbours(lower)[1] is not higher:
+                continue
+            if lower.future.done() or higher.future.done():
+                continue
+
+            if lower.joined <= higher.joined:
+                self._pair(lower, higher, now)
+            else:
+                self._pair(higher, lower, now)
+
+    def close(self):
+        """Cancel all waiting tickets."""
+
+        for ticket in self._users.values():
+            ticket.future.cancel()
+        self._users.clear()
+        self.queues.clear()
+        self._expiry.clear()
+        self._pairings.clear()
+
+    def table(self) -> str:
+        """Return queue depths and wait times formatted as a table."""
+
+        lines = [f"{'Game Mode':<16}{'Waiting':>9}", "-" * 25]
+        for game_mode, queue in sorted(self.queues.items()):
+            lines.append(f"{game_mode:<16}{len(queue):>9,}")
+
+        waits = self.waits
+        lines.append(
+            f"\nMatched: {self.matched:,} pairs"
+            f"\nBot fallbacks: {self.bot_fallbacks:,}"
+            f"\nWait (s): p50 {waits.percentile(50) / 1000:.1f},"
+            f" p95 {waits.percentile(95) / 1000:.1f}, max {waits.max / 1000:.1f}"
+        )
+
+        return "\n".join(lines)
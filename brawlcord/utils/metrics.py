@@ -0,0 +1,212 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+from redbot.core import Config
+
+# Upper bounds of the latency histogram buckets in milliseconds, from 0.5 ms
+# to about 64 seconds. Slower invocations go in an extra overflow bucket.
+BUCKETS = [0.5 * 1.5 ** idx for idx in range(30)]
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed, exponentially growing buckets.
+
+    Percentiles are approximated by the upper bound of the bucket they
+    fall in, which is within 50% of the actual value.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        """Record a latency in milliseconds."""
+
+        self.counts[bisect_left(BUCKETS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, pct: float) -> float:
+        """Return approximate latency in milliseconds at the percentile."""
+
+        if not self.count:
+            return 0.0
+
+        rank = max(ceil(self.count * pct / 100), 1)
+        cumulative = 0
+        for idx, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                break
+
+        if idx == len(BUCKETS):
+            return self.max
+        return min(BUCKETS[idx], self.max)
+
+
+class CommandStats:
+    """Latencies and Config calls of a command.
+
+    Attributes
+    -------------
+    latency: `LatencyHistogram`
+        Latencies of the command's invocations.
+    reads: `int`
+        Number of Config reads made by the command.
+    writes: `int`
+        Number of Config writes (including deletions) made by the command.
+    """
+
+    __slots__ = ("latency", "reads", "writes")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.reads = 0
+        self.writes = 0
+
+
+# Stats of the command running in the current task and its start time.
+_current: ContextVar[Optional[Tuple[CommandStats, float]]] = ContextVar(
+    "brawlcord_command", default=None
+)
+
+
+class Metrics:
+    """Per-command latency histograms and Config call counters.
+
+    Commands are timed between `start` and `finish`, which are called from
+    the cog's invoke hooks. Config calls are counted by `MeteredDriver` and
+    attributed to the command running in the current task. Calls made
+    outside of commands, e.g. by tasks, are counted in `background`.
+
+    Attributes
+    -------------
+    commands: `Dict[str, CommandStats]`
+        Stats of each command, by qualified name.
+    background: `CommandStats`
+        Config calls made outside of commands.
+    since: `float`
+        Timestamp of the last reset.
+    """
+
+    def __init__(self):
+        self.commands: Dict[str, CommandStats] = {}
+        self.background = CommandStats()
+        self.since = time.time()
+
+    def instrument(self, config: Config):
+        """Count Config calls made through `config`."""
+
+        config.driver = MeteredDriver(config.driver, self)
+
+    def start(self, command: str):
+        """Start timing an invocation of the command in the current task."""
+
+        stats = self.commands.get(command)
+        if stats is None:
+            stats = self.commands[command] = CommandStats()
+
+        _current.set((stats, time.perf_counter()))
+
+    def finish(self):
+        """Record latency of the invocation started in the current task."""
+
+        current = _current.get()
+        if current is None:
+            return
+
+        stats, start = current
+        stats.latency.add((time.perf_counter() - start) * 1000)
+        _current.set(None)
+
+    def current(self) -> CommandStats:
+        """Return stats Config calls should be attributed to."""
+
+        current = _current.get()
+        if current is None:
+            return self.background
+        return current[0]
+
+    def reset(self):
+        """Remove all recorded stats."""
+
+        self.commands = {}
+        self.background = CommandStats()
+        self.since = time.time()
+
+    def table(self) -> str:
+        """Return recorded stats formatted as a table, slowest commands first."""
+
+        header = (
+            f"{'Command':<22}{'Calls':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'Max':>9}"
+            f"{'Reads':>8}{'Writes':>8}"
+        )
+        lines = [header, "-" * len(header)]
+
+        commands = sorted(
+            self.commands.items(), key=lambda item: item[1].latency.percentile(95), reverse=True
+        )
+        for name, stats in commands:
+            latency = stats.latency
+            calls = latency.count or 1
+            lines.append(
+                f"{name[:21]:<22}{latency.count:>7,}"
+                f"{latency.percentile(50):>9.1f}{latency.percentile(95):>9.1f}"
+                f"{latency.percentile(99):>9.1f}{latency.max:>9.1f}"
+                f"{stats.reads / calls:>8.1f}{stats.writes / calls:>8.1f}"
+            )
+
+        lines.append(
+            f"{'(background)':<22}{'':>43}"
+            f"{self.background.reads:>8,}{self.background.writes:>8,}"
+        )
+        lines.append(
+            "\nLatencies in ms. Reads and writes are Config calls per invocation"
+            " (totals for background)."
+        )
+
+        return "\n".join(lines)
+
+
+class MeteredDriver:
+    """Wrapper of a Config driver which counts reads and writes.
+
+    Every Config access of the cog goes through its driver, so wrapping
+    the driver counts all of them, including `async with` blocks which
+    only write when the value has changed.
+
+    Parameters
+    -------------
+    driver: `BaseDriver`
+        The wrapped driver.
+    metrics: `Metrics`
+        Metrics the calls are counted in.
+    """
+
+    def __init__(self, driver, metrics: Metrics):
+        self._driver = driver
+        self._metrics = metrics
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+    async def get(self, *args, **kwargs):
+        self._metrics.current().reads += 1
+        return await self._driver.get(*args, **kwargs)
+
+    async def set(self, *args, **kwargs):
+        self._metrics.current().writes += 1
+        return await self._driver.set(*args, **kwargs)
+
+    async def clear(self, *args, **kwargs):
+        self._metrics.current().writes += 1
+        return await self._driver.clear(*args, **kwargs)
@@ -0,0 +1,223 @@
+import sys
+from array import array
+from typing import Dict, List
+
+# Integer stats of a Brawler, stored in one array each.
+INT_STATS = ("trophies", "pb", "rank", "level", "powerpoints", "total_powerpoints")
+
+# Bits of `BrawlerRecords.sp`.
+SP1 = 1
+SP2 = 2
+
+
+class BrawlerCatalog:
+    """Assigns a fixed ID to every Brawler of `brawlers.json`.
+
+    Catalogs are cached by the data they are built from, see `get`.
+
+    Parameters
+    -------------
+    all_brawlers: `dict`
+        Data of `brawlers.json`.
+
+    Attributes
+    -------------
+    names: `List[str]`
+        Brawler names, indexed by ID.
+    ids: `Dict[str, int]`
+        Brawler IDs, by name.
+    rarities: `List[str]`
+        Brawler rarities, indexed by ID.
+    """
+
+    _catalogs: Dict[int, "BrawlerCatalog"] = {}
+
+    def __init__(self, all_brawlers: dict):
+        self.all_brawlers = all_brawlers
+
+        self.names: List[str] = list(all_brawlers)
+        self.ids: Dict[str, int] = {name: idx for idx, name in enumerate(self.names)}
+        self.rarities: List[str] = [all_brawlers[name]["rarity"] for name in self.names]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def get(cls, all_brawlers: dict) -> "BrawlerCatalog":
+        """Return catalog of the Brawlers, building it the first time."""
+
+        catalog = cls._catalogs.get(id(all_brawlers))
+        # The data can be replaced (and its ID reused) when the cog reloads.
+        if catalog is None or catalog.all_brawlers is not all_brawlers:
+            catalog = cls._catalogs[id(all_brawlers)] = cls(all_brawlers)
+
+        return catalog
+
+
+class BrawlerRecords:
+    """Stats of a user's Brawlers in fixed-layout arrays indexed by catalog ID.
+
+    Converts to and from the `brawlers` dict stored in Config, where each
+    owned Brawler has a copy of `default_stats`.
+
+    Parameters
+    -------------
+    catalog: `BrawlerCatalog`
+        Catalog the arrays are indexed by.
+
+    Attributes
+    -------------
+    owned: `bytearray`
+        1 for Brawlers the user owns, 0 otherwise.
+    trophies, pb, rank, level, powerpoints, total_powerpoints: `array`
+        Integer stats of each Brawler, 0 for Brawlers the user doesn't own.
+    sp: `bytearray`
+        Star Powers of each Brawler, as a combination of `SP1` and `SP2`.
+    skins: `Dict[int, list]`
+        Skins of each owned Brawler, by ID.
+    selected_skin: `Dict[int, str]`
+        Selected skin of each owned Brawler, by ID.
+    unknown: `dict`
+        Stats of Brawlers not in the catalog, kept as they are.
+    """
+
+    __slots__ = (
+        "catalog",
+        "owned",
+        "trophies",
+        "pb",
+        "rank",
+        "level",
+        "powerpoints",
+        "total_powerpoints",
+        "sp",
+        "skins",
+        "selected_skin",
+        "unknown",
+    )
+
+    def __init__(self, catalog: BrawlerCatalog):
+        self.catalog = catalog
+
+        size = len(catalog)
+        self.owned = bytearray(size)
+        for stat in INT_STATS:
+            setattr(self, stat, array("i", bytes(4 * size)))
+        self.sp = bytearray(size)
+        self.skins: Dict[int, list] = {}
+        self.selected_skin: Dict[int, str] = {}
+        self.unknown: dict = {}
+
+    @classmethod
+    def from_dict(cls, catalog: BrawlerCatalog, brawlers: dict) -> "BrawlerRecords":
+        """Return records of the Brawlers in the stored `brawlers` dict."""
+
+        records = cls(catalog)
+        ids = catalog.ids
+
+        for name, stats in brawlers.items():
+            idx = ids.get(name)
+            if idx is None:
+                records.unknown[name] = stats
+                continue
+
+            records.owned[idx] = 1
+            for stat in INT_STATS:
+                getattr(records, stat)[idx] = stats[stat]
+            records.sp[idx] = (SP1 if stats["sp1"] else 0) | (SP2 if stats["sp2"] else 0)
+            records.skins[idx] = stats["skins"]
+            records.selected_skin[idx] = stats["selected_skin"]
+
+        return records
+
+    def to_dict(self) -> dict:
+        """Return the Brawlers in the format stored in Config."""
+
+        brawlers = {}
+        names = self.catalog.names
+
+        for idx, owned in enumerate(self.owned):
+            if not owned:
+                continue
+            stats = {stat: getattr(self, stat)[idx] for stat in INT_STATS}
+            stats["skins"] = self.skins[idx]
+            stats["selected_skin"] = self.selected_skin[idx]
+            stats["sp1"] = bool(self.sp[idx] & SP1)
+            stats["sp2"] = bool(self.sp[idx] & SP2)
+            brawlers[names[idx]] = stats
+
+        brawlers.update(self.unknown)
+
+        return brawlers
+
+    def __contains__(self, brawler: str) -> bool:
+        idx = self.catalog.ids.get(brawler)
+        if idx is None:
+            return brawler in self.unknown
+        return bool(self.owned[idx])
+
+    def total_trophies(self, pb=False) -> int:
+        """Return total trophies (or total personal best) of the Brawlers."""
+
+        return sum(self.pb if pb else self.trophies) + sum(
+            stats["pb" if pb else "trophies"] for stats in self.unknown.values()
+        )
+
+    def can_unlock(self) -> Dict[str, List[str]]:
+        """Return Brawlers the user doesn't own, by rarity.
+
+        Trophy Road Brawlers are not included.
+        """
+
+        can_unlock = {}
+        names = self.catalog.names
+        for idx, rarity in enumerate(self.catalog.rarities):
+            if rarity != "Trophy Road" and not self.owned[idx]:
+                can_unlock.setdefault(rarity, []).append(names[idx])
+
+        return can_unlock
+
+    def can_get_pp(self, max_pp: int) -> Dict[str, int]:
+        """Return power points each Brawler can get before reaching `max_pp`."""
+
+        names = self.catalog.names
+        owned = self.owned
+
+        return {
+            names[idx]: max_pp - total
+            for idx, total in enumerate(self.total_powerpoints)
+            if owned[idx] and total < max_pp
+        }
+
+    def can_get_sp(self) -> Dict[str, List[str]]:
+        """Return Star Powers each Brawler of level 9 or higher can get."""
+
+        can_get_sp = {}
+        names = self.catalog.names
+        owned = self.owned
+        sp = self.sp
+
+        for idx, level in enumerate(self.level):
+            if level < 9 or not owned[idx] or sp[idx] == SP1 | SP2:
+                continue
+            can_get_sp[names[idx]] = [
+                key for key, bit in (("sp1", SP1), ("sp2", SP2)) if not sp[idx] & bit
+            ]
+
+        return can_get_sp
+
+    def memory_usage(self) -> int:
+        """Return approximate memory used by the records in bytes.
+
+        The catalog and strings shared with it are not included.
+        """
+
+        size = sys.getsizeof(self) + sys.getsizeof(self.owned) + sys.getsizeof(self.sp)
+        for stat in INT_STATS:
+            size += sys.getsizeof(getattr(self, stat))
+        size += sys.getsizeof(self.skins) + sys.getsizeof(self.selected_skin)
+        for skins in self.skins.values():
+            size += sys.getsizeof(skins)
+        size += sys.getsizeof(self.unknown)
+
+        return size
@@ -0,0 +1,112 @@
+import asyncio
+
+import discord
+from redbot.core import Config
+
+
+class PlayerSession:
+    """Write-back cache of a single user's data.
+
+    The user document is loaded with a single Config call. All the reward
+    helpers then read and mutate it in memory and `commit` writes back only
+    the top level keys which were changed, so writes made to other keys of
+    the user between `load` and `commit` are kept.
+
+    Parameters
+    -------------
+    config: `Config`
+        The cog's Config object.
+    user: `discord.User`
+        The user the session belongs to.
+    data: `dict`
+        The user document, as returned by `config.user(user).all()`.
+
+    Attributes
+    -------------
+    user: `discord.User`
+        The user the session belongs to.
+    data: `dict`
+        The in-memory user document.
+    reads: `int`
+        Number of Config calls made to read data.
+    writes: `int`
+        Number of Config calls made to write data.
+    """
+
+    def __init__(self, config: Config, user: discord.User, data: dict):
+        self.config = config
+        self.user = user
+        self.data = data
+
+        self.reads = 1
+        self.writes = 0
+
+        # Top level keys which have been changed since the last commit.
+        self._dirty = set()
+
+    @classmethod
+    async def load(cls, config: Config, user: discord.User):
+        """Return a `PlayerSession` with the user document loaded."""
+
+        data = await config.user(user).all()
+
+        return cls(config, user, data)
+
+    def __getitem__(self, key: str):
+        return self.data[key]
+
+    def __setitem__(self, key: str, value):
+        self.data[key] = value
+        self._dirty.add(key)
+
+    def add(self, key: str, value):
+        """Add `value` to the stat stored at `key`."""
+
+        self[key] = self.data[key] + value
+
+    def mark_dirty(self, key: str):
+        """Mark `key` as changed after mutating it in place."""
+
+        self._dirty.add(key)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the session has uncommitted changes."""
+
+        return bool(self._dirty)
+
+    @property
+    def selected_brawler(self) -> str:
+        return self.data["selected"]["brawler"]
+
+    def brawler(self, brawler_name: str) -> dict:
+        """Return data of a Brawler owned by the user.
+
+        The returned dict can be mutated in place. Call `mark_dirty("brawlers")`
+        after doing so.
+        """
+
+        return self.data["brawlers"][brawler_name]
+
+    def trophies(self, pb=False) -> int:
+        """Return total trophies (or total personal best) of the user."""
+
+        stat = "trophies" if not pb else "pb"
+        brawlers = self.data["brawlers"]
+
+        return sum([brawlers[brawler][stat] for brawler in brawlers])
+
+    async def commit(self):
+        """Write the changed top level keys back to Config, one call per key."""
+
+        if not self._dirty:
+            return
+
+        dirty = self._dirty
+        self._dirty = set()
+
+        group = self.config.user(self.user)
+        await asyncio.gather(
+            *[group.set_raw(key, value=self.data[key]) for key in dirty]
+        )
+        self.writes += len(dirty)
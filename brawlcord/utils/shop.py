@@ -8,7 +8,9 @@ from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.predicates import ReactionPredicate
 
 from .box import Box
+from .brawlers import BrawlerRegistry
 from .emojis import emojis, brawler_emojis, sp_icons
+from .ledger import Ledger
 
 EMBED_COLOR = 0x74FFBE
 
@@ -16,7 +18,7 @@ EMBED_COLOR = 0x74FFBE
 class Shop:
     """Class for representing daily shop."""
 
-    def __init__(self, all_brawlers=None, brawlers_data=None):
+    def __init__(self, registry: BrawlerRegistry = None, brawlers_data=None):
         self.max_slots = 6
         self.max_skins = (4, 2)  # 4 gem and 2 starpoint skins
         self.shop_items = {}
@@ -32,7 +34,7 @@ class Shop:
         # number of powerpoints required to max
         self.max_pp = 1410
 
-        self.ALL_BRAWLERS = all_brawlers
+        self.registry = registry
         self.BRAWLERS_DATA = brawlers_data
 
         self.can_get_pp = {}
@@ -40,7 +42,7 @@ class Shop:
 
         if brawlers_data:
             for brawler in brawlers_data:
-                if brawler not in all_brawlers:
+                if brawler not in registry:
                     continue
 
                 total_powerpoints = brawlers_data[brawler]['total_powerpoints']
@@ -95,7 +97,7 @@ class Shop:
             sp_chance = random.randint(0, 99)
             if sp_chance in range(0, self.items["brawlbox"][1]):
                 sp_brawler, sp = self.get_starpower()
-                sp_name = self.ALL_BRAWLERS[sp_brawler][sp]["name"]
+                sp_name = self.registry.star_power(sp_brawler, sp).name
                 total += 1
                 shop_items["starpowers"].append({
                     "quantity": 1,
@@ -125,7 +127,7 @@ class Shop:
                 sp_chance = random.randint(0, 99)
                 if sp_chance in range(0, self.items["brawlbox"][1]):
                     sp_brawler, sp = self.get_starpower()
-                    sp_name = self.ALL_BRAWLERS[sp_brawler][sp]["name"]
+                    sp_name = self.registry.star_power(sp_brawler, sp).name
                     shop_items["starpowers"].append({
                         "quantity": 1,
                         "cost": 2000,
@@ -200,21 +202,12 @@ class Shop:
 
         for brawler in self.BRAWLERS_DATA:
             owned = self.BRAWLERS_DATA[brawler]["skins"]
-            brawler_skins = self.ALL_BRAWLERS[brawler]["skins"]
-            for skin in brawler_skins:
+            for skin, cost in self.registry.gem_skins.get(brawler, ()):
                 if skin not in owned:
-                    if brawler_skins[skin][0] != -1:
-                        gem_skins.append({
-                            "skin": skin,
-                            "brawler": brawler,
-                            "cost": brawler_skins[skin][0]
-                        })
-                    elif brawler_skins[skin][1] != -1:
-                        sp_skins.append({
-                            "skin": skin,
-                            "brawler": brawler,
-                            "cost": brawler_skins[skin][1]
-                        })
+                    gem_skins.append({"skin": skin, "brawler": brawler, "cost": cost})
+            for skin, cost in self.registry.starpoint_skins.get(brawler, ()):
+                if skin not in owned:
+                    sp_skins.append({"skin": skin, "brawler": brawler, "cost": cost})
 
         random.shuffle(gem_skins)
         random.shuffle(sp_skins)
@@ -433,8 +426,9 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        brawlers: dict,
-        item_number: int
+        registry: BrawlerRegistry,
+        item_number: int,
+        ledger: Ledger
     ):
         """Function to handle shop purchases."""
 
@@ -448,7 +442,7 @@ class Shop:
                 ):
                     return
                 found = True
-                await self.buy_brawlbox(ctx, user, config, brawlers)
+                await self.buy_brawlbox(ctx, user, config, registry, ledger)
                 self.shop_items["brawlbox"]["cost"] = "Claimed!"
 
         # check for tickets
@@ -460,7 +454,7 @@ class Shop:
                     ):
                         return
                     found = True
-                    await self.buy_ticket(ctx, user, config)
+                    await self.buy_ticket(ctx, user, config, ledger)
                     self.shop_items["tickets"]["cost"] = "Claimed!"
 
         # check for power point
@@ -471,7 +465,7 @@ class Shop:
                         return
                     found = True
                     if not await self.buy_powerpoint(
-                        ctx, user, config, item
+                        ctx, user, config, item, ledger
                     ):
                         return
                     item["cost"] = "Bought!"
@@ -484,7 +478,7 @@ class Shop:
                         return
                     found = True
                     if not await self.buy_starpower(
-                        ctx, user, config, item
+                        ctx, user, config, item, ledger
                     ):
                         return
                     item["cost"] = "Bought!"
@@ -504,13 +498,14 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        brawlers: dict
+        registry: BrawlerRegistry,
+        ledger: Ledger
     ):
         brawler_data = await config.user(user).brawlers()
 
-        box = Box(brawlers, brawler_data)
+        box = Box(registry, brawler_data)
         try:
-            embed = await box.brawlbox(config.user(user), user)
+            embed = await box.brawlbox(config.user(user), user, ledger)
         except Exception as exc:
             return await ctx.send(
                 f"Error \"{exc}\" while opening a Brawl Box."
@@ -529,12 +524,12 @@ class Shop:
         self,
         ctx: Context,
         user: discord.User,
-        config: Config
+        config: Config,
+        ledger: Ledger
     ):
         quantity = self.shop_items["tickets"]["quantity"]
 
-        old = await config.user(user).tickets()
-        await config.user(user).tickets.set(old+quantity)
+        await ledger.add(user.id, "tickets", quantity, "shop")
 
         await ctx.send(f"You recieved {quantity} {emojis['ticket']}!")
 
@@ -543,13 +538,14 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        item_data: dict
+        item_data: dict,
+        ledger: Ledger
     ):
         brawler = item_data["brawler"]
         quantity = item_data["quantity"]
         cost = item_data["cost"]
 
-        gold = await config.user(user).gold()
+        gold = await ledger.balance(user.id, "gold")
 
         if gold < cost:
             await ctx.send(
@@ -573,12 +569,14 @@ class Shop:
             await ctx.send("Purchase cancelled.")
             return False
 
+        if not await ledger.spend(user.id, "gold", cost, "shop"):
+            await ctx.send("You do not have enough gold!")
+            return False
+
         async with config.user(user).brawlers() as brawlers:
             brawlers[brawler]['powerpoints'] += quantity
             brawlers[brawler]['total_powerpoints'] += quantity
 
-        await config.user(user).gold.set(gold-cost)
-
         await ctx.send(f"Bought {quantity} {brawler} power points!")
 
         return True
@@ -588,14 +586,15 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        item_data: dict
+        item_data: dict,
+        ledger: Ledger
     ):
         brawler = item_data["brawler"]
         cost = item_data["cost"]
         sp = item_data["sp"]
         sp_name = item_data["sp_name"]
 
-        gold = await config.user(user).gold()
+        gold = await ledger.balance(user.id, "gold")
 
         if gold < cost:
             await ctx.send(
@@ -619,12 +618,14 @@ class Shop:
             await ctx.send("Purchase cancelled.")
             return False
 
+        if not await ledger.spend(user.id, "gold", cost, "shop"):
+            await ctx.send("You do not have enough gold!")
+            return False
+
         async with config.user(user).brawlers() as brawlers:
             brawlers[brawler]["level"] = 10
             brawlers[brawler][sp] = True
 
-        await config.user(user).gold.set(gold-cost)
-
         await ctx.send(f"Bought {sp_name} Star Power!")
 
         return True
@@ -634,8 +635,9 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        brawlers: dict,
-        item_number: int
+        registry: BrawlerRegistry,
+        item_number: int,
+        ledger: Ledger
     ):
         """Function to handle shop purchases."""
 
@@ -648,7 +650,7 @@ class Shop:
                     return
                 found = True
                 if not await self.buy_gem_skin(
-                    ctx, user, config, item
+                    ctx, user, config, item, ledger
                 ):
                     return
                 item["cost"] = "Bought!"
@@ -661,7 +663,7 @@ class Shop:
                         return
                     found = True
                     if not await self.buy_star_skin(
-                        ctx, user, config, item
+                        ctx, user, config, item, ledger
                     ):
                         return
                     item["cost"] = "Bought!"
@@ -681,13 +683,14 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        item_data: dict
+        item_data: dict,
+        ledger: Ledger
     ):
         brawler = item_data["brawler"]
         cost = item_data["cost"]
         skin = item_data["skin"]
 
-        gems = await config.user(user).gems()
+        gems = await ledger.balance(user.id, "gems")
 
         if gems < cost:
             await ctx.send(
@@ -711,11 +714,13 @@ class Shop:
             await ctx.send("Purchase cancelled.")
             return False
 
+        if not await ledger.spend(user.id, "gems", cost, "shop"):
+            await ctx.send("You do not have enough gems!")
+            return False
+
         async with config.user(user).brawlers() as brawlers:
             brawlers[brawler]["skins"].append(skin)
 
-        await config.user(user).gems.set(gems-cost)
-
         await ctx.send(f"Bought {skin} {brawler} skin!")
 
         return True
@@ -725,13 +730,14 @@ class Shop:
         ctx: Context,
         user: discord.User,
         config: Config,
-        item_data: dict
+        item_data: dict,
+        ledger: Ledger
     ):
         brawler = item_data["brawler"]
         cost = item_data["cost"]
         skin = item_data["skin"]
 
-        starpoints = await config.user(user).starpoints()
+        starpoints = await ledger.balance(user.id, "starpoints")
 
         if starpoints < cost:
             await ctx.send(
@@ -755,11 +761,13 @@ class Shop:
             await ctx.send("Purchase cancelled.")
             return False
 
+        if not await ledger.spend(user.id, "starpoints", cost, "shop"):
+            await ctx.send("You do not have enough star points!")
+            return False
+
         async with config.user(user).brawlers() as brawlers:
             brawlers[brawler]["skins"].append(skin)
 
-        await config.user(user).starpoints.set(starpoints-cost)
-
         await ctx.send(f"Bought {skin} {brawler} skin!")
 
         return True
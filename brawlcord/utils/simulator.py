@@ -0,0 +1,432 @@
+"""Monte Carlo simulator for box openings.
+
+Opens a large number of boxes against a user's Brawler data in one batch,
+using the same odds and rules as `Box`. NumPy is required to run the
+simulator, but not to use the rest of the cog.
+
+It can be run from the command line:
+
+    python -m brawlcord.utils.simulator bigbox --boxes 1000000 --profile data.zip
+
+`--profile` takes a file exported with the `getdata` command, joined if it
+was sent in parts. Without it, a new account which only owns Shelly is used.
+
+`expected` computes the average gold, power points, Brawlers and Star
+Powers of a box exactly from the same odds, without NumPy. It is cheap
+enough to run for every `drops` command.
+"""
+
+import argparse
+import json
+import time
+import zipfile
+from math import comb
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .constants import (
+    BOX_GEMS_ODDS,
+    BOX_ODDS,
+    BOX_TD_ODDS,
+    BOX_TICKETS_ODDS,
+    BOXES,
+    default_stats
+)
+
+# number of powerpoints required to max
+MAX_PP = 1410
+
+RARITIES = ["Rare", "Super Rare", "Epic", "Mythic", "Legendary"]
+
+# Boxes are simulated in chunks to keep the memory use of power point
+# splits bounded.
+CHUNK_SIZE = 20_000
+
+
+class BoxProfile:
+    """What a box can give to a user, computed like `Box.__init__` does.
+
+    Parameters
+    -------------
+    all_brawlers: `dict`
+        Data of `brawlers.json`.
+    brawler_data: `dict`
+        Brawlers owned by the user.
+
+    Attributes
+    -------------
+    unlockable: `Dict[str, int]`
+        Number of Brawlers the user can unlock, by rarity.
+    pp_thresholds: `List[int]`
+        Power points each Brawler can still get before being maxed.
+    can_get_sp: `bool`
+        Whether the user can get a Star Power.
+    """
+
+    def __init__(self, all_brawlers: dict, brawler_data: dict):
+        self.unlockable = {rarity: 0 for rarity in RARITIES}
+        for brawler in all_brawlers:
+            rarity = all_brawlers[brawler]["rarity"]
+            if rarity != "Trophy Road" and brawler not in brawler_data:
+                self.unlockable[rarity] += 1
+
+        self.pp_thresholds = []
+        self.can_get_sp = False
+        for brawler in brawler_data:
+            if brawler not in all_brawlers:
+                continue
+
+            total_powerpoints = brawler_data[brawler]["total_powerpoints"]
+            if total_powerpoints < MAX_PP:
+                self.pp_thresholds.append(MAX_PP - total_powerpoints)
+
+            if brawler_data[brawler]["level"] >= 9:
+                if not (brawler_data[brawler]["sp1"] and brawler_data[brawler]["sp2"]):
+                    self.can_get_sp = True
+
+    def resolve_rarity(self, rarity: str) -> Optional[str]:
+        """Return rarity a draw resolves to, like `Box.check_rarity`.
+
+        None is returned if no Brawler of the rarity or a lower one can
+        be unlocked.
+        """
+
+        idx = RARITIES.index(rarity)
+        while idx >= 0:
+            if self.unlockable[RARITIES[idx]]:
+                return RARITIES[idx]
+            idx -= 1
+
+        return None
+
+
+def _weighted_random(rng, lower: int, upper: int, avg: int, size: int):
+    """Vectorized `Box.weighted_random`."""
+
+    avg_low = (avg + lower) / 2
+    avg_high = (upper + avg) / 2
+
+    p_high = (avg - avg_low) / (avg_high - avg_low)
+
+    high = rng.random(size) < p_high
+
+    return np.where(
+        high,
+        rng.integers(avg, upper, size, endpoint=True),
+        rng.integers(lower, avg, size, endpoint=True)
+    )
+
+
+def _split_in_integers(rng, totals, parts, max_parts: int, max_total: int):
+    """Vectorized `Box.split_in_integers` with a base of 1.
+
+    Row `i` of the result holds `parts[i]` positive integers adding up to
+    `totals[i]`, followed by zeros.
+    """
+
+    size = len(totals)
+    if max_parts == 1:
+        return totals.reshape(size, 1)
+
+    # Pick `parts - 1` distinct break points out of `totals - 1` per row.
+    keys = rng.random((size, max_total - 1))
+    keys[np.arange(max_total - 1) >= (totals - 1)[:, None]] = 2
+    breaks = np.argsort(keys, axis=1)[:, :max_parts - 1]
+
+    unused = np.arange(max_parts - 1) >= (parts - 1)[:, None]
+    breaks = np.where(unused, (totals - 1)[:, None], breaks)
+    breaks.sort(axis=1)
+
+    breaks = np.hstack([
+        np.full((size, 1), -1), breaks, (totals - 1)[:, None]
+    ])
+
+    return np.diff(breaks, axis=1)
+
+
+def simulate(box_type: str, profile: BoxProfile, boxes: int, seed: int = None) -> dict:
+    """Open `boxes` boxes of `box_type` and return average contents per box."""
+
+    if np is None:
+        raise RuntimeError("NumPy is required to run the box simulator.")
+
+    data = BOXES[box_type]
+    rng = np.random.default_rng(seed)
+
+    population = list(BOX_ODDS)
+    weights = np.array([BOX_ODDS[item] for item in population])
+    weights = weights / weights.sum()
+
+    pp_idx = population.index("Power Points")
+    sp_idx = population.index("Star Power")
+
+    can_get_pp = len(profile.pp_thresholds)
+    max_threshold = max(profile.pp_thresholds, default=0)
+
+    totals = {
+        "gold": 0,
+        "powerpoints": 0,
+        "powerpoints_lost": 0,
+        "starpowers": 0,
+        "token_doublers": 0,
+        "gems": 0,
+        "gem_drops": 0,
+        "tickets": 0,
+        "ticket_drops": 0,
+        "doubled": 0,
+        "odds_multiplier": 0.0,
+        **{f"unlocks_{rarity}": 0 for rarity in RARITIES}
+    }
+
+    start = time.perf_counter()
+
+    remaining = boxes
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        remaining -= size
+
+        gold = _weighted_random(rng, *data["gold"], size)
+
+        draws = rng.choice(len(population), size=(size, data["draws"]), p=weights)
+        counts = np.stack(
+            [(draws == idx).sum(axis=1) for idx in range(len(population))], axis=1
+        )
+
+        stacks = counts[:, pp_idx]
+        multiplier = np.ones(size)
+
+        if can_get_pp == 0:
+            gold = gold * 3
+            stacks = np.zeros(size, dtype=int)
+        elif can_get_pp == 1:
+            gold = gold * 2
+            stacks = np.ones(size, dtype=int)
+        elif data["stack_limit_multiplier"]:
+            limited = stacks > can_get_pp
+            stacks = np.where(limited, can_get_pp, stacks)
+            multiplier[limited] *= data["stack_limit_multiplier"]
+
+        totals["gold"] += int(gold.sum())
+
+        has_pp = stacks > 0
+        if has_pp.any():
+            powerpoints = _weighted_random(rng, *data["powerpoints"], int(has_pp.sum()))
+            pieces = _split_in_integers(
+                rng,
+                powerpoints,
+                stacks[has_pp],
+                int(stacks.max()),
+                data["powerpoints"][1]
+            )
+            # A piece is given to a random Brawler which can take all of it.
+            given = pieces <= max_threshold
+            totals["powerpoints"] += int(pieces[given].sum())
+            totals["powerpoints_lost"] += int(pieces[~given].sum())
+
+        for idx, item in enumerate(population):
+            if idx in (pp_idx, sp_idx):
+                continue
+            rarity = profile.resolve_rarity(item)
+            if rarity:
+                totals[f"unlocks_{rarity}"] += int(counts[:, idx].sum())
+            else:
+                multiplier *= 2.0 ** counts[:, idx]
+
+        if profile.can_get_sp:
+            totals["starpowers"] += int(counts[:, sp_idx].sum())
+        else:
+            multiplier *= 2.0 ** counts[:, sp_idx]
+
+        totals["doubled"] += int((multiplier > 1).sum())
+        totals["odds_multiplier"] += float(multiplier.sum())
+
+        chance = rng.integers(1, 100, size, endpoint=True)
+        td = chance <= BOX_TD_ODDS * multiplier
+        gems = ~td & (chance <= BOX_GEMS_ODDS * multiplier)
+        tickets = ~td & ~gems & (chance <= BOX_TICKETS_ODDS * multiplier)
+
+        totals["token_doublers"] += int(td.sum())
+        totals["gem_drops"] += int(gems.sum())
+        totals["gems"] += int(rng.integers(*data["gems"], gems.sum(), endpoint=True).sum())
+        totals["ticket_drops"] += int(tickets.sum())
+        totals["tickets"] += int(tickets.sum()) * data["tickets"]
+
+    elapsed = time.perf_counter() - start
+
+    results = {key: value / boxes for key, value in totals.items()}
+    results["boxes"] = boxes
+    results["boxes_per_second"] = boxes / elapsed if elapsed else float("inf")
+
+    return results
+
+
+def _weighted_random_odds(lower: int, upper: int, avg: int) -> Dict[int, float]:
+    """Return probability of each value `Box.weighted_random` can return."""
+
+    avg_low = (avg + lower) / 2
+    avg_high = (upper + avg) / 2
+
+    p_high = (avg - avg_low) / (avg_high - avg_low)
+
+    odds = {value: 0.0 for value in range(lower, upper + 1)}
+    for value in range(avg, upper + 1):
+        odds[value] += p_high / (upper - avg + 1)
+    for value in range(lower, avg + 1):
+        odds[value] += (1 - p_high) / (avg - lower + 1)
+
+    return odds
+
+
+def _given_powerpoints(total: int, stacks: int, max_threshold: int) -> float:
+    """Return average power points given when `total` is split in `stacks` pieces.
+
+    All splits are equally likely, like in `Box.split_in_integers`, so every
+    piece has the same distribution. A piece is given if some Brawler can
+    take all of it, i.e. it is at most `max_threshold`.
+    """
+
+    if stacks == 1:
+        return total if total <= max_threshold else 0
+
+    splits = comb(total - 1, stacks - 1)
+    piece = sum(
+        size * comb(total - size - 1, stacks - 2)
+        for size in range(1, min(total - stacks + 1, max_threshold) + 1)
+    )
+
+    return stacks * piece / splits
+
+
+def expected(box_type: str, profile: BoxProfile) -> Dict[str, float]:
+    """Return average gold, power points, Brawlers and Star Powers per box.
+
+    The values are those `simulate` converges to, computed exactly from
+    `BOX_ODDS` and `BOXES`. Keys are the same as in its results.
+    """
+
+    data = BOXES[box_type]
+    draws = data["draws"]
+
+    weight_sum = sum(BOX_ODDS.values())
+    odds = {item: weight / weight_sum for item, weight in BOX_ODDS.items()}
+
+    can_get_pp = len(profile.pp_thresholds)
+    max_threshold = max(profile.pp_thresholds, default=0)
+
+    gold_odds = _weighted_random_odds(*data["gold"])
+    gold = sum(value * chance for value, chance in gold_odds.items())
+
+    # Odds of the number of stacks of power points, see `Box.brawlbox`.
+    if can_get_pp == 0:
+        gold *= 3
+        stack_odds = {}
+    elif can_get_pp == 1:
+        gold *= 2
+        stack_odds = {1: 1.0}
+    else:
+        p_pp = odds["Power Points"]
+        stack_odds = {}
+        for count in range(1, draws + 1):
+            if data["stack_limit_multiplier"]:
+                stacks = min(count, can_get_pp)
+            else:
+                stacks = count
+            stack_odds[stacks] = stack_odds.get(stacks, 0) + (
+                comb(draws, count) * p_pp ** count * (1 - p_pp) ** (draws - count)
+            )
+
+    pp_odds = _weighted_random_odds(*data["powerpoints"])
+    powerpoints = sum(
+        stack_chance * pp_chance * _given_powerpoints(total, stacks, max_threshold)
+        for stacks, stack_chance in stack_odds.items()
+        for total, pp_chance in pp_odds.items()
+    )
+
+    results = {
+        "gold": gold,
+        "powerpoints": powerpoints,
+        "starpowers": draws * odds["Star Power"] if profile.can_get_sp else 0.0,
+        **{f"unlocks_{rarity}": 0.0 for rarity in RARITIES}
+    }
+    for rarity in RARITIES:
+        resolved = profile.resolve_rarity(rarity)
+        if resolved:
+            results[f"unlocks_{resolved}"] += draws * odds[rarity]
+
+    return results
+
+
+def format_results(box_type: str, results: dict) -> str:
+    """Return a plain text report of simulation results."""
+
+    lines = [
+        f"{box_type}: {results['boxes']:,} boxes"
+        f" ({results['boxes_per_second']:,.0f} boxes/sec)",
+        f"Gold: {results['gold']:.2f}",
+        f"Power Points: {results['powerpoints']:.2f}"
+        f" (lost: {results['powerpoints_lost']:.2f})",
+    ]
+    for rarity in RARITIES:
+        lines.append(f"{rarity} Brawlers: {results['unlocks_' + rarity] * 100:.4f}%")
+    lines += [
+        f"Star Powers: {results['starpowers'] * 100:.4f}%",
+        f"Token Doubler: {results['token_doublers'] * 100:.2f}%",
+        f"Gems: {results['gem_drops'] * 100:.2f}% ({results['gems']:.2f} per box)",
+        f"Tickets: {results['ticket_drops'] * 100:.2f}% ({results['tickets']:.2f} per box)",
+        f"Doubling fallback: {results['doubled'] * 100:.2f}% of boxes"
+        f" (average odds x{results['odds_multiplier']:.3f})",
+    ]
+
+    return "\n".join(lines)
+
+
+def load_profile(path: Path) -> dict:
+    """Return Brawlers of a user data file exported with the getdata command.
+
+    Both the zip archive and the older JSON export are supported.
+    """
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return {
+                PurePosixPath(name).stem: json.loads(archive.read(name))
+                for name in archive.namelist()
+                if name.startswith("brawlers/")
+            }
+
+    with path.open("r") as f:
+        return json.load(f)["brawlers"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Brawlcord box openings.")
+    parser.add_argument("box", choices=list(BOXES))
+    parser.add_argument("--boxes", type=int, default=1_000_000)
+    parser.add_argument(
+        "--profile", type=Path, help="user data file exported with the getdata command"
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    brawlers_fp = Path(__file__).parent.parent / "data" / "brawlers.json"
+    with brawlers_fp.open("r") as f:
+        all_brawlers = json.load(f)
+
+    if args.profile:
+        brawler_data = load_profile(args.profile)
+    else:
+        brawler_data = {"Shelly": default_stats}
+
+    profile = BoxProfile(all_brawlers, brawler_data)
+    results = simulate(args.box, profile, args.boxes, args.seed)
+
+    print(format_results(args.box, results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import asyncio
+import functools
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    trophies INTEGER NOT NULL,
+    pb INTEGER NOT NULL,
+    club_id TEXT,
+    last_active REAL,
+    brawlers TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_trophies ON users (trophies DESC, user_id);
+CREATE INDEX IF NOT EXISTS users_pb ON users (pb DESC, user_id);
+CREATE INDEX IF NOT EXISTS users_club ON users (club_id, trophies DESC);
+CREATE INDEX IF NOT EXISTS users_last_active ON users (last_active);
+"""
+
+UPSERT = """
+INSERT INTO users (user_id, trophies, pb, club_id, last_active, brawlers, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    trophies = excluded.trophies,
+    pb = excluded.pb,
+    club_id = excluded.club_id,
+    last_active = COALESCE(excluded.last_active, users.last_active),
+    brawlers = excluded.brawlers,
+    data = excluded.data
+"""
+
+
+def _row(user_id: int, data: dict, last_active: Optional[float]) -> tuple:
+    """Return the `users` row of a user document."""
+
+    brawlers = data.get("brawlers", {})
+    rest = {key: value for key, value in data.items() if key != "brawlers"}
+
+    return (
+        user_id,
+        sum(stats["trophies"] for stats in brawlers.values()),
+        sum(stats["pb"] for stats in brawlers.values()),
+        data.get("club"),
+        last_active,
+        json.dumps(brawlers),
+        json.dumps(rest),
+    )
+
+
+class SQLiteStore:
+    """User data in a local SQLite database with indexed columns.
+
+    Total trophies, total personal best, club ID and time of last activity
+    are indexed columns. The Brawlers and the rest of the user document are
+    stored as JSON. The database runs in WAL mode and all queries run in a
+    single worker thread, so the event loop is not blocked.
+
+    Parameters
+    -------------
+    path: `Path`
+        Path of the database file. It is created if it doesn't exist.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="brawlcord-sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    async def _run(self, func, *args) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def _open(self):
+        # Only the worker thread uses the connection.
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    async def open(self):
+        """Open the database, creating the tables if needed."""
+
+        await self._run(self._open)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self):
+        """Close the database and stop the worker thread."""
+
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    def _save_users(self, rows: List[tuple]):
+        with self._conn:
+            self._conn.executemany(UPSERT, rows)
+
+    async def save_user(self, user_id: int, data: dict, last_active: float = None):
+        """Save the whole document of the user."""
+
+        await self._run(self._save_users, [_row(user_id, data, last_active)])
+
+    async def save_users(self, users: Iterable[Tuple[int, dict]]):
+        """Save documents of many users in a single transaction."""
+
+        await self._run(self._save_users, [_row(user_id, data, None) for user_id, data in users])
+
+    def _load_user(self, user_id: int) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT brawlers, data FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        data = json.loads(row[1])
+        data["brawlers"] = json.loads(row[0])
+        return data
+
+    async def load_user(self, user_id: int) -> Optional[dict]:
+        """Return document of the user or None if the user is not stored."""
+
+        return await self._run(self._load_user, user_id)
+
+    def _set_stat(self, user_id: int, stat: str, value: Any):
+        with self._conn:
+            if stat == "brawlers":
+                self._conn.execute(
+                    "UPDATE users SET brawlers = ?, trophies = ?, pb = ? WHERE user_id = ?",
+                    (
+                        json.dumps(value),
+                        sum(stats["trophies"] for stats in value.values()),
+                        sum(stats["pb"] for stats in value.values()),
+                        user_id,
+                    )
+                )
+                return
+
+            row = self._conn.execute(
+                "SELECT data FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                # Saved with the whole document when the user next brawls.
+                return
+
+            data = json.loads(row[0])
+            data[stat] = value
+            self._conn.execute(
+                "UPDATE users SET data = ?, club_id = ? WHERE user_id = ?",
+                (json.dumps(data), data.get("club"), user_id)
+            )
+
+    async def set_stat(self, user_id: int, stat: str, value: Any):
+        """Set a top level value of the user's document.
+
+        Users who are not stored yet are skipped.
+        """
+
+        await self._run(self._set_stat, user_id, stat, value)
+
+    def _set_balances(self, balances: Dict[int, Dict[str, int]]):
+        with self._conn:
+            for user_id, changed in balances.items():
+                row = self._conn.execute(
+                    "SELECT data FROM users WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+
+                data = json.loads(row[0])
+                data.update(changed)
+                self._conn.execute(
+                    "UPDATE users SET data = ? WHERE user_id = ?", (json.dumps(data), user_id)
+                )
+
+    async def set_balances(self, balances: Dict[int, Dict[str, int]]):
+        """Set currency balances of many users in a single transaction.
+
+        `balances` maps user IDs to the changed currencies. Users who are not
+        stored yet are skipped.
+        """
+
+        await self._run(self._set_balances, balances)
+
+    def _delete_user(self, user_id: int):
+        with self._conn:
+            self._conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+
+    async def delete_user(self, user_id: int):
+        """Remove the user's document."""
+
+        await self._run(self._delete_user, user_id)
+
+    def _top(self, count: int, pb: bool) -> List[Tuple[int, int]]:
+        column = "pb" if pb else "trophies"
+        return self._conn.execute(
+            f"SELECT user_id, {column} FROM users ORDER BY {column} DESC, user_id LIMIT ?",
+            (count,)
+        ).fetchall()
+
+    async def top(self, count: int = 10, pb=False) -> List[Tuple[int, int]]:
+        """Return `(user_id, trophies)` of the users with the most trophies."""
+
+        return await self._run(self._top, count, pb)
+
+    def _position(self, user_id: int, pb: bool) -> Optional[int]:
+        column = "pb" if pb else "trophies"
+        row = self._conn.execute(
+            f"SELECT {column} FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        # Ties are ordered by user ID, like in `LeaderboardIndex`.
+        (ahead,) = self._conn.execute(
+            f"SELECT COUNT(*) FROM users WHERE {column} > ?"
+            f" OR ({column} = ? AND user_id < ?)",
+            (row[0], row[0], user_id)
+        ).fetchone()
+        return ahead + 1
+
+    async def position(self, user_id: int, pb=False) -> Optional[int]:
+        """Return 1-based leaderboard position of the user.
+
+        Returns None if the user is not stored.
+        """
+
+        return await self._run(self._position, user_id, pb)
+
+    def _club_stats(self, club_id: str) -> dict:
+        members = self._conn.execute(
+            "SELECT user_id, trophies FROM users WHERE club_id = ?"
+            " ORDER BY trophies DESC, user_id",
+            (club_id,)
+        ).fetchall()
+
+        return {
+            "total_trophies": sum(trophies for _, trophies in members),
+            "members": [list(member) for member in members],
+        }
+
+    async def club_stats(self, club_id: str) -> dict:
+        """Return club stats in the format of `Club.compute_stats`."""
+
+        return await self._run(self._club_stats, club_id)
+
+    def _all_brawlers(self) -> Dict[int, dict]:
+        return {
+            user_id: json.loads(brawlers)
+            for user_id, brawlers in self._conn.execute("SELECT user_id, brawlers FROM users")
+        }
+
+    async def all_brawlers(self) -> Dict[int, dict]:
+        """Return Brawlers of all users, without loading the rest of their data."""
+
+        return await self._run(self._all_brawlers)
+
+    def _info(self) -> Tuple[int, int]:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        size = sum(
+            fp.stat().st_size
+            for fp in self.path.parent.glob(f"{self.path.name}*")
+        )
+        return count, size
+
+    async def info(self) -> Tuple[int, int]:
+        """Return number of stored users and size of the database files in bytes."""
+
+        return await self._run(self._info)
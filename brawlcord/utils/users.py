@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Optional
+
+import discord
+from redbot.core.bot import Red
+
+
+class UserCache:
+    """Bounded cache of `discord.User` objects fetched from the API.
+
+    Users in the bot's own cache are always returned from there. Users the
+    bot can't see are fetched once and kept until they are the least
+    recently used entry of a full cache.
+
+    Parameters
+    -------------
+    maxsize: `int`
+        Maximum number of fetched users to keep.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._users: "OrderedDict[int, discord.User]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, bot: Red, user_id: int) -> Optional[discord.User]:
+        """Return user from the bot's cache or this cache, without API calls.
+
+        Returns None if the user is not cached.
+        """
+
+        user = bot.get_user(user_id)
+        if user is not None:
+            return user
+
+        user = self._users.get(user_id)
+        if user is not None:
+            self._users.move_to_end(user_id)
+
+        return user
+
+    async def fetch(self, bot: Red, user_id: int) -> Optional[discord.User]:
+        """Return user, fetching it from the API if it is not cached.
+
+        Returns None if the user can't be fetched.
+        """
+
+        user = self.get(bot, user_id)
+        if user is not None:
+            return user
+
+        try:
+            user = await bot.fetch_user(user_id)
+        except discord.HTTPException:
+            return None
+
+        self._users[user_id] = user
+        if len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+
+        return user
+
+    def clear(self):
+        """Remove all fetched users from the cache."""
+
+        self._users.clear()
+
+
+# Shared by all modules of the cog.
+user_cache = UserCache()
@@ -0,0 +1,199 @@
+"""Shared fixtures of the tests.
+
+`async def` tests are run in a new event loop by `pytest_pyfunc_call`.
+"""
+
+import asyncio
+import inspect
+import json
+from collections import Counter
+from copy import deepcopy
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from brawlcord.abc import MixinMeta
+from brawlcord.brawlcord import default_user
+from brawlcord.utils.ledger import LEDGER, Ledger, default_ledger
+
+DATA_PATH = Path(__file__).parent.parent / "brawlcord" / "data"
+
+_MISSING = object()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+
+    funcargs = pyfuncitem.funcargs
+    asyncio.run(
+        pyfuncitem.obj(**{name: funcargs[name] for name in pyfuncitem._fixtureinfo.argnames})
+    )
+    return True
+
+
+class MemoryValue:
+    """In-memory stand-in for Red's `Value` and `Group` objects."""
+
+    def __init__(self, config: "MemoryConfig", path: Tuple[str, ...]):
+        self._config = config
+        self._path = path
+
+    def __getattr__(self, name: str) -> "MemoryValue":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return MemoryValue(self._config, self._path + (name,))
+
+    def __call__(self) -> "_ValueContext":
+        return _ValueContext(self)
+
+    async def all(self) -> Any:
+        return self._config._get(self._path)
+
+    async def set(self, value: Any):
+        self._config._set(self._path, value)
+
+    async def clear(self):
+        self._config._set(self._path, _MISSING)
+
+    async def get_raw(self, *keys: str) -> Any:
+        return self._config._get(self._path + tuple(str(key) for key in keys))
+
+    async def set_raw(self, *keys: str, value: Any):
+        self._config._set(self._path + tuple(str(key) for key in keys), value)
+
+
+class _ValueContext:
+    def __init__(self, value: MemoryValue):
+        self.value = value
+
+    def __await__(self):
+        return self.value.all().__await__()
+
+    async def __aenter__(self) -> Any:
+        self.raw_value = await self.value.all()
+        self.original = deepcopy(self.raw_value)
+        return self.raw_value
+
+    async def __aexit__(self, *_exc_info):
+        # Red only writes the value back if it has changed.
+        if self.raw_value != self.original:
+            await self.value.set(self.raw_value)
+
+
+class MemoryConfig:
+    """In-memory stand-in for Red's `Config`, with user and custom scopes.
+
+    Attributes
+    -------------
+    calls: `Counter`
+        Number of driver reads (`get`) and writes (`set`), including
+        deletions.
+    """
+
+    def __init__(self):
+        self._defaults: Dict[str, dict] = {}
+        self._data: Dict[str, dict] = {}
+
+        self.calls = Counter()
+
+    def register_user(self, **defaults):
+        self.register_custom("USER", **defaults)
+
+    def init_custom(self, group: str, identifier_count: int):
+        self._defaults.setdefault(group, {})
+
+    def register_custom(self, group: str, **defaults):
+        self._defaults.setdefault(group, {}).update(deepcopy(defaults))
+
+    def user(self, user) -> MemoryValue:
+        return self.user_from_id(user.id)
+
+    def user_from_id(self, user_id: int) -> MemoryValue:
+        return self.custom("USER", user_id)
+
+    def custom(self, group: str, identifier) -> MemoryValue:
+        return MemoryValue(self, (group, str(identifier)))
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def _get(self, path: Tuple[str, ...]) -> Any:
+        self.calls["get"] += 1
+
+        group, identifier, keys = path[0], path[1], path[2:]
+        value = {**deepcopy(self._defaults[group]), **self._data.get(group, {}).get(identifier, {})}
+        for key in keys:
+            if key not in value:
+                raise KeyError(key)
+            value = value[key]
+
+        return deepcopy(value)
+
+    def _set(self, path: Tuple[str, ...], value: Any):
+        self.calls["set"] += 1
+
+        group, identifier, keys = path[0], path[1], path[2:]
+        documents = self._data.setdefault(group, {})
+        if not keys:
+            if value is _MISSING:
+                documents.pop(identifier, None)
+            else:
+                documents[identifier] = deepcopy(value)
+            return
+
+        tree = documents.setdefault(identifier, {})
+        for depth, key in enumerate(keys[:-1]):
+            if key not in tree:
+                tree[key] = deepcopy(self._defaults[group].get(key, {})) if depth == 0 else {}
+            tree = tree[key]
+        if value is _MISSING:
+            tree.pop(keys[-1], None)
+        else:
+            tree[keys[-1]] = deepcopy(value)
+
+
+class Cog(MixinMeta):
+    """The cog's helpers bound to an in-memory Config, without a bot."""
+
+    def __init__(self, config: MemoryConfig):
+        super().__init__()
+
+        self.config = config
+        self.ledger = Ledger(config)
+        self.store = None
+
+    async def initialize(self):
+        pass
+
+
+@pytest.fixture
+def config() -> MemoryConfig:
+    """Config with the cog's user defaults and the ledger group registered."""
+
+    config = MemoryConfig()
+    config.register_user(**default_user)
+    config.init_custom(LEDGER, 1)
+    config.register_custom(LEDGER, **default_ledger)
+    return config
+
+
+@pytest.fixture
+def cog(config: MemoryConfig) -> Cog:
+    return Cog(config)
+
+
+@pytest.fixture
+def user() -> SimpleNamespace:
+    return SimpleNamespace(id=1)
+
+
+@pytest.fixture(scope="session")
+def all_brawlers() -> dict:
+    """Data of the bundled `brawlers.json`."""
+
+    with (DATA_PATH / "brawlers.json").open("r") as f:
+        return json.load(f)
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from brawlcord.utils import brawlers
+
+
+def test_prototype_data_is_read_only(all_brawlers):
+    shelly = brawlers.BrawlerRegistry(all_brawlers)["Shelly"]
+
+    with pytest.raises(AttributeError):
+        shelly.health = 1
+    with pytest.raises(TypeError):
+        shelly.attack["damage"] = 1
+    with pytest.raises(TypeError):
+        shelly.buff_stats(5)["health"] = 1
+    assert isinstance(next(iter(shelly.skins.values())), tuple)
+
+
+def test_tables_are_rebuilt_with_the_registry(all_brawlers):
+    data = json.loads(json.dumps(all_brawlers))
+    before = brawlers.BrawlerRegistry(data)["Shelly"]
+
+    data["Shelly"]["health"] += 1000
+    after = brawlers.BrawlerRegistry(data)["Shelly"]
+
+    assert after.buff_stats(1)["health"] == before.buff_stats(1)["health"] + 1000
+    assert after.info_fields(1) != before.info_fields(1)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from brawlcord.utils.brawlers import BrawlerRegistry
+from brawlcord.utils.engine import (
+    BrawlBallEngine, GameOver, GemGrabEngine, MoveRequest, Player, ShowdownEngine
+)
+
+
+@pytest.fixture(scope="module")
+def registry(all_brawlers) -> BrawlerRegistry:
+    return BrawlerRegistry(all_brawlers)
+
+
+def _snapshot(value):
+    if isinstance(value, Player):
+        return value.player, value.health, value.spawn
+    return value
+
+
+def event_stream(registry, engine_class, first: str, second: str, seed: int) -> list:
+    """Return the events of a match, with players replaced by their state."""
+
+    rng = random.Random(seed)
+    engine = engine_class(
+        Player("first", registry[first], 7), Player("second", registry[second], 9), rng
+    )
+
+    events = []
+    game = engine.play()
+    event = next(game)
+    while True:
+        events.append((type(event).__name__, tuple(_snapshot(field) for field in event)))
+        if isinstance(event, GameOver):
+            return events
+        if isinstance(event, MoveRequest):
+            event = game.send(rng.randint(1, event.moves))
+        else:
+            event = next(game)
+
+
+def test_same_seed_gives_same_events(registry):
+    # Brawlers with spawns, range scaling and poison damage roll extra numbers.
+    matchups = [("Shelly", "Nita"), ("Piper", "Crow"), ("Penny", "Pam"), ("Jessie", "Tara")]
+
+    for engine_class in (GemGrabEngine, ShowdownEngine, BrawlBallEngine):
+        for first, second in matchups:
+            # The global generator must not affect the match.
+            random.seed(1)
+            events = event_stream(registry, engine_class, first, second, seed=42)
+            random.seed(2)
+            assert event_stream(registry, engine_class, first, second, seed=42) == events
+
+
+def test_different_seeds_give_different_events(registry):
+    streams = {
+        tuple(event_stream(registry, GemGrabEngine, "Shelly", "Colt", seed)) for seed in range(5)
+    }
+    assert len(streams) > 1
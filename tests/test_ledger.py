@@ -0,0 +1,85 @@
+import asyncio
+
+from brawlcord.utils.ledger import LEDGER, TAIL_SIZE, Ledger
+from brawlcord.utils.storage import SQLiteStore
+
+
+async def test_flush_appends_only_new_entries(config):
+    ledger = Ledger(config)
+    await ledger.add(1, "gold", 50, "brawl")
+    await ledger.flush()
+
+    await ledger.add(1, "gold", 10, "brawl")
+    await ledger.add(1, "tokens", 20, "brawl")
+    config.reset_calls()
+    await ledger.flush()
+
+    assert config.calls["set"] == 2
+    account = await config.custom(LEDGER, 1).all()
+    assert [entry[2] for _, entry in sorted(account["tail"].items())] == [50, 10, 20]
+    assert (await Ledger(config).balances(1))["gold"] == 60
+
+
+async def test_flush_rewrites_account_when_compacting(config):
+    ledger = Ledger(config)
+    for _ in range(TAIL_SIZE):
+        await ledger.add(1, "gems", 1, "brawl box")
+    await ledger.flush()
+
+    account = await config.custom(LEDGER, 1).all()
+    assert account["tail"] == {}
+    assert account["snapshot"]["gems"] == TAIL_SIZE
+    assert len(account["history"]) == TAIL_SIZE
+
+
+async def test_flush_leaves_user_document_alone(config, user):
+    await config.user(user).gold.set(100)
+
+    ledger = Ledger(config)
+    await ledger.add(user.id, "gold", 50, "brawl")
+    await ledger.flush()
+
+    assert await config.user(user).gold() == 100
+    data = await ledger.overlay(user.id, await config.user(user).all())
+    assert data["gold"] == 150
+
+
+async def test_flush_syncs_sqlite_row(config, tmp_path):
+    store = SQLiteStore(tmp_path / "brawlcord.sqlite3")
+    await store.open()
+    try:
+        await store.save_user(1, await config.user_from_id(1).all())
+
+        ledger = Ledger(config)
+        await ledger.add(1, "gold", 50, "brawl")
+        await ledger.add(1, "starpoints", 10, "rank up")
+        await ledger.flush(store)
+
+        row = await store.load_user(1)
+        for currency, balance in (await ledger.balances(1)).items():
+            assert row[currency] == balance
+    finally:
+        await store.close()
+
+
+async def test_clear_waits_for_flush(config, monkeypatch):
+    group = type(config.custom(LEDGER, 1))
+    set_value = group.set
+
+    async def slow_set(self, value):
+        # Give `clear` a chance to run in the middle of the flush.
+        await asyncio.sleep(0)
+        await set_value(self, value)
+
+    monkeypatch.setattr(group, "set", slow_set)
+
+    ledger = Ledger(config)
+    await ledger.add(1, "gold", 50, "brawl")
+
+    flush = asyncio.ensure_future(ledger.flush())
+    await asyncio.sleep(0)
+    await ledger.clear(1)
+    await flush
+
+    assert (await config.custom(LEDGER, 1).all())["snapshot"] is None
+    assert 1 not in ledger.accounts
@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from brawlcord.utils.matches import MatchRegistry
+from brawlcord.utils.matchmaking import BOT_DEADLINE, MatchmakingQueue
+
+
+def user(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(id=user_id)
+
+
+@pytest.fixture
+def matches() -> MatchRegistry:
+    return MatchRegistry(stale_after=60)
+
+
+@pytest.fixture
+def queue(matches) -> MatchmakingQueue:
+    return MatchmakingQueue(matches)
+
+
+async def test_join_pairs_with_lower_rated_player(queue):
+    waiting = queue.join(user(1), "Gem Grab", 1000)
+    joined = queue.join(user(2), "Gem Grab", 1010)
+
+    assert joined.future.result() is waiting
+    assert waiting.future.result() is joined
+    assert waiting.host and not joined.host
+    assert len(queue) == 0
+
+
+async def test_join_pairs_with_higher_rated_player(queue):
+    waiting = queue.join(user(1), "Gem Grab", 1010)
+    joined = queue.join(user(2), "Gem Grab", 1000)
+
+    assert joined.future.result() is waiting
+    assert waiting.future.result() is joined
+    assert waiting.host and not joined.host
+    assert len(queue) == 0
+
+
+async def test_join_pairs_with_closest_rating(queue):
+    lower = queue.join(user(1), "Gem Grab", 1000)
+    higher = queue.join(user(2), "Gem Grab", 1080)
+    joined = queue.join(user(3), "Gem Grab", 1060)
+
+    assert joined.future.result() is higher
+    assert not lower.future.done()
+    assert len(queue) == 1
+
+
+async def test_join_keeps_distant_players_and_modes_apart(queue):
+    queue.join(user(1), "Gem Grab", 1000)
+    queue.join(user(2), "Gem Grab", 1300)
+    queue.join(user(3), "Brawl Ball", 1000)
+
+    assert len(queue) == 3
+    assert len(queue.queues["Gem Grab"]) == 2
+
+
+async def test_paired_users_are_registered_in_a_brawl(queue, matches):
+    waiting = queue.join(user(1), "Gem Grab", 1000)
+    joined = queue.join(user(2), "Gem Grab", 1010)
+
+    # The guest's command returns right away, so it must not be able to
+    # start another brawl before the host's brawl begins.
+    assert 1 in matches and 2 in matches
+    assert waiting.match is joined.match is matches.get(2)
+
+
+async def test_sweep_pairs_widened_windows_and_expires_tickets(queue):
+    first = queue.join(user(1), "Gem Grab", 1000)
+    second = queue.join(user(2), "Gem Grab", 1200)
+    alone = queue.join(user(3), "Brawl Ball", 1000)
+
+    queue.sweep(first.joined + 5)
+    assert len(queue) == 3
+
+    # Waited long enough for the window to cover the difference.
+    queue.sweep(first.joined + 10)
+    assert first.future.result() is second and first.host
+    assert not alone.future.done()
+
+    queue.sweep(alone.joined + BOT_DEADLINE)
+    assert alone.future.result() is None
+    assert queue.matched == 1 and queue.bot_fallbacks == 1
+    assert len(queue) == 0
+
+
+async def test_sweep_pairs_neighbours_of_a_player_who_left(queue):
+    lower = queue.join(user(1), "Gem Grab", 1000)
+    middle = queue.join(user(2), "Gem Grab", 1100)
+    higher = queue.join(user(3), "Gem Grab", 1200)
+
+    queue.leave(middle)
+    queue.sweep(lower.joined + 10)
+
+    assert lower.future.result() is higher
+    assert not middle.future.done()
+
+
+async def test_sweep_expires_tickets_in_join_order(queue):
+    tickets = [queue.join(user(idx), "Gem Grab", 1000 * idx) for idx in range(1, 4)]
+    # Joined a second after the others.
+    tickets[2].joined += 1
+
+    queue.sweep(tickets[1].joined + BOT_DEADLINE)
+
+    assert tickets[0].future.result() is None
+    assert tickets[1].future.result() is None
+    assert not tickets[2].future.done()
+
+
+async def test_leave_removes_ticket(queue):
+    ticket = queue.join(user(1), "Gem Grab", 1000)
+    queue.leave(ticket)
+
+    assert 1 not in queue
+    assert not queue.join(user(2), "Gem Grab", 1000).future.done()
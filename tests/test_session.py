@@ -0,0 +1,27 @@
+from brawlcord.utils.session import PlayerSession
+
+
+async def test_commit_writes_only_changed_keys(config, user):
+    session = await PlayerSession.load(config, user)
+    # Written by another command while the session is open.
+    await config.user(user).cooldown.set({"brawlbox": 100})
+    await config.user(user).xp.set(5)
+
+    session.add("startokens", 1)
+    await session.commit()
+
+    data = await config.user(user).all()
+    assert data["startokens"] == 1
+    assert data["cooldown"] == {"brawlbox": 100}
+    assert data["xp"] == 5
+    assert session.writes == 1
+    assert not session.dirty
+
+
+async def test_commit_without_changes_does_not_write(config, user):
+    session = await PlayerSession.load(config, user)
+
+    config.reset_calls()
+    await session.commit()
+
+    assert config.calls["set"] == 0
@@ -0,0 +1,28 @@
+import pytest
+
+from brawlcord.utils import simulator
+from brawlcord.utils.constants import BOX_ODDS, default_stats
+
+
+def test_expected_new_account(all_brawlers):
+    # Shelly is the only Brawler which can get power points, so gold is doubled
+    # and every stack of power points goes to her.
+    profile = simulator.BoxProfile(all_brawlers, {"Shelly": default_stats})
+    results = simulator.expected("brawlbox", profile)
+
+    assert results["gold"] == pytest.approx(2 * 19)
+    assert results["powerpoints"] == pytest.approx(14)
+    assert results["starpowers"] == 0
+    assert results["unlocks_Rare"] == pytest.approx(2 * BOX_ODDS["Rare"] / sum(BOX_ODDS.values()))
+
+
+def test_expected_maxed_brawlers(all_brawlers):
+    brawler_data = {
+        name: dict(default_stats, total_powerpoints=simulator.MAX_PP, sp1=True, sp2=True)
+        for name in all_brawlers
+    }
+    results = simulator.expected("megabox", simulator.BoxProfile(all_brawlers, brawler_data))
+
+    assert results["gold"] == pytest.approx(3 * 63)
+    assert results["powerpoints"] == 0
+    assert not any(results[f"unlocks_{rarity}"] for rarity in simulator.RARITIES)
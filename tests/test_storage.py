@@ -0,0 +1,20 @@
+from brawlcord.utils.storage import SQLiteStore
+
+
+async def test_save_to_store_uses_committed_document_and_ledger(cog, config, user, tmp_path):
+    cog.store = SQLiteStore(tmp_path / "brawlcord.sqlite3")
+    await cog.store.open()
+    try:
+        await config.user(user).xp.set(8)
+        # Not flushed yet.
+        await cog.ledger.add(user.id, "gold", 70, "brawl")
+
+        await cog.save_to_store(user)
+
+        row = await cog.store.load_user(user.id)
+        assert row["xp"] == 8
+        for currency, balance in (await cog.ledger.balances(user.id)).items():
+            assert row[currency] == balance
+        assert row["gold"] == 70
+    finally:
+        await cog.store.close()
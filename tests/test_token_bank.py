@@ -0,0 +1,26 @@
+import time
+
+from brawlcord.utils.constants import TOKEN_BANK_PERIOD, TOKEN_BANK_REFILL
+from brawlcord.utils.session import PlayerSession
+
+
+async def test_refresh_writes_only_token_bank(cog, config, user):
+    bank_update_ts = time.time() - 2 * TOKEN_BANK_PERIOD - 60
+    await config.user(user).tokens_in_bank.set(100)
+    await config.user(user).bank_update_ts.set(bank_update_ts)
+
+    session = await PlayerSession.load(config, user)
+    # Written by a brawl finishing while the profile is shown.
+    await config.user(user).xp.set(8)
+    await config.user(user).cooldown.set({"brawlbox": 100})
+
+    config.reset_calls()
+    cog.refresh_token_bank(session)
+    await session.commit()
+
+    data = await config.user(user).all()
+    assert data["tokens_in_bank"] == 100 + 2 * TOKEN_BANK_REFILL
+    assert data["bank_update_ts"] == bank_update_ts + 2 * TOKEN_BANK_PERIOD
+    assert data["xp"] == 8
+    assert data["cooldown"] == {"brawlbox": 100}
+    assert config.calls["set"] == 2